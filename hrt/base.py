@@ -1,3 +1,4 @@
+# -*- coding: utf-8 -*-
 """
 
 :synopsis: Define the basic script class that will generate the script code.
@@ -8,9 +9,53 @@ try:
     from urllib import quote
 except ImportError:
     from urllib.parse import quote
+import re
 from importlib import import_module
 
-from .url import get_url, check_valid_url
+from .search import SearchPatterns
+from .url import get_url, check_valid_url, get_proxy_details, get_connection_details
+
+try:
+    text_type = unicode  # Python 2.x
+except NameError:
+    text_type = str  # Python 3.x
+
+
+# Insertion point of the payloads in a raw request, e.g. u'\xa7param\xa7'.
+re_placeholder = re.compile(u'\xa7[^\xa7\r\n]*\xa7')
+
+
+def mark_placeholders(string):
+    """Replace the named placeholders of a string, like '§param§', by the marker of the first value of a row.
+
+    :param str string: String holding placeholders.
+
+    :return: String holding '§0§' markers instead.
+    :rtype: str
+    """
+    return re_placeholder.sub(u'\xa70\xa7', string)
+
+
+def native(value):
+    """Encode the unicode strings of Python 2 into UTF-8, like the byte string templates holding the '§0§' markers.
+
+    :param str value: String written into a template.
+
+    :return: String of the type of the templates.
+    :rtype: str
+    """
+    if text_type is not str and isinstance(value, text_type):
+        return value.encode('utf-8')
+    return value
+
+
+class EscapedQuoteMixin(object):
+
+    """Quote the string literals of the languages escaping the line breaks in their single quoted strings."""
+
+    def _quote(self, value):
+        value = value.replace('\\', '\\\\').replace("'", "\\'")
+        return "'%s'" % value.replace('\r', '\\r').replace('\n', '\\n')
 
 
 class AbstractScript(object):
@@ -18,29 +63,85 @@ class AbstractScript(object):
     """Abstract representation of a script."""
 
     __language__ = ''
+    __extension__ = ''
+
+    # Generation profiles: 'debug' scripts are verbose, 'fast' ones are tuned for throughput.
+    PROFILES = ('debug', 'fast')
+    # Hashes computed on the response bodies written to files.
+    HASHES = ('md5', 'sha1', 'sha256')
 
     code_begin = ''
     code_header = ''
     code_proxy = ''
+    code_proxy_none = ''
+    code_unix_socket = ''
+    code_connect_to = ''
     code_post = ''
     code_https = ''
     code_search = ''
     code_nosearch = ''
-
-    def __init__(self, headers=None, details=None, search=None):
+    code_scan = ''
+    code_patterns_scan = ''
+    code_output = ''
+    code_loop_begin = ''
+    code_loop_header = ''
+    code_loop_rows = ''
+    code_loop_row = ''
+    code_loop_main = ''
+    code_loop_proxy = ''
+    code_loop_unix_socket = ''
+    code_loop_connect_to = ''
+    code_loop_https = ''
+    code_loop_post = ''
+    code_loop_search = ''
+    code_loop_nosearch = ''
+    code_loop_output = ''
+    code_loop_payloads = ''
+    code_batch_begin = ''
+    code_batch_requests = ''
+    code_batch_request = ''
+    code_batch_header = ''
+    code_batch_main = ''
+    code_batch_proxy = ''
+    code_batch_unix_socket = ''
+    code_batch_connect_to = ''
+    code_batch_https = ''
+    code_batch_search = ''
+    code_batch_nosearch = ''
+    code_batch_output = ''
+    code_timings = ''
+    code_loop_timings = ''
+    code_batch_timings = ''
+
+    def __init__(self, headers=None, details=None, search=None, profile='debug', first_match=False, output_body=None,
+                 output_hash=None, timings=False):
         """Initialize the script generation.
 
         :param list headers: Headers list containing fields like 'Host', 'User-Agent', etc.
         :param dict details: Request specific details dictionary like body and method of the request.
         :param str search: String to search for in the response to the request.
+        :param str profile: Generation profile, one of :attr:`PROFILES`.
+        :param bool first_match: Whether the scripts searching the responses stop receiving them at the first match.
+        :param str output_body: Directory the scripts write the response bodies into, one file per request, if any.
+        :param str output_hash: Hash computed on the response bodies written to files, one of :attr:`HASHES`, if any.
+        :param bool timings: Whether the scripts report the timings of the phases of every request.
 
-        :raises ValueError: When url is invalid.
+        :raises ValueError: When url, profile or hash is invalid, or when the script cannot report the timings.
         """
         self.load_attributes(self.__class__)
+        self.load_profile(profile)
+        if output_hash and output_hash not in self.HASHES:
+            raise ValueError("The '%s' hash is not supported, use one of: %s." % (output_hash, ', '.join(self.HASHES)))
+        if timings and not self.code_timings:
+            raise ValueError("The %s scripts cannot report the timings of the requests." % self.__language__)
         self._script = ''
         self.headers = headers
         self.details = details
         self.search = search
+        self.first_match = first_match
+        self.output_body = output_body
+        self.output_hash = output_hash
+        self.timings = timings
         self.url = ''
         if self.details:
             self.url = self.encode_url(self.create_url())
@@ -70,6 +171,7 @@ class AbstractScript(object):
             self._script += self._generate_begin()
         if self.code_proxy:
             self._script += self._generate_proxy()
+        self._script += self._generate_connection(self.code_unix_socket, self.code_connect_to)
         method = self.details.get('method', '').strip().lower()
         if method == 'get':
             pass
@@ -113,6 +215,29 @@ class AbstractScript(object):
             return self.code_proxy.format(proxy='%s:%s' % (self.details['proxy_host'], self.details['proxy_port']))
         return ''
 
+    def _generate_connection(self, code_unix_socket, code_connect_to, quote=None):
+        """Default generation of the code connecting to a Unix socket or to another address than the host of the URL.
+
+        :param str code_unix_socket: Template of the code connecting to the Unix socket, formatted with its `path`.
+        :param str code_connect_to: Template of the code connecting to the address, formatted with its `host` and
+            `port`.
+        :param quote: Function quoting the path of the Unix socket, :meth:`_quote` by default.
+
+        :raises ValueError: When the script cannot connect to the Unix socket or to the address.
+
+        :return: Code snippet with the connection overrides, empty if there are none.
+        :rtype: str
+        """
+        if 'unix_socket' in self.details:
+            if not code_unix_socket:
+                raise ValueError("The %s scripts cannot connect to a Unix socket." % self.__language__)
+            return code_unix_socket.format(path=(quote or self._quote)(self.details['unix_socket']))
+        if 'connect_host' in self.details:
+            if not code_connect_to:
+                raise ValueError("The %s scripts cannot connect to another address." % self.__language__)
+            return code_connect_to.format(host=self.details['connect_host'], port=self.details['connect_port'])
+        return ''
+
     def _generate_post(self):
         """Default generation of the post body code.
 
@@ -135,6 +260,8 @@ class AbstractScript(object):
         :return: Code snippet for the request to send.
         :rtype: str
         """
+        if self.output_body:
+            return self._generate_output(self.code_output, timings=self._generate_timings(self.code_timings))
         code = ''
         if self.search:
             if self.code_search:
@@ -152,7 +279,91 @@ class AbstractScript(object):
         :return: Code snippet with the HTTP response search feature.
         :rtype: str
         """
-        return self.code_search.format(search_string=search_string.replace('"', '\\"'))
+        return self.code_search.format(
+            url=self.url, timings=self._generate_timings(self.code_timings), **self._search_fields(search_string))
+
+    def _search_fields(self, search_string):
+        """Values shared by all the search templates.
+
+        The scripts scanning the responses with a separate template put it in the `scan` field, formatted with the
+        search string, or with the tables of the matcher when searching for :class:`hrt.search.SearchPatterns`.
+
+        :param search_string: String to search for in the responses, or :class:`hrt.search.SearchPatterns`.
+
+        :raises ValueError: When the script cannot search for several patterns.
+
+        :return: A dictionary of template field name and respective value.
+        :rtype: dict
+        """
+        fields = {'first_match': self._boolean(self.first_match)}
+        if isinstance(search_string, SearchPatterns):
+            if not self.code_patterns_scan:
+                raise ValueError("The %s scripts cannot search for several patterns." % self.__language__)
+            fields['scan'] = self.code_patterns_scan.format(
+                first_match=fields['first_match'], **self._patterns_fields(search_string))
+            return fields
+        fields['search_string'] = search_string.replace('"', '\\"')
+        if self.code_scan:
+            fields['scan'] = self.code_scan.format(**fields)
+        return fields
+
+    def _patterns_fields(self, patterns):
+        """Values of the template scanning the responses for several patterns.
+
+        :param patterns: :class:`hrt.search.SearchPatterns` to search for.
+
+        :return: A dictionary of template field name and respective value, the tables of the matcher by default.
+        :rtype: dict
+        """
+        return patterns.tables()
+
+    def _boolean(self, value):
+        """Default boolean literal, in lower case.
+
+        :param bool value: Boolean to write.
+
+        :return: Boolean literal.
+        :rtype: str
+        """
+        return 'true' if value else 'false'
+
+    def _generate_output(self, template, **fields):
+        """Default generation of the code writing the response bodies to files instead of printing them.
+
+        :param str template: Template of the code, formatted with the :meth:`_output_fields` and `fields`.
+
+        :raises ValueError: When the script cannot write the response bodies to files, or searches them.
+
+        :return: Code snippet for the requests to send.
+        :rtype: str
+        """
+        if not template:
+            raise ValueError("The %s scripts cannot write the response bodies to files." % self.__language__)
+        if self.search:
+            raise ValueError("The response bodies cannot be both searched and written to files.")
+        fields.update(self._output_fields())
+        return template.format(**fields)
+
+    def _output_fields(self):
+        """Values shared by all the templates writing the response bodies to files.
+
+        :return: A dictionary of template field name and respective value.
+        :rtype: dict
+        """
+        return {'path': self._quote(self.output_body), 'algorithm': self._quote(self.output_hash or '')}
+
+    def _generate_timings(self, template):
+        """Default generation of the code reporting the timings of a request once it is over, if asked for.
+
+        Every phase is reported in seconds since the start of the request, along with the bytes transferred, as a single
+        JSON line.
+
+        :param str template: Template of the code, one of `code_timings`, `code_loop_timings` and `code_batch_timings`.
+
+        :return: Code snippet reporting the timings, empty unless asked for.
+        :rtype: str
+        """
+        return template if self.timings else ''
 
     def _generate_nosearch(self):
         """Default generation of the code having no search functionality.
@@ -162,6 +373,369 @@ class AbstractScript(object):
         """
         return self.code_nosearch
 
+    def generate_loop_script(self, rows, headers=None, details=None, search=None):
+        """Generate script code sending the request once per row of values, over a single reused connection.
+
+        The headers, path and data of the request hold markers like '§0§', '§1§', etc. which are replaced by the
+        values of each row before sending it.
+
+        :param list rows: Rows of values, each one holding as many values as there are markers.
+        :param list headers: Headers list containing fields like 'Host', 'User-Agent', etc.
+        :param dict details: Request specific details dictionary like body and method of the request.
+        :param str search: String to search for in the responses to the requests.
+
+        :raises ValueError: when unsupported HTTP method, invalid `headers` or `details` values, or when the language
+            does not support loop scripts.
+
+        :return: Generated script code.
+        :rtype: str
+        """
+        self.headers = headers or self.headers
+        self.details = details or self.details
+        self.search = search or self.search
+        self._check_loop()
+        if not self.url:
+            self.url = self.encode_url(self.create_url())
+        return self._generate_loop(self._generate_loop_rows(rows))
+
+    def generate_payload_script(self, payloads, headers=None, details=None, search=None):
+        """Generate script code sending the request once per payload read from a file, over a single reused
+        connection.
+
+        The placeholders of the request, like '§param§', mark where the payloads are inserted. The payloads file is
+        read line by line by the generated script, one request being sent per line.
+
+        :param str payloads: Path of the payloads file, as seen by the generated script.
+        :param list headers: Headers list containing fields like 'Host', 'User-Agent', etc.
+        :param dict details: Request specific details dictionary like body and method of the request.
+        :param str search: String to search for in the responses to the requests.
+
+        :raises ValueError: when unsupported HTTP method, invalid `headers` or `details` values, when the request has
+            no placeholder or when the language does not support payload scripts.
+
+        :return: Generated script code.
+        :rtype: str
+        """
+        self.headers = headers or self.headers
+        self.details = details or self.details
+        self.search = search or self.search
+        if not self.code_loop_payloads:
+            raise ValueError("Payload scripts are not supported in %s." % self.__language__)
+        self._check_loop()
+        if not self.url:
+            self.url = self.encode_url(self.create_url())
+        marked = [self.url, self.details.get('data', '')] + self.headers
+        if not any(re_placeholder.search(string) for string in marked):
+            raise ValueError("The request has no placeholder like '\xa7param\xa7' to insert the payloads into.")
+        # Every placeholder receives the payload, as the first and only value of the rows.
+        self.url = mark_placeholders(self.url)
+        self.headers = [mark_placeholders(header) for header in self.headers]
+        self.details = dict(self.details, data=mark_placeholders(self.details.get('data', '')))
+        return self._generate_loop(self._generate_loop_payloads(payloads))
+
+    def _check_loop(self):
+        """Check that a loop script can be generated for the request.
+
+        :raises ValueError: when unsupported HTTP method, invalid `headers` or `details` values, or when the language
+            does not support loop scripts.
+        """
+        if not self.headers:
+            raise ValueError("'headers' cannot be equal to '%s'" % self.headers)
+        elif not self.details:
+            raise ValueError("'details' cannot be equal to '%s'" % self.details)
+        if not self.code_loop_begin:
+            raise ValueError("Loop scripts are not supported in %s." % self.__language__)
+        if self.details.get('method', '').strip().lower() not in ('get', 'post'):
+            raise ValueError("'%s' is not supported! Only GET and POST are supported for now." % self.details['method'])
+
+    def _generate_loop(self, rows_code):
+        """Assemble the loop script around the code providing its rows.
+
+        :param str rows_code: Code snippet defining the rows of values.
+
+        :return: Generated script code.
+        :rtype: str
+        """
+        code = self._generate_loop_begin()
+        code += rows_code
+        code += self._generate_loop_main()
+        code += self._generate_loop_proxy()
+        code += self._generate_connection(
+            self.code_loop_unix_socket or self.code_unix_socket, self.code_loop_connect_to or self.code_connect_to)
+        code += self._generate_loop_https()
+        code += self._generate_loop_request()
+        return code
+
+    def _quote(self, value):
+        """Default quoting of a string literal, escaping it into a single quoted string.
+
+        :param str value: String to quote.
+
+        :return: String literal.
+        :rtype: str
+        """
+        return "'%s'" % value.replace('\\', '\\\\').replace("'", "\\'")
+
+    def _proxy(self):
+        """Literal of the address of the proxy, for the templates assigning it to a constant.
+
+        :return: Quoted address of the proxy, or :attr:`code_proxy_none` when there is none.
+        :rtype: str
+        """
+        if 'proxy_host' in self.details and 'proxy_port' in self.details:
+            return self._quote('%s:%s' % (self.details['proxy_host'], self.details['proxy_port']))
+        return self.code_proxy_none
+
+    def _loop_fields(self):
+        """Values shared by all the loop templates.
+
+        :return: A dictionary of template field name and respective value.
+        :rtype: dict
+        """
+        method = self.details.get('method', '').strip()
+        return {
+            'method': method.upper(),
+            'lower_method': method.lower(),
+            'timings': self._generate_timings(self.code_loop_timings)}
+
+    def _generate_loop_begin(self):
+        """Default generation of the beginning of the loop code, holding the request templates.
+
+        :return: Beginning of the code.
+        :rtype: str
+        """
+        return self.code_loop_begin.format(
+            url=self._quote(native(self.url)),
+            headers=self._generate_loop_headers(),
+            data=self._quote(native(self.details.get('data', ''))),
+            **self._loop_fields())
+
+    def _generate_loop_headers(self):
+        """Default generation of the request headers templates.
+
+        :return: Code snippet with HTTP requests headers.
+        :rtype: str
+        """
+        code = ''
+        for item in self.headers:
+            item = native(item)
+            header, value = item.split(':', 1)
+            code += self.code_loop_header.format(
+                header=self._quote(item),
+                name=self._quote(header.strip()),
+                value=self._quote(value.strip()))
+        return code
+
+    def _generate_loop_rows(self, rows):
+        """Default generation of the table of values the request is sent with.
+
+        :param list rows: Rows of values, each one holding as many values as there are markers.
+
+        :return: Code snippet with the rows of values.
+        :rtype: str
+        """
+        code = ''
+        for row in rows:
+            code += self.code_loop_row.format(values=', '.join(self._quote(native(value)) for value in row))
+        return self.code_loop_rows.format(rows=code, **self._loop_fields())
+
+    def _generate_loop_payloads(self, payloads):
+        """Default generation of the code streaming the rows from a payloads file, one single value row per line.
+
+        :param str payloads: Path of the payloads file.
+
+        :return: Code snippet reading the payloads.
+        :rtype: str
+        """
+        return self.code_loop_payloads.format(payloads=self._quote(payloads), **self._loop_fields())
+
+    def _generate_loop_main(self):
+        """Default generation of the setup of the connection shared by the requests.
+
+        :return: Code snippet with the connection setup.
+        :rtype: str
+        """
+        return self.code_loop_main.format(**self._loop_fields())
+
+    def _generate_loop_proxy(self):
+        """Default generation of the proxy specific code of the shared connection.
+
+        .. note::
+
+            The proxy code of the single request scripts is used when the template has no loop specific one.
+
+        :return: Code snippet with the proxy information.
+        :rtype: str
+        """
+        code_proxy = self.code_loop_proxy or self.code_proxy
+        if code_proxy and 'proxy_host' in self.details and 'proxy_port' in self.details:
+            return code_proxy.format(proxy='%s:%s' % (self.details['proxy_host'], self.details['proxy_port']))
+        return ''
+
+    def _generate_loop_https(self):
+        """Default generation of the HTTPS specific code of the shared connection.
+
+        .. note::
+
+            The HTTPS code of the single request scripts is used when the template has no loop specific one.
+
+        :return: Code snippet with HTTPS setup.
+        :rtype: str
+        """
+        return self.code_loop_https or self.code_https
+
+    def _generate_loop_request(self):
+        """Default generation of the loop sending the requests.
+
+        :return: Code snippet for the requests to send.
+        :rtype: str
+        """
+        post = ''
+        if self.details.get('method', '').strip().lower() == 'post':
+            post = self.code_loop_post.format(**self._loop_fields())
+        if self.output_body:
+            return self._generate_output(self.code_loop_output, post=post, **self._loop_fields())
+        if self.search and self.code_loop_search:
+            fields = self._loop_fields()
+            fields.update(self._search_fields(self.search))
+            return self.code_loop_search.format(post=post, **fields)
+        return self.code_loop_nosearch.format(post=post, **self._loop_fields())
+
+    def generate_batch_script(self, requests, search=None, proxy=None, concurrency=10, unix_socket=None,
+                              connect_to=None):
+        """Generate a single script sending a batch of requests concurrently, sharing connections between them.
+
+        :param iterable requests: Tuples of headers and details of the requests.
+        :param str search: String to search for in the responses to the requests.
+        :param str proxy: Proxy the requests are sent through, if any.
+        :param int concurrency: Maximum number of requests in flight at once.
+        :param str unix_socket: Path of the Unix socket the requests are sent through, if any.
+        :param str connect_to: Address the requests connect to instead of the host of their URL, if any.
+
+        :raises ValueError: when a request has an unsupported HTTP method or an invalid URL, when the proxy, the
+            connection overrides or the concurrency is invalid, or when the language does not support batch scripts or
+            the connection overrides.
+
+        :return: Generated script code.
+        :rtype: str
+        """
+        if not self.code_batch_begin:
+            raise ValueError("Batch scripts are not supported in %s." % self.__language__)
+        if concurrency < 1:
+            raise ValueError("Concurrency must be positive, not %s." % concurrency)
+        self.search = search or self.search
+        connection = get_connection_details(unix_socket, connect_to)
+        code = ''
+        for index, (headers, details) in enumerate(requests, 1):
+            self.headers, self.details = headers, dict(details, **connection)
+            if self.details.get('method', '').strip().lower() not in ('get', 'post'):
+                raise ValueError(
+                    "'%s' is not supported! Only GET and POST are supported for now." % self.details['method'])
+            self.url = self.encode_url(self.create_url())
+            code += self._generate_batch_request(index)
+        self.details = get_proxy_details(proxy) if proxy else {}
+        self.details.update(connection)
+        code = self._generate_batch_begin(concurrency) + self.code_batch_requests.format(requests=code)
+        code += self._generate_batch_main(concurrency)
+        code += self._generate_batch_proxy()
+        code += self._generate_batch_connection()
+        code += self._generate_batch_https()
+        code += self._generate_batch_loop()
+        return code
+
+    def _generate_batch_begin(self, concurrency):
+        """Default generation of the beginning of the batch code.
+
+        :param int concurrency: Maximum number of requests in flight at once.
+
+        :return: Beginning of the code.
+        :rtype: str
+        """
+        return self.code_batch_begin.format(
+            concurrency=concurrency, timings=self._generate_timings(self.code_batch_timings))
+
+    def _generate_batch_request(self, index):
+        """Default generation of the entry of the current request in the batch.
+
+        :param int index: Position of the request in the batch, starting at 1.
+
+        :return: Code snippet describing the request.
+        :rtype: str
+        """
+        method = self.details.get('method', '').strip()
+        return self.code_batch_request.format(
+            index=index,
+            method=self._quote(method.upper()),
+            lower_method=method.lower(),
+            url=self._quote(self.url),
+            headers=', '.join(self._generate_batch_headers()),
+            data=self._quote(self.details.get('data', '') if method.lower() == 'post' else ''))
+
+    def _generate_batch_headers(self):
+        """Default generation of the headers of the current request in the batch.
+
+        :return: Code snippets of the headers.
+        :rtype: list
+        """
+        headers = []
+        for item in self.headers:
+            header, value = item.split(':', 1)
+            headers.append(self.code_batch_header.format(
+                header=self._quote(item),
+                name=self._quote(header.strip()),
+                value=self._quote(value.strip())))
+        return headers
+
+    def _generate_batch_main(self, concurrency):
+        """Default generation of the setup of the connections shared by the batch.
+
+        :param int concurrency: Maximum number of requests in flight at once.
+
+        :return: Code snippet with the connections setup.
+        :rtype: str
+        """
+        return self.code_batch_main.format(concurrency=concurrency)
+
+    def _generate_batch_proxy(self):
+        """Default generation of the proxy specific code of the batch.
+
+        :return: Code snippet with the proxy information.
+        :rtype: str
+        """
+        if self.code_batch_proxy and 'proxy_host' in self.details and 'proxy_port' in self.details:
+            proxy = '%s:%s' % (self.details['proxy_host'], self.details['proxy_port'])
+            return self.code_batch_proxy.format(proxy=proxy)
+        return ''
+
+    def _generate_batch_connection(self):
+        """Default generation of the connection overrides of the batch, shared by its requests.
+
+        :return: Code snippet with the connection overrides, empty if there are none.
+        :rtype: str
+        """
+        return self._generate_connection(self.code_batch_unix_socket, self.code_batch_connect_to)
+
+    def _generate_batch_https(self):
+        """Default generation of the HTTPS specific code of the batch.
+
+        :return: Code snippet with HTTPS setup.
+        :rtype: str
+        """
+        return self.code_batch_https
+
+    def _generate_batch_loop(self):
+        """Default generation of the loop sending the batch.
+
+        :return: Code snippet for the requests to send.
+        :rtype: str
+        """
+        timings = self._generate_timings(self.code_batch_timings)
+        if self.output_body:
+            return self._generate_output(self.code_batch_output, timings=timings)
+        if self.search and self.code_batch_search:
+            return self.code_batch_search.format(timings=timings, **self._search_fields(self.search))
+        return self.code_batch_nosearch.format(timings=timings)
+
     def create_url(self):
         """Create valid URL.
 
@@ -189,6 +763,24 @@ class AbstractScript(object):
             encoded_url += quote(self.details['data'], '')
         return encoded_url
 
+    def load_profile(self, profile):
+        """Select the templates of a generation profile.
+
+        The templates of the script named like `code_<profile>_<name>` replace its `code_<name>` templates, the
+        templates without such a variant being shared by every profile.
+
+        :param str profile: Generation profile, one of :attr:`PROFILES`.
+
+        :raises ValueError: When the profile is not supported.
+        """
+        if profile not in self.PROFILES:
+            raise ValueError("The '%s' profile is not supported, use one of: %s." % (profile, ', '.join(self.PROFILES)))
+        self.profile = profile
+        prefix = 'code_%s_' % profile
+        for attr in dir(self.__class__):
+            if attr.startswith(prefix):
+                setattr(self, 'code_' + attr[len(prefix):], getattr(self.__class__, attr))
+
     @staticmethod
     def load_attributes(cls):
         """Loads attributes to Script class from a given script's template
@@ -208,3 +800,4 @@ class AbstractScript(object):
         attributes = (var for var in vars(template) if var.startswith('code_'))
         for attr in attributes:
             setattr(cls, attr, getattr(template, attr))
+
@@ -0,0 +1,231 @@
+"""
+
+:synopsis: On-disk cache of the responses of replayed requests, revalidated with conditional requests.
+
+The responses carrying an ``ETag`` or a ``Last-Modified`` header are stored in a SQLite database, keyed by the method
+and the URL of their request and by the values of the request headers named by their ``Vary`` header. When the
+request is replayed again, it is sent along with ``If-None-Match`` and ``If-Modified-Since``, and a ``304 Not
+Modified`` response is answered from the cache, without transferring the body again. The least recently used
+responses are evicted once the bodies exceed the size of the cache.
+
+"""
+
+import collections
+import json
+import sqlite3
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    vary TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    used INTEGER NOT NULL,
+    PRIMARY KEY (method, url, variant)
+);
+CREATE INDEX IF NOT EXISTS responses_used ON responses (used);
+"""
+
+# Headers of a request already making it conditional, sent as captured instead of being revalidated by the cache.
+CONDITIONAL_HEADERS = frozenset(['if-none-match', 'if-modified-since', 'if-match', 'if-unmodified-since', 'if-range'])
+
+CachedResponse = collections.namedtuple('CachedResponse', 'method url variant status headers body')
+
+
+def _header_values(headers):
+    """Index the values of the header lines of a request by lowercase name."""
+    values = {}
+    for header in headers:
+        name, _, value = header.partition(':')
+        name = name.strip().lower()
+        values[name] = values[name] + ', ' + value.strip() if name in values else value.strip()
+    return values
+
+
+def _variant(vary, values):
+    """Identify the variant of a response selected by the values of the request headers named by its Vary header."""
+    return json.dumps([values.get(name) for name in vary])
+
+
+def is_conditional(headers):
+    """Whether a request is already conditional, see :data:`CONDITIONAL_HEADERS`.
+
+    :param list headers: Headers list containing lines like 'Host: google.com'.
+
+    :rtype: bool
+    """
+    return any(header.split(':', 1)[0].strip().lower() in CONDITIONAL_HEADERS for header in headers)
+
+
+class ResponseCache(object):
+
+    """Size-bounded cache of responses, counting the hits of the replays and the bytes they saved."""
+
+    # Methods whose responses are cached.
+    METHODS = ('GET', 'HEAD')
+
+    def __init__(self, path, max_size=256 * 1024 * 1024):
+        """Open the cache, creating it if needed.
+
+        :param str path: Path of the SQLite database.
+        :param int max_size: Maximum size of the cached bodies, in bytes.
+
+        :raises ValueError: When the size is not positive.
+        :raises sqlite3.Error: When the database cannot be opened.
+        """
+        if max_size < 1:
+            raise ValueError("Size of the cache must be positive, not %s." % max_size)
+        self.path = path
+        self.max_size = max_size
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+        size, used = self._connection.execute('SELECT SUM(size), MAX(used) FROM responses').fetchone()
+        self.size = size or 0
+        # Clock of the uses of the responses, the least recently used ones being evicted first
+        self._clock = used or 0
+        self.lookups = 0
+        self.hits = 0
+        self.saved_bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._connection.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def lookup(self, method, url, headers):
+        """Find the cached response to a request, counting the lookup.
+
+        :param str method: Method of the request.
+        :param str url: URL of the request.
+        :param list headers: Headers list containing lines like 'Host: google.com'.
+
+        :return: The cached response, if any.
+        :rtype: :class:`CachedResponse`
+        """
+        if method not in self.METHODS:
+            return None
+        self.lookups += 1
+        values = _header_values(headers)
+        cursor = self._connection.execute(
+            'SELECT variant, vary, status, headers, body FROM responses WHERE method = ? AND url = ?', (method, url))
+        for variant, vary, status, response_headers, body in cursor:
+            if variant == _variant(json.loads(vary), values):
+                return CachedResponse(method, url, variant, status, json.loads(response_headers), bytes(body))
+        return None
+
+    def validators(self, cached):
+        """Return the header lines making a request conditional on the cached response being still fresh.
+
+        :param cached: :class:`CachedResponse` from :meth:`lookup`.
+
+        :rtype: list
+        """
+        lines = []
+        if 'etag' in cached.headers:
+            lines.append('If-None-Match: %s' % cached.headers['etag'])
+        if 'last-modified' in cached.headers:
+            lines.append('If-Modified-Since: %s' % cached.headers['last-modified'])
+        return lines
+
+    def hit(self, cached, headers):
+        """Record that a cached response was not modified, updating it with the headers of the 304 response.
+
+        :param cached: :class:`CachedResponse` from :meth:`lookup`.
+        :param dict headers: Headers of the 304 response, by lowercase name.
+        """
+        self.hits += 1
+        self.saved_bytes += len(cached.body)
+        updated = dict(cached.headers)
+        for name in ('etag', 'last-modified', 'date', 'expires', 'cache-control'):
+            if name in headers:
+                updated[name] = headers[name]
+        self._connection.execute(
+            'UPDATE responses SET headers = ?, used = ? WHERE method = ? AND url = ? AND variant = ?',
+            (json.dumps(updated), self._tick(), cached.method, cached.url, cached.variant))
+
+    def cacheable(self, method, status, headers):
+        """Whether a response can be cached and revalidated later.
+
+        :param str method: Method of the request.
+        :param int status: Status code of the response.
+        :param dict headers: Headers of the response, by lowercase name.
+
+        :rtype: bool
+        """
+        return (
+            method in self.METHODS and status == 200 and ('etag' in headers or 'last-modified' in headers) and
+            'no-store' not in headers.get('cache-control', '').lower() and headers.get('vary', '').strip() != '*')
+
+    def store(self, method, url, request_headers, status, headers, body):
+        """Cache a response, evicting the least recently used ones beyond the size of the cache.
+
+        :param str method: Method of the request.
+        :param str url: URL of the request.
+        :param list request_headers: Headers list containing lines like 'Host: google.com'.
+        :param int status: Status code of the response.
+        :param dict headers: Headers of the response, by lowercase name.
+        :param bytes body: Body of the response, as received.
+
+        :return: Whether the response was cached, which it is not when it is not :meth:`cacheable` or too large.
+        :rtype: bool
+        """
+        if not self.cacheable(method, status, headers) or len(body) > self.max_size:
+            return False
+        vary = sorted(set(name.strip().lower() for name in headers.get('vary', '').split(',') if name.strip()))
+        variant = _variant(vary, _header_values(request_headers))
+        previous = self._connection.execute(
+            'SELECT size FROM responses WHERE method = ? AND url = ? AND variant = ?',
+            (method, url, variant)).fetchone()
+        if previous:
+            self.size -= previous[0]
+        self._connection.execute(
+            'INSERT OR REPLACE INTO responses (method, url, variant, vary, status, headers, body, size, used) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (method, url, variant, json.dumps(vary), status, json.dumps(headers), sqlite3.Binary(body), len(body),
+             self._tick()))
+        self.size += len(body)
+        self._evict()
+        return True
+
+    def _evict(self):
+        while self.size > self.max_size:
+            victims = self._connection.execute(
+                'SELECT rowid, size FROM responses ORDER BY used LIMIT 64').fetchall()
+            for rowid, size in victims:
+                if self.size <= self.max_size:
+                    break
+                self._connection.execute('DELETE FROM responses WHERE rowid = ?', (rowid,))
+                self.size -= size
+
+    def stats(self):
+        """Summarize how much the cache saved so far.
+
+        :return: Number of lookups, of hits, the ratio of hits per lookup and the bytes of the bodies not transferred
+            again.
+        :rtype: dict
+        """
+        return {
+            'lookups': self.lookups, 'hits': self.hits,
+            'hit_ratio': float(self.hits) / self.lookups if self.lookups else 0.0, 'saved_bytes': self.saved_bytes}
+
+    def commit(self):
+        """Save the pending changes."""
+        self._connection.commit()
+
+    def close(self):
+        """Save the pending changes and close the cache."""
+        self._connection.commit()
+        self._connection.close()
@@ -1,16 +1,54 @@
 from __future__ import print_function
 
+import os
 import sys
+import json
 import argparse
+import collections
 
+from .base import AbstractScript
+from .cache import ResponseCache
+from .cluster import cluster_requests
+from .corpus import iter_raw_requests, parse_corpus, save_code
+from .dedup import Deduplicator, VOLATILE_HEADERS
+from .har import parse_har
+from .index import CorpusIndex
 from .interface import HttpRequestTranslator
+from .interner import StringInterner
+from .plugin_manager import generate_batch_script
+from .search import load_patterns
 from .input_handler import handlers
+from .store import CorpusStore, CorpusStoreWriter
 
 
 def init():
-    args = take_args()
-    hrt = process_args(args)
-    print(''.join(v for v in hrt.generate_code().values()))
+    if sys.argv[1:2] == ['query']:
+        process_query(take_query_args())
+        return
+    if sys.argv[1:2] == ['replay']:
+        process_replay(take_replay_args())
+        return
+    if sys.argv[1:2] == ['load']:
+        process_load(take_load_args())
+        return
+    parser = take_args()
+    args = parser.parse_args()
+    if args.output_body and (args.search_string or args.search_file):
+        parser.error("--output-body cannot be used with --search_string or --search-file")
+    if args.output_hash and not args.output_body:
+        parser.error("--output-hash requires --output-body")
+    if args.corpus or args.store:
+        if args.payloads:
+            parser.error("--payloads cannot be used with --corpus or --store")
+        process_corpus(parser, args)
+        return
+    hrt = process_args(parser, args)
+    try:
+        all_code = hrt.generate_code()
+    except ValueError as error:
+        # Like the languages without payload scripts
+        parser.error(str(error))
+    print(''.join(v for v in all_code.values()))
 
 
 def take_args():
@@ -19,33 +57,300 @@ def take_args():
     :return:`argparse.ArgumentParser` instance.
     :rtype:class `argparse.ArgumentParser`
     """
-    # TODO: use non-hardcoded list of supported languages.
     parser = argparse.ArgumentParser(
         description="Request Translator is a standalone tool that can translate "
-                    "raw HTTP requests into bash/python/php/ruby scripts")
+                    "raw HTTP requests into bash/python/php/ruby scripts",
+        epilog="Use 'hrt query --help' to re-translate the requests of an index, 'hrt replay --help' to send "
+               "requests without generating scripts and 'hrt load --help' to load test a target with them.")
     request_group = parser.add_mutually_exclusive_group()
+    add_translation_args(parser)
+    parser.add_argument(
+        "--interactive", "-i",
+        action="store_true",
+        help="Interactive mode: read raw HTTP request from keyboard, hit enter when ready. Type 'Ctrl+D' or 'Ctrl+C'"
+             "to exit from the interactive mode.")
+    request_group.add_argument(
+        "--request", "-r",
+        help="Input the HTTP request")
+    request_group.add_argument(
+        "--file", "-f",
+        help="Input file for HTTP request")
+    request_group.add_argument(
+        "--stdin", "-s",
+        action="store_true",
+        help="Enable stdin mode for HTTP request")
+    request_group.add_argument(
+        "--corpus", "-c",
+        help="Input file holding several HTTP requests, each one separated by a line of '%%%%%%%%'")
+    parser.add_argument(
+        "--payloads",
+        help="Payloads file, one payload per line, inserted in place of the placeholders of the request like "
+             "'\xa7param\xa7'. A single script sends every payload over one kept-alive connection")
+    request_group.add_argument(
+        "--store",
+        help="Input request store previously saved with --save-store, translated without parsing the requests again")
+    parser.add_argument(
+        "--save-store",
+        help="Save the parsed requests of the corpus into a memory-mappable request store")
+    parser.add_argument(
+        "--intern",
+        action="store_true",
+        help="Deduplicate the header lines, hosts, paths and methods shared by the requests kept by --batch and "
+             "report the bytes saved")
+    parser.add_argument(
+        "--index",
+        help="Index the requests of the corpus and their generated scripts into a SQLite database")
+    parser.add_argument(
+        "--dedup",
+        choices=Deduplicator.MODES,
+        help="Skip the duplicated requests of the corpus, using a bounded-memory Bloom filter or exact hashes")
+    parser.add_argument(
+        "--dedup-capacity",
+        type=int,
+        default=1000000,
+        help="Number of unique requests the Bloom filter is sized for")
+    parser.add_argument(
+        "--dedup-error-rate",
+        type=float,
+        default=0.001,
+        help="Target rate of unique requests wrongly skipped by the Bloom filter")
+    parser.add_argument(
+        "--dedup-ignore",
+        default=','.join(sorted(VOLATILE_HEADERS)),
+        help="Headers, separated by a <,>, not making two requests different. Hop-by-hop headers are always ignored. "
+             "Defaults to '%(default)s'")
+    parser.add_argument(
+        "--cluster",
+        action="store_true",
+        help="Group the requests of the corpus only differing by their parameter values into endpoints and generate "
+             "a single script per endpoint, sending all of its requests over one connection")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Generate a single script sending every request of the corpus concurrently over shared connections")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=10,
+        help="Maximum number of requests of a batch in flight at once. Defaults to %(default)s")
+    return parser
+
+
+def add_translation_args(parser):
+    """Add the arguments controlling the generated scripts to a parser.
+
+    :param class `argparse.ArgumentParser`: `argparse.ArgumentParser` instance.
+    """
+    # TODO: use non-hardcoded list of supported languages.
     parser.add_argument(
         "--language", "-l",
         action="append",
         help="Generates a script in language 'language' for given HTTP request. "
              "If you want to generate multiple scripts, separate the script's name with a <,>. "
-             "Available languages: bash, php, python, ruby")
+             "Available languages: aiohttp, bash, go, k6, locust, php, python, ruby, wrk")
     parser.add_argument(
         "--proxy", "-p",
         nargs="?",
         const="127.0.0.1:8009",
         help="Generates command/script with relevant, specified proxy")
+    parser.add_argument(
+        "--unix-socket",
+        metavar="PATH",
+        help="Sends the requests through this Unix socket instead of connecting to the host of their URL")
+    parser.add_argument(
+        "--connect-to",
+        metavar="HOST:PORT",
+        help="Connects to this address instead of the host of the URL, keeping the URL and the Host header")
     parser.add_argument(
         "--search_string", "-ss",
         help="Sends the request and searches for the required string in the response (regex can be provided)")
     parser.add_argument(
-        "--interactive", "-i",
+        "--search-file",
+        metavar="PATH",
+        help="Searches the responses for the patterns of this file, one per line, the regexes prefixed by 'regex:', "
+             "counting the hits of every pattern. Only supported by the python scripts")
+    parser.add_argument(
+        "--first-match",
         action="store_true",
-        help="Interactive mode: read raw HTTP request from keyboard, hit enter when ready. Type 'Ctrl+D' or 'Ctrl+C'"
-             "to exit from the interactive mode.")
+        help="Stops receiving each response at the first match of the search string")
+    parser.add_argument(
+        "--output-body",
+        metavar="PATH",
+        help="Streams the response bodies into files of this directory, one per request, instead of printing them")
+    parser.add_argument(
+        "--output-hash",
+        choices=AbstractScript.HASHES,
+        help="Hashes the response bodies written by --output-body as they are received")
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Reports the DNS, connect, TLS, first byte and total times and the bytes transferred of every request, "
+             "as a JSON line")
     parser.add_argument(
         "--data", "-d",
         help="Add the data that you want to send along with the header")
+    parser.add_argument(
+        "--profile",
+        choices=AbstractScript.PROFILES,
+        default='debug',
+        help="Generates verbose scripts for debugging (default), or scripts tuned for throughput: non-verbose, "
+             "requesting compressed responses, attempting HTTP/2, with TCP keepalive and timeouts")
+    parser.add_argument(
+        "--output-dir",
+        help="Write the scripts of each request of a corpus into this directory instead of printing them")
+
+
+def take_query_args():
+    """Entry point for the `query` command through CLI. Initializes parser using `argparse` library.
+
+    :return:`argparse.ArgumentParser` instance.
+    :rtype:class `argparse.ArgumentParser`
+    """
+    parser = argparse.ArgumentParser(
+        prog="hrt query",
+        description="Re-translate the requests of an index matching every given criterion")
+    parser.add_argument(
+        "index",
+        help="SQLite index filled with --index")
+    parser.add_argument(
+        "--method",
+        help="HTTP method of the requests")
+    parser.add_argument(
+        "--host",
+        help="Host header of the requests")
+    parser.add_argument(
+        "--path-prefix",
+        help="Beginning of the path of the requests")
+    add_translation_args(parser)
+    return parser
+
+
+def take_replay_args():
+    """Entry point for the `replay` command through CLI. Initializes parser using `argparse` library.
+
+    :return:`argparse.ArgumentParser` instance.
+    :rtype:class `argparse.ArgumentParser`
+    """
+    # The replay engine is built on asyncio, thus only available on Python 3.
+    from .replay import COALESCE_IGNORED_HEADERS
+
+    parser = argparse.ArgumentParser(
+        prog="hrt replay",
+        description="Send requests, reporting each response as a JSON line, instead of generating scripts")
+    add_sending_args(parser)
+    parser.add_argument(
+        "--search_string", "-ss",
+        help="Searches for the required string in the responses as they arrive (regex can be provided)")
+    parser.add_argument(
+        "--search-file",
+        metavar="PATH",
+        help="Searches the responses for the patterns of this file, one per line, the regexes prefixed by 'regex:', "
+             "counting the hits of every pattern")
+    parser.add_argument(
+        "--first-match",
+        action="store_true",
+        help="Stops receiving each response at the first match of the search string")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=10,
+        help="Maximum number of requests in flight at once. Defaults to %(default)s")
+    parser.add_argument(
+        "--limit-per-host",
+        type=int,
+        help="Maximum number of connections open to a host. Defaults to the concurrency")
+    parser.add_argument(
+        "--preserve-timing",
+        action="store_true",
+        help="Sends the requests of the --har capture at their captured moments instead of as fast as possible, "
+             "whatever the concurrency, and reports how late they were sent")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Speed-up factor of --preserve-timing, 2 sending the requests twice as fast as captured. Defaults to "
+             "%(default)s")
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="Caches the responses carrying an ETag or a Last-Modified header in this SQLite database, and "
+             "revalidates them with conditional requests on the next replays, a 304 response being answered from "
+             "the cache")
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=256,
+        help="Maximum size of the bodies of the --cache, in megabytes, the least recently used ones being evicted. "
+             "Defaults to %(default)s")
+    parser.add_argument(
+        "--coalesce",
+        action="store_true",
+        help="Sends a single request for the identical GET and HEAD requests in flight at once, sharing its response")
+    parser.add_argument(
+        "--coalesce-ignore",
+        default=','.join(sorted(COALESCE_IGNORED_HEADERS)),
+        help="Headers, separated by a <,>, not making two requests different when coalescing them. Hop-by-hop headers "
+             "are always ignored. Defaults to '%(default)s'")
+    return parser
+
+
+def take_load_args():
+    """Entry point for the `load` command through CLI. Initializes parser using `argparse` library.
+
+    :return:`argparse.ArgumentParser` instance.
+    :rtype:class `argparse.ArgumentParser`
+    """
+    parser = argparse.ArgumentParser(
+        prog="hrt load",
+        description="Send requests at a target rate, whatever the responses still awaited, and report the "
+                    "throughput and the percentiles of the latencies")
+    add_sending_args(parser)
+    parser.add_argument(
+        "--rate",
+        type=float,
+        required=True,
+        help="Requests sent per second, cycling through the requests of the corpus")
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=10,
+        help="Seconds during which the requests are sent. Defaults to %(default)s")
+    parser.add_argument(
+        "--arrivals",
+        choices=('constant', 'poisson'),
+        default='constant',
+        help="Distribution of the arrivals of the requests. Defaults to %(default)s")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Number of worker processes sharing the rate. Defaults to %(default)s")
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=100,
+        help="Maximum number of connections open to a host, per process. Defaults to %(default)s")
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Seed of the Poisson arrivals")
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Prints the report as JSON")
+    return parser
+
+
+def add_sending_args(parser):
+    """Add the arguments of the commands sending requests, instead of generating scripts, to a parser.
+
+    :param class `argparse.ArgumentParser`: `argparse.ArgumentParser` instance.
+    """
+    request_group = parser.add_mutually_exclusive_group()
+    request_group.add_argument(
+        "--interactive", "-i",
+        action="store_true",
+        help="Interactive mode: read raw HTTP request from keyboard, hit enter when ready")
     request_group.add_argument(
         "--request", "-r",
         help="Input the HTTP request")
@@ -56,7 +361,37 @@ def take_args():
         "--stdin", "-s",
         action="store_true",
         help="Enable stdin mode for HTTP request")
-    return parser
+    request_group.add_argument(
+        "--corpus", "-c",
+        help="Input file holding several HTTP requests, each one separated by a line of '%%%%%%%%'")
+    request_group.add_argument(
+        "--store",
+        help="Input request store previously saved with --save-store")
+    request_group.add_argument(
+        "--har",
+        help="Input HAR capture, its requests being sent in the order they were captured")
+    parser.add_argument(
+        "--data", "-d",
+        help="Add the data that you want to send along with the header")
+    parser.add_argument(
+        "--proxy", "-p",
+        nargs="?",
+        const="127.0.0.1:8009",
+        help="Sends the requests through this HTTP proxy")
+    parser.add_argument(
+        "--unix-socket",
+        metavar="PATH",
+        help="Sends the requests through this Unix socket instead of connecting to the host of their URL")
+    parser.add_argument(
+        "--connect-to",
+        metavar="HOST:PORT",
+        help="Connects to this address instead of the host of the URL, keeping the URL and the Host header")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=30,
+        help="Seconds given to each request to complete. Defaults to %(default)s")
+    parser.set_defaults(save_store=None)
 
 
 def get_input_type(args):
@@ -100,7 +435,431 @@ def get_input(input_type, *options):
     return ''
 
 
-def process_args(parser):
+def get_languages(args):
+    """Find the languages to generate the scripts in based on CLI arguments.
+
+    .. note::
+
+        Default language is set to 'bash'.
+
+    :param `argparse.Namespace` args: `argparse.Namespace` instance.
+
+    :return: list of language names
+    :rtype: list
+    """
+    if args.language:
+        return [language.strip() for language in args.language[0].split(',')]
+    return ['bash']
+
+
+def get_output_body(args, name):
+    """Find the directory the scripts of a request or an endpoint write the response bodies into.
+
+    .. note::
+
+        Every script gets its own subdirectory of the one given on CLI, named after it, so that the scripts generated
+        from a corpus do not overwrite the bodies of each other.
+
+    :param `argparse.Namespace` args: `argparse.Namespace` instance.
+    :param str name: Name of the scripts.
+
+    :return: Path of the directory, if the bodies are written to files.
+    :rtype: str
+    """
+    if args.output_body:
+        return os.path.join(args.output_body, name)
+    return None
+
+
+def get_parsed_requests(args, interner=None):
+    """Load the parsed requests of the corpus or the request store given on CLI.
+
+    The requests of a corpus are also saved into a request store when `--save-store` is used.
+
+    :param `argparse.Namespace` args: `argparse.Namespace` instance.
+    :param interner: :class:`hrt.interner.StringInterner` shared by the requests of the corpus, if any.
+
+    :raises OSError, IOError: When the corpus or store file fails to open.
+    :raises ValueError: When a request of the corpus or the store is invalid.
+
+    :return: Generator of tuples of headers and details.
+    :rtype: generator
+    """
+    if args.store:
+        with CorpusStore(args.store) as store:
+            for parsed in store:
+                yield parsed
+        return
+    writer = CorpusStoreWriter(args.save_store) if args.save_store else None
+    try:
+        with open(args.corpus) as corpus:
+            for headers, details in parse_corpus(iter_raw_requests(corpus), interner=interner):
+                if writer is not None:
+                    writer.add(headers, details)
+                yield headers, details
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def output_code(args, request_id, headers, details, index=None):
+    """Translate a parsed request, then print its code or write it into the output directory given on CLI.
+
+    :param `argparse.Namespace` args: `argparse.Namespace` instance.
+    :param int request_id: Id of the request, used to name its scripts.
+    :param list headers: Headers list containing lines like 'Host: google.com'.
+    :param dict details: Request specific details dictionary like body and method of the request.
+    :param index: :class:`hrt.index.CorpusIndex` recording the location of the scripts, if any.
+
+    :raises ValueError: When proxy is invalid.
+    :raises OSError, IOError: When a script cannot be written.
+    """
+    name = 'request-%d' % request_id
+    all_code = HttpRequestTranslator(
+        parsed=(headers, details),
+        languages=get_languages(args),
+        proxy=args.proxy,
+        search_string=args.search_string,
+        data=args.data,
+        profile=args.profile,
+        first_match=args.first_match,
+        output_body=get_output_body(args, name),
+        output_hash=args.output_hash,
+        timings=args.timings,
+        unix_socket=args.unix_socket,
+        connect_to=args.connect_to).generate_code()
+    locations = write_code(args, all_code, name)
+    if index is not None:
+        for language, location in locations.items():
+            index.add_artifact(request_id, language, location)
+
+
+def write_code(args, all_code, name):
+    """Print generated code or write it into the output directory given on CLI.
+
+    :param `argparse.Namespace` args: `argparse.Namespace` instance.
+    :param dict all_code: A dictionary of language name and respective code.
+    :param str name: Name of the scripts in the output directory.
+
+    :raises OSError, IOError: When a script cannot be written.
+
+    :return: A dictionary of language name and respective script location, empty when the code is printed.
+    :rtype: dict
+    """
+    if not args.output_dir:
+        print(''.join(v for v in all_code.values()))
+        return {}
+    return save_code(all_code, args.output_dir, name)
+
+
+def translate_requests(args, parsed_requests):
+    """Translate parsed requests one by one, indexing them if an index is given on CLI.
+
+    :param `argparse.Namespace` args: `argparse.Namespace` instance.
+    :param iterable parsed_requests: Tuples of headers and details.
+
+    :raises ValueError: When proxy is invalid.
+    :raises OSError, IOError: When a script cannot be written.
+    """
+    index = CorpusIndex(args.index) if args.index else None
+    try:
+        for number, (headers, details) in enumerate(parsed_requests, 1):
+            request_id = number if index is None else index.add(headers, details)
+            output_code(args, request_id, headers, details, index)
+    finally:
+        if index is not None:
+            index.close()
+
+
+def translate_endpoints(args, parsed_requests):
+    """Cluster parsed requests into endpoints and translate each endpoint into a single script.
+
+    :param `argparse.Namespace` args: `argparse.Namespace` instance.
+    :param iterable parsed_requests: Tuples of headers and details.
+
+    :raises ValueError: When proxy is invalid.
+    :raises OSError, IOError: When a script cannot be written.
+    """
+    for number, endpoint in enumerate(cluster_requests(parsed_requests), 1):
+        name = 'endpoint-%d' % number
+        all_code = dict(
+            (language, endpoint.generate_script(
+                language, search=args.search_string, proxy=args.proxy, profile=args.profile,
+                first_match=args.first_match, output_body=get_output_body(args, name), output_hash=args.output_hash,
+                timings=args.timings, unix_socket=args.unix_socket, connect_to=args.connect_to))
+            for language in get_languages(args))
+        write_code(args, all_code, name)
+
+
+def translate_batch(args, parsed_requests):
+    """Translate parsed requests into a single script per language, sending them concurrently.
+
+    :param `argparse.Namespace` args: `argparse.Namespace` instance.
+    :param iterable parsed_requests: Tuples of headers and details.
+
+    :raises ValueError: When proxy, concurrency or a request is invalid, or a language has no batch support.
+    :raises OSError, IOError: When a script cannot be written.
+    """
+    parsed_requests = list(parsed_requests)
+    all_code = dict(
+        (language, generate_batch_script(
+            language, parsed_requests, search_string=args.search_string, proxy=args.proxy,
+            concurrency=args.concurrency, profile=args.profile, first_match=args.first_match,
+            output_body=args.output_body, output_hash=args.output_hash, timings=args.timings,
+            unix_socket=args.unix_socket, connect_to=args.connect_to))
+        for language in get_languages(args))
+    write_code(args, all_code, 'batch')
+
+
+def process_corpus(parser, args):
+    """Process the arguments provided to the translator CLI and translate every request of the corpus.
+
+    :param class `argparse.ArgumentParser`: `argparse.ArgumentParser` instance.
+    :param `argparse.Namespace` args: Arguments already parsed by the parser.
+
+    :raises OSError, IOError: When the corpus or store file fails to open.
+    :raises ValueError: When proxy or a request of the corpus is invalid.
+    """
+    load_search_file(parser, args)
+    if args.cluster and args.index:
+        parser.error("--cluster cannot be used with --index")
+    if args.batch and (args.cluster or args.index):
+        parser.error("--batch cannot be used with --cluster or --index")
+    if args.intern and not args.batch:
+        # The other requests are translated then dropped one at a time, there is nothing to share
+        parser.error("--intern can only be used with --batch")
+    interner = StringInterner() if args.intern else None
+    parsed_requests = get_parsed_requests(args, interner)
+    deduplicator = None
+    if args.dedup:
+        deduplicator = Deduplicator(
+            mode=args.dedup,
+            capacity=args.dedup_capacity,
+            error_rate=args.dedup_error_rate,
+            ignored_headers=[header for header in args.dedup_ignore.split(',') if header.strip()])
+        parsed_requests = deduplicator.filter(parsed_requests)
+    if args.cluster:
+        translate_endpoints(args, parsed_requests)
+    elif args.batch:
+        translate_batch(args, parsed_requests)
+    else:
+        translate_requests(args, parsed_requests)
+    if interner is not None:
+        sys.stderr.write("Interned {unique} unique strings, dropped {hits} duplicates, saved {saved_bytes} "
+                         "bytes\n".format(**interner.stats()))
+    if deduplicator is not None:
+        sys.stderr.write("Skipped %d duplicated requests\n" % deduplicator.duplicates)
+
+
+def process_query(parser):
+    """Process the arguments provided to the `query` command and translate the matching requests of the index.
+
+    :param class `argparse.ArgumentParser`: `argparse.ArgumentParser` instance.
+
+    :raises ValueError: When proxy is invalid.
+    """
+    args = parser.parse_args(sys.argv[2:])
+    load_search_file(parser, args)
+    if not os.path.isfile(args.index):
+        parser.error("index '%s' does not exist" % args.index)
+    with CorpusIndex(args.index) as index:
+        for request_id, headers, details in index.query(
+                method=args.method,
+                host=args.host,
+                path_prefix=args.path_prefix):
+            output_code(args, request_id, headers, details, index)
+
+
+def load_search_file(parser, args):
+    """Replace the search string by the patterns of the pattern file given on CLI, if any.
+
+    :param class `argparse.ArgumentParser`: `argparse.ArgumentParser` instance.
+    :param `argparse.Namespace` args: `argparse.Namespace` instance.
+
+    :raises OSError, IOError: When the pattern file fails to open.
+    :raises ValueError: When the pattern file holds no pattern, or an invalid regex.
+    """
+    if not args.search_file:
+        return
+    if args.search_string:
+        parser.error("--search-file cannot be used with --search_string")
+    with open(args.search_file) as pattern_file:
+        args.search_string = load_patterns(pattern_file)
+
+
+def report_result(result):
+    """Print the result of a replayed request as a JSON line.
+
+    :param dict result: Result of the request, see :class:`hrt.replay.Replayer`.
+    """
+    print(json.dumps(result))
+    sys.stdout.flush()
+
+
+def get_sent_requests(parser, args):
+    """Load the parsed requests given to a command sending them.
+
+    The data given with `--data` replaces the body of every request, as when translating them.
+
+    :param class `argparse.ArgumentParser`: `argparse.ArgumentParser` instance.
+    :param `argparse.Namespace` args: `argparse.Namespace` instance.
+
+    :raises OSError, IOError: When the corpus or store file fails to open.
+    :raises ValueError: When the request or a request of the corpus is invalid.
+
+    :return: Iterable of tuples of headers and details.
+    :rtype: iterable
+    """
+    if args.corpus or args.store:
+        requests = get_parsed_requests(args)
+    elif args.har:
+        requests = [(headers, details) for _, headers, details in get_har_requests(args)]
+    else:
+        input_type, options = get_input_type(args)
+        if not input_type:
+            parser.print_help()
+            sys.exit(-1)
+        hrt_obj = HttpRequestTranslator(request=get_input(input_type, *options), data=args.data)
+        return [(hrt_obj.headers, hrt_obj.details)]
+    if args.data:
+        return ((headers, dict(details, data=args.data)) for headers, details in requests)
+    return requests
+
+
+def get_har_requests(args):
+    """Load the timed requests of the HAR capture given on CLI.
+
+    :param `argparse.Namespace` args: `argparse.Namespace` instance.
+
+    :raises OSError, IOError: When the capture fails to open.
+    :raises ValueError: When the capture or one of its requests is malformed.
+
+    :return: List of tuples of the moment of each request, in seconds since the first one, its headers and details.
+    :rtype: list
+    """
+    with open(args.har) as har_file:
+        return parse_har(har_file)
+
+
+def process_replay(parser):
+    """Process the arguments provided to the `replay` command and send the requests.
+
+    :param class `argparse.ArgumentParser`: `argparse.ArgumentParser` instance.
+
+    :raises OSError, IOError: When the corpus or store file fails to open.
+    :raises ValueError: When proxy, the connection overrides, concurrency, the search or a request of the corpus is
+        invalid.
+    :raises sqlite3.Error: When the cache cannot be opened.
+    """
+    # The replay engine is built on asyncio, thus only available on Python 3.
+    from .replay import Replayer
+
+    args = parser.parse_args(sys.argv[2:])
+    if args.preserve_timing and not args.har:
+        parser.error("--preserve-timing requires --har, the other inputs having no timing")
+    load_search_file(parser, args)
+    options = dict(
+        search=args.search_string,
+        first_match=args.first_match,
+        concurrency=args.concurrency,
+        limit_per_host=args.limit_per_host,
+        timeout=args.timeout or None,
+        proxy=args.proxy,
+        unix_socket=args.unix_socket,
+        connect_to=args.connect_to,
+        coalesce=args.coalesce,
+        coalesce_ignored_headers=[header for header in args.coalesce_ignore.split(',') if header.strip()])
+    hits = collections.Counter()
+
+    def report(result):
+        hits.update(result.get('hits', {}))
+        report_result(result)
+
+    cache = ResponseCache(args.cache, args.cache_size * 1024 * 1024) if args.cache else None
+    try:
+        if not args.preserve_timing:
+            replayer = Replayer(cache=cache, **options)
+            replayer.replay(get_sent_requests(parser, args), report)
+        else:
+            from .trace import TraceReplayer
+
+            timed_replayer = TraceReplayer(speed=args.speed, cache=cache, **options)
+            timed_replayer.replay(get_har_requests(args), report)
+            report_lags(timed_replayer.lags)
+            replayer = timed_replayer.replayer
+    finally:
+        if cache is not None:
+            cache.close()
+    if cache is not None:
+        sys.stderr.write("Cache hits: {hits} of {lookups} requests ({ratio:.1%}), saved {saved_bytes} bytes\n".format(
+            ratio=cache.stats()['hit_ratio'], **cache.stats()))
+    if args.coalesce:
+        sys.stderr.write("Coalesced %d requests with identical requests in flight\n" % replayer.coalesced)
+    if args.search_file:
+        sys.stderr.write("Hits of the patterns: %s\n" % ', '.join(
+            '%s: %d' % (pattern, hits[pattern]) for pattern in args.search_string.patterns))
+
+
+def report_lags(lags):
+    """Print the summary of the schedule lags of a timed replay on stderr.
+
+    :param lags: :class:`hrt.histogram.LatencyHistogram` of the lags, in microseconds.
+    """
+    if lags.total:
+        sys.stderr.write(
+            "Schedule lag of {total} requests (ms): p50 {p50}, p99 {p99}, p99.9 {p999}, max {max}\n".format(
+                total=lags.total, p50=lags.percentile(50) / 1000.0, p99=lags.percentile(99) / 1000.0,
+                p999=lags.percentile(99.9) / 1000.0, max=lags.max / 1000.0))
+
+
+def format_load_summary(summary):
+    """Format the summary of a load test for humans.
+
+    :param dict summary: Summary of the load test, see :meth:`hrt.load.LoadReport.summary`.
+
+    :return: Lines of the summary.
+    :rtype: str
+    """
+    lines = [
+        "{requests} requests in {duration}s, {throughput} requests/s for a target of {rate}/s, "
+        "{errors} errors".format(**summary),
+        "Statuses: " + (', '.join('%s: %d' % item for item in summary['statuses'].items()) or 'none')]
+    for name, title in (('latency', 'Latency'), ('service', 'Service time')):
+        percentiles = summary[name]
+        lines.append(title + " (ms): " + ', '.join(
+            '%s %s' % (key, percentiles[key]) for key in ('p50', 'p90', 'p99', 'p99.9', 'max', 'mean')))
+    return '\n'.join(lines)
+
+
+def process_load(parser):
+    """Process the arguments provided to the `load` command, send the requests at the target rate and print the
+    report.
+
+    :param class `argparse.ArgumentParser`: `argparse.ArgumentParser` instance.
+
+    :raises OSError, IOError: When the corpus or store file fails to open.
+    :raises ValueError: When proxy, the connection overrides, the rate or a request of the corpus is invalid.
+    """
+    # The load generator is built on asyncio, thus only available on Python 3.
+    from .load import LoadGenerator
+
+    args = parser.parse_args(sys.argv[2:])
+    generator = LoadGenerator(
+        rate=args.rate,
+        duration=args.duration,
+        arrivals=args.arrivals,
+        processes=args.processes,
+        connections=args.connections,
+        timeout=args.timeout or None,
+        proxy=args.proxy,
+        unix_socket=args.unix_socket,
+        connect_to=args.connect_to,
+        seed=args.seed)
+    summary = generator.run(get_sent_requests(parser, args)).summary()
+    print(json.dumps(summary) if args.json else format_load_summary(summary))
+
+
+def process_args(parser, args):
     """Process the arguments provided to the translator CLI and return a HTTPRequestTranslator object.
 
     .. note::
@@ -108,6 +867,7 @@ def process_args(parser):
         Default language is set to 'bash'.
 
     :param class `argparse.ArgumentParser`: `argparse.ArgumentParser` instance.
+    :param `argparse.Namespace` args: Arguments already parsed by the parser.
 
     :raises ValueError: When proxy is invalid.
     :raises NoRequestProvided: When no request is provided.
@@ -115,12 +875,8 @@ def process_args(parser):
     :return: HTTPRequestTranslator instance
     :rtype: `HTTPRequestTranslator`
     """
-    args = parser.parse_args()
-    argdict = vars(args)
-
-    languages = ['bash']  # Default script language is set to bash.
-    if argdict.get('language'):
-        languages = map(lambda x: x.strip(), argdict['language'][0].split(','))
+    load_search_file(parser, args)
+    languages = get_languages(args)
 
     input_type, options = get_input_type(args)
     if not input_type:
@@ -134,6 +890,14 @@ def process_args(parser):
         languages=languages,
         proxy=args.proxy,
         search_string=args.search_string,
-        data=args.data)
+        data=args.data,
+        payloads=os.path.abspath(args.payloads) if args.payloads else None,
+        profile=args.profile,
+        first_match=args.first_match,
+        output_body=args.output_body,
+        output_hash=args.output_hash,
+        timings=args.timings,
+        unix_socket=args.unix_socket,
+        connect_to=args.connect_to)
 
     return hrt_obj
@@ -0,0 +1,144 @@
+"""
+
+:synopsis: Cluster the requests of a corpus into parameterized endpoints.
+
+"""
+
+import re
+from collections import OrderedDict
+
+from .plugin_manager import get_script_class
+from .url import get_proxy_details, get_connection_details
+
+
+# Wraps the index of a value of the rows in the templates of an endpoint, e.g. u'\xa70\xa7'.
+MARKER = u'\xa7'
+
+re_parameters = re.compile(r'^[^=&]+=[^&]*(?:&[^=&]+=[^&]*)*$')
+re_marker = re.compile(u'%s([0-9]+)%s' % (MARKER, MARKER))
+
+
+def split_parameters(string, offset=0):
+    """Split a query string or a body into a template of its parameters and their values.
+
+    Strings not made of `name=value` pairs are kept as a single value.
+
+    :param str string: Query string or body to split.
+    :param int offset: Index of the first marker of the template.
+
+    :return: A tuple of the parameter names (``None`` for an opaque string), the template and the values.
+    :rtype: tuple
+    """
+    if not string:
+        return (), '', ()
+    if not re_parameters.match(string):
+        return None, u'%s%d%s' % (MARKER, offset, MARKER), (string,)
+    names, template, values = [], [], []
+    for index, parameter in enumerate(string.split('&')):
+        name, value = parameter.split('=', 1)
+        names.append(name)
+        template.append(u'%s=%s%d%s' % (name, MARKER, offset + index, MARKER))
+        values.append(value)
+    return tuple(names), '&'.join(template), tuple(values)
+
+
+class Endpoint(object):
+
+    """Requests sharing their method, URL path, headers and parameter names, but not the parameter values."""
+
+    def __init__(self, headers, details):
+        """Initialize the endpoint.
+
+        :param list headers: Header templates of the requests.
+        :param dict details: Request details of the requests, whose path and data are templates holding markers.
+        """
+        self.headers = headers
+        self.details = details
+        self.rows = []
+
+    def __len__(self):
+        return len(self.rows)
+
+    def iter_requests(self):
+        """Fill the templates of the endpoint with every row of values.
+
+        :return: Generator of tuples of the headers and details of the requests, in the order of the rows.
+        :rtype: generator
+        """
+        for row in self.rows:
+            details = dict(self.details)
+            for field in ('path', 'data'):
+                details[field] = re_marker.sub(lambda match: row[int(match.group(1))], details.get(field, ''))
+            yield self.headers, details
+
+    def generate_script(self, language, search=None, proxy=None, profile='debug', first_match=False, output_body=None,
+                        output_hash=None, timings=False, unix_socket=None, connect_to=None):
+        """Generate a script sending every request of the endpoint over a single connection.
+
+        The languages without loop scripts send the requests of the endpoint as a batch instead, one at a time.
+
+        :param str language: Name of the language for which the script is generated.
+        :param str search: String to search for in the responses.
+        :param str proxy: Proxy the requests are sent through, if any.
+        :param str profile: Generation profile, 'debug' or 'fast'.
+        :param bool first_match: Whether the script stops receiving each response at the first match of the search.
+        :param str output_body: Directory the script writes the response bodies into, if any.
+        :param str output_hash: Hash computed on the response bodies written to files, if any.
+        :param bool timings: Whether the script reports the timings of the phases of every request.
+        :param str unix_socket: Path of the Unix socket the requests are sent through, if any.
+        :param str connect_to: Address the requests connect to instead of the host of their URL, if any.
+
+        :raises ValueError: When the language, the proxy, the connection overrides or the profile is invalid.
+
+        :return: Generated script code.
+        :rtype: str
+        """
+        details = dict(self.details)
+        if proxy:
+            details.update(get_proxy_details(proxy))
+        details.update(get_connection_details(unix_socket, connect_to))
+        class_script = get_script_class(language)
+        script = class_script(
+            headers=self.headers, details=details, search=search, profile=profile, first_match=first_match,
+            output_body=output_body, output_hash=output_hash, timings=timings)
+        if not script.code_loop_begin:
+            return script.generate_batch_script(
+                self.iter_requests(), proxy=proxy, concurrency=1, unix_socket=unix_socket, connect_to=connect_to)
+        return script.generate_loop_script(self.rows)
+
+
+def cluster_requests(parsed_requests):
+    """Group the requests differing only by the values of their query or body parameters into endpoints.
+
+    Only the values of the requests are kept in the rows of each endpoint, in the order of their markers.
+
+    :param iterable parsed_requests: Tuples of headers and details.
+
+    :return: Endpoints, in the order of their first request.
+    :rtype: list
+    """
+    endpoints = OrderedDict()
+    for headers, details in parsed_requests:
+        path, _, query = details.get('path', '').partition('?')
+        query, hash_sign, fragment = query.partition('#')
+        query_names, query_template, query_values = split_parameters(query)
+        data_names, data_template, data_values = split_parameters(details.get('data', ''), len(query_values))
+        # Content-Length changes with the values of the body, curl computes it anyway.
+        kept_headers = tuple(
+            header for header in headers if header.split(':', 1)[0].strip().lower() != 'content-length')
+        key = (
+            details.get('method', '').strip().upper(),
+            details.get('pre_scheme', ''),
+            details.get('Host', '').lower(),
+            path,
+            query_names,
+            fragment,
+            data_names,
+            kept_headers)
+        if key not in endpoints:
+            template_details = dict(details)
+            template_details['path'] = path + ('?' + query_template if query else '') + hash_sign + fragment
+            template_details['data'] = data_template
+            endpoints[key] = Endpoint(list(kept_headers), template_details)
+        endpoints[key].rows.append(query_values + data_values)
+    return list(endpoints.values())
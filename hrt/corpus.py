@@ -0,0 +1,101 @@
+"""
+
+:synopsis: Read and translate corpora made of many raw HTTP requests.
+
+"""
+
+import os
+
+from .interface import HttpRequestTranslator
+from .plugin_manager import get_script_class
+
+
+# A line only made of this separator delimits two requests of a corpus file.
+CORPUS_SEPARATOR = '%%%%'
+
+
+def iter_raw_requests(lines, separator=CORPUS_SEPARATOR):
+    """Split a corpus into raw HTTP requests.
+
+    The corpus is consumed lazily so that files larger than the available memory can be processed.
+
+    :param iterable lines: Lines of the corpus (e.g. an opened file).
+    :param str separator: Line delimiting two requests.
+
+    :return: Generator of raw requests.
+    :rtype: generator
+    """
+    request = []
+    for line in lines:
+        if line.rstrip('\r\n') == separator:
+            raw_request = ''.join(request).strip('\r\n')
+            if raw_request:
+                yield raw_request
+            request = []
+        else:
+            request.append(line)
+    raw_request = ''.join(request).strip('\r\n')
+    if raw_request:
+        yield raw_request
+
+
+def parse_corpus(raw_requests, interner=None):
+    """Parse every raw request of a corpus.
+
+    :param iterable raw_requests: Raw HTTP requests (e.g. from :func:`iter_raw_requests`).
+    :param interner: :class:`hrt.interner.StringInterner` shared by all the requests, if any.
+
+    :raises ValueError: When a request is malformed.
+
+    :return: Generator of tuples of headers and details, one per request.
+    :rtype: generator
+    """
+    for raw_request in raw_requests:
+        hrt_obj = HttpRequestTranslator(request=raw_request, interner=interner)
+        yield hrt_obj.headers, hrt_obj.details
+
+
+def translate_corpus(parsed_requests, languages=['bash'], **kwargs):
+    """Generate the code of every parsed request of a corpus.
+
+    :param iterable parsed_requests: Tuples of headers and details (e.g. from :func:`parse_corpus` or a
+        :class:`hrt.store.CorpusStore`).
+    :param list languages: Languages in which the code of each request is generated.
+    :param kwargs: Extra options (proxy, search_string, data) forwarded to
+        :class:`hrt.interface.HttpRequestTranslator`.
+
+    :raises ValueError: When the proxy is invalid.
+
+    :return: Generator of dictionaries of language name and respective code, one per request.
+    :rtype: generator
+    """
+    for parsed in parsed_requests:
+        yield HttpRequestTranslator(parsed=parsed, languages=languages, **kwargs).generate_code()
+
+
+def save_code(all_code, directory, name):
+    """Write the code generated for a request into `directory`, one script per language.
+
+    :param dict all_code: A dictionary of language name and respective code.
+    :param str directory: Directory in which the scripts are written.
+    :param str name: Name of the scripts, completed by the extension of their language, and by their language when
+        several of them share an extension.
+
+    :raises OSError, IOError: When a script cannot be written.
+
+    :return: A dictionary of language name and respective script location.
+    :rtype: dict
+    """
+    locations = {}
+    extensions = dict((language, get_script_class(language).__extension__ or language) for language in all_code)
+    for language, code in all_code.items():
+        extension = extensions[language]
+        if list(extensions.values()).count(extension) > 1:
+            # Languages sharing an extension, like python and locust, are told apart by their name.
+            location = os.path.join(directory, '%s-%s.%s' % (name, language, extension))
+        else:
+            location = os.path.join(directory, '%s.%s' % (name, extension))
+        with open(location, 'w') as fp:
+            fp.write(code)
+        locations[language] = location
+    return locations
@@ -0,0 +1,179 @@
+"""
+
+:synopsis: Skip the duplicated requests of a corpus before translating them.
+
+"""
+
+import hashlib
+import math
+import struct
+
+
+# Headers only meaningful for a single connection, never part of the identity of a request.
+HOP_BY_HOP_HEADERS = frozenset([
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization', 'proxy-connection', 'te', 'trailer',
+    'transfer-encoding', 'upgrade'])
+# Headers changing between two captures of the same request, ignored by default.
+VOLATILE_HEADERS = frozenset(['date', 'cookie', 'if-modified-since', 'if-none-match'])
+
+
+def canonicalize(headers, details, ignored_headers=VOLATILE_HEADERS):
+    """Build a canonical representation of a request, equal for requests differing only by their header order or
+    by their hop-by-hop and ignored headers.
+
+    :param list headers: Headers list containing lines like 'Host: google.com'.
+    :param dict details: Request specific details dictionary like body and method of the request.
+    :param iterable ignored_headers: Lower case names of the headers left out, on top of the hop-by-hop ones.
+
+    :return: Canonical request.
+    :rtype: bytes
+    """
+    ignored_headers = HOP_BY_HOP_HEADERS.union(ignored_headers)
+    kept_headers = []
+    for header in headers:
+        name, _, value = header.partition(':')
+        name = name.strip().lower()
+        # The host is already part of the canonical request, lower cased.
+        if name != 'host' and name not in ignored_headers:
+            kept_headers.append('%s:%s' % (name, value.strip()))
+    kept_headers.sort()
+    canonical = [
+        details.get('method', '').strip().upper(),
+        details.get('pre_scheme', '') + details.get('Host', '').strip().lower(),
+        details.get('path', '')]
+    canonical.extend(kept_headers)
+    canonical.append('')
+    canonical.append(details.get('data', ''))
+    return '\n'.join(canonical).encode('utf-8')
+
+
+class BloomFilter(object):
+
+    """Bounded-memory set of items, answering membership with a controlled rate of false positives."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        """Size the filter.
+
+        :param int capacity: Number of items the filter is sized for. More items can be added at the cost of a higher
+            false positive rate.
+        :param float error_rate: Target false positive rate once `capacity` items were added.
+
+        :raises ValueError: When `capacity` or `error_rate` are out of range.
+        """
+        if capacity <= 0:
+            raise ValueError("Bloom filter capacity must be positive.")
+        if not 0 < error_rate < 1:
+            raise ValueError("Bloom filter error rate must be between 0 and 1.")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, int(round(self.size / float(capacity) * math.log(2))))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        # Double hashing: the i-th position is h1 + i * h2, see Kirsch and Mitzenmacher.
+        first, second = struct.unpack('<QQ', hashlib.sha256(item).digest()[:16])
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def __contains__(self, item):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def add(self, item):
+        """Add an item to the filter.
+
+        :param bytes item: Item to add.
+
+        :return: ``True`` if the item was (probably) already added, ``False`` otherwise.
+        :rtype: bool
+        """
+        present = True
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                present = False
+                self._bits[position >> 3] |= mask
+        return present
+
+
+class ExactFilter(object):
+
+    """Set of items remembering a digest of each of them, without any false positive."""
+
+    def __init__(self):
+        self._digests = set()
+
+    def __contains__(self, item):
+        return hashlib.sha256(item).digest() in self._digests
+
+    def __len__(self):
+        return len(self._digests)
+
+    def add(self, item):
+        """Add an item to the filter.
+
+        :param bytes item: Item to add.
+
+        :return: ``True`` if the item was already added, ``False`` otherwise.
+        :rtype: bool
+        """
+        digest = hashlib.sha256(item).digest()
+        if digest in self._digests:
+            return True
+        self._digests.add(digest)
+        return False
+
+
+class Deduplicator(object):
+
+    """Drop the requests already seen in a stream of parsed requests."""
+
+    MODES = ('bloom', 'exact')
+
+    def __init__(self, mode='bloom', capacity=1000000, error_rate=0.001, ignored_headers=VOLATILE_HEADERS):
+        """Initialize the deduplication.
+
+        :param str mode: 'bloom' to use a bounded-memory :class:`BloomFilter`, suited to streams larger than the
+            memory, or 'exact' to use an :class:`ExactFilter`, suited to small inputs.
+        :param int capacity: Number of unique requests the Bloom filter is sized for.
+        :param float error_rate: Target rate of unique requests wrongly dropped by the Bloom filter.
+        :param iterable ignored_headers: Lower case names of the headers not making requests different, on top of the
+            hop-by-hop ones.
+
+        :raises ValueError: When `mode` is unknown or the Bloom filter parameters are out of range.
+        """
+        if mode == 'bloom':
+            self._filter = BloomFilter(capacity, error_rate)
+        elif mode == 'exact':
+            self._filter = ExactFilter()
+        else:
+            raise ValueError("'%s' deduplication is not supported. Available modes: %s" % (mode, ', '.join(self.MODES)))
+        self.mode = mode
+        self.ignored_headers = frozenset(header.strip().lower() for header in ignored_headers)
+        self.duplicates = 0
+
+    def seen(self, headers, details):
+        """Remember a request.
+
+        :param list headers: Headers list containing lines like 'Host: google.com'.
+        :param dict details: Request specific details dictionary like body and method of the request.
+
+        :return: ``True`` if an equivalent request was already seen, ``False`` otherwise.
+        :rtype: bool
+        """
+        if self._filter.add(canonicalize(headers, details, self.ignored_headers)):
+            self.duplicates += 1
+            return True
+        return False
+
+    def filter(self, parsed_requests):
+        """Lazily drop the duplicated requests.
+
+        :param iterable parsed_requests: Tuples of headers and details.
+
+        :return: Generator of the tuples of headers and details of the requests seen for the first time.
+        :rtype: generator
+        """
+        for headers, details in parsed_requests:
+            if not self.seen(headers, details):
+                yield headers, details
@@ -0,0 +1,96 @@
+"""
+
+:synopsis: Read the requests of HAR (HTTP Archive) captures, along with the moments they were sent.
+
+"""
+
+import calendar
+import json
+import re
+
+try:
+    from urlparse import urlparse
+except ImportError:
+    from urllib.parse import urlparse
+
+from .interface import HttpRequestTranslator
+
+
+# ISO 8601 date of the HAR entries, like 2024-01-31T12:00:00.123+01:00
+re_har_date = re.compile(
+    r'^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(\.\d+)?(?:(Z)|([+-])(\d{2}):?(\d{2}))?$')
+
+
+def parse_har_date(date):
+    """Convert the date of a HAR entry into a timestamp.
+
+    :param str date: ISO 8601 date, in UTC when it has no time zone.
+
+    :raises ValueError: When the date is malformed.
+
+    :return: Seconds since the epoch.
+    :rtype: float
+    """
+    match = re_har_date.match(date.strip())
+    if not match:
+        raise ValueError("Malformed HAR date '%s'." % date)
+    year, month, day, hour, minute, second, fraction, _, sign, offset_hours, offset_minutes = match.groups()
+    timestamp = calendar.timegm((int(year), int(month), int(day), int(hour), int(minute), int(second)))
+    timestamp += float(fraction or 0)
+    if sign:
+        offset = int(offset_hours) * 3600 + int(offset_minutes) * 60
+        timestamp -= offset if sign == '+' else -offset
+    return timestamp
+
+
+def har_entry_to_raw(request):
+    """Format the request of a HAR entry as a raw HTTP request.
+
+    The pseudo-headers of HTTP/2 are dropped, the Host header being added from the URL when missing.
+
+    :param dict request: `request` object of a HAR entry.
+
+    :return: A tuple of the raw request, without its body, and its body.
+    :rtype: tuple
+    """
+    url = request['url']
+    version = request.get('httpVersion', '')
+    # The requests are replayed over HTTP/1.1 whatever they were captured over
+    if not version.upper().startswith('HTTP/1'):
+        version = 'HTTP/1.1'
+    headers = [
+        '%s: %s' % (header['name'], header['value']) for header in request.get('headers', [])
+        if not header['name'].startswith(':')]
+    if not any(header.split(':', 1)[0].strip().lower() == 'host' for header in headers):
+        headers.insert(0, 'Host: %s' % urlparse(url).netloc)
+    raw_request = '\n'.join(['%s %s %s' % (request['method'], url, version)] + headers)
+    return raw_request, request.get('postData', {}).get('text', '')
+
+
+def parse_har(har_file, interner=None):
+    """Parse the requests of a HAR capture, in the order they were sent.
+
+    :param har_file: Opened HAR file.
+    :param interner: :class:`hrt.interner.StringInterner` shared by all the requests, if any.
+
+    :raises ValueError: When the capture or one of its requests is malformed.
+
+    :return: List of tuples of the moment each request was sent, in seconds since the first one, its headers and its
+        details.
+    :rtype: list
+    """
+    try:
+        entries = json.load(har_file)['log']['entries']
+    except (KeyError, TypeError):
+        raise ValueError("Malformed HAR capture, without any 'log.entries'.")
+    timed_requests = []
+    for entry in entries:
+        raw_request, data = har_entry_to_raw(entry['request'])
+        hrt_obj = HttpRequestTranslator(request=raw_request, data=data, interner=interner)
+        timed_requests.append((parse_har_date(entry['startedDateTime']), hrt_obj.headers, hrt_obj.details))
+    # Sorted on the moments alone, the requests sent at the same moment keeping their order
+    timed_requests.sort(key=lambda timed_request: timed_request[0])
+    if timed_requests:
+        first = timed_requests[0][0]
+        timed_requests = [(moment - first, headers, details) for moment, headers, details in timed_requests]
+    return timed_requests
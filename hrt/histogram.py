@@ -0,0 +1,111 @@
+"""
+
+:synopsis: Log-bucketed histogram of latencies, in the fashion of HdrHistogram.
+
+The values are integers (e.g. microseconds). Values below ``2 * 10 ** significant_digits`` have their own bucket,
+larger ones share buckets whose width doubles at every power of two, so that every value is recorded with
+`significant_digits` decimal digits of precision whatever its magnitude, in a constant time and a memory only
+growing with the logarithm of the largest value.
+
+"""
+
+import math
+
+
+class LatencyHistogram(object):
+
+    """Count values into log-linear buckets, and compute their percentiles.
+
+    Histograms of the same precision recorded separately (e.g. by several processes) are merged by adding their
+    counts, without any loss.
+    """
+
+    def __init__(self, significant_digits=3):
+        """
+        :param int significant_digits: Decimal digits of precision of the recorded values, from 1 to 5.
+
+        :raises ValueError: When the precision is out of range.
+        """
+        if not 1 <= significant_digits <= 5:
+            raise ValueError("Significant digits must be between 1 and 5, not %s." % significant_digits)
+        self.significant_digits = significant_digits
+        # The buckets of the smallest values hold a single value each, then every half of a sub-bucket count doubles
+        # the width of its buckets.
+        self._sub_bucket_bits = int(math.ceil(math.log(2 * 10 ** significant_digits, 2)))
+        self._half_count = 1 << (self._sub_bucket_bits - 1)
+        self.counts = []
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.sum = 0
+
+    def _index(self, value):
+        shift = max(value.bit_length() - self._sub_bucket_bits, 0)
+        return shift * self._half_count + (value >> shift)
+
+    def _highest_equivalent(self, index):
+        """Return the largest value recorded into a bucket."""
+        if index < 2 * self._half_count:
+            return index
+        shift = index // self._half_count - 1
+        return ((index - shift * self._half_count) << shift) + (1 << shift) - 1
+
+    def record(self, value, count=1):
+        """Record a value.
+
+        :param int value: Value to record, negative values being recorded as 0.
+        :param int count: Number of occurrences of the value.
+        """
+        value = max(int(value), 0)
+        index = self._index(value)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += count
+        self.total += count
+        self.sum += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """Add the values of another histogram to this one.
+
+        :param other: :class:`LatencyHistogram` of the same precision.
+
+        :raises ValueError: When the precisions of the histograms differ.
+        """
+        if other.significant_digits != self.significant_digits:
+            raise ValueError("Cannot merge histograms of %d and %d significant digits." % (
+                self.significant_digits, other.significant_digits))
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total += other.total
+        self.sum += other.sum
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percentile):
+        """Return the value below which a percentage of the recorded values fall.
+
+        :param float percentile: Percentage, from 0 to 100.
+
+        :return: The largest value equivalent, at the precision of the histogram, to the percentile, or ``None`` when
+            the histogram is empty.
+        :rtype: int
+        """
+        if not self.total:
+            return None
+        rank = max(int(math.ceil(percentile * self.total / 100.0)), 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+    def mean(self):
+        """Return the mean of the recorded values, or ``None`` when the histogram is empty."""
+        return float(self.sum) / self.total if self.total else None
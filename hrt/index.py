@@ -0,0 +1,168 @@
+"""
+
+:synopsis: SQLite index of translated corpora.
+
+"""
+
+import hashlib
+import json
+import sqlite3
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS requests (
+    id INTEGER PRIMARY KEY,
+    method TEXT NOT NULL,
+    host TEXT NOT NULL,
+    path TEXT NOT NULL,
+    header_fingerprint TEXT NOT NULL,
+    body_hash TEXT NOT NULL,
+    headers TEXT NOT NULL,
+    details TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS requests_method_host_path ON requests (method, host, path, id);
+CREATE INDEX IF NOT EXISTS requests_host_path ON requests (host, path, method, id);
+CREATE INDEX IF NOT EXISTS requests_header_fingerprint ON requests (header_fingerprint, id);
+CREATE INDEX IF NOT EXISTS requests_body_hash ON requests (body_hash, id);
+CREATE TABLE IF NOT EXISTS artifacts (
+    request_id INTEGER NOT NULL REFERENCES requests (id),
+    language TEXT NOT NULL,
+    location TEXT NOT NULL,
+    PRIMARY KEY (request_id, language)
+);
+"""
+
+
+def header_fingerprint(headers):
+    """Fingerprint the set of header names of a request, regardless of their order, case and values.
+
+    :param list headers: Headers list containing lines like 'Host: google.com'.
+
+    :return: Hexadecimal SHA-1 digest of the sorted header names.
+    :rtype: str
+    """
+    names = sorted(set(header.split(':', 1)[0].strip().lower() for header in headers))
+    return hashlib.sha1('\n'.join(names).encode('utf-8')).hexdigest()
+
+
+def body_hash(details):
+    """Hash the body of a request.
+
+    :param dict details: Request specific details dictionary.
+
+    :return: Hexadecimal SHA-256 digest of the body.
+    :rtype: str
+    """
+    return hashlib.sha256(details.get('data', '').encode('utf-8')).hexdigest()
+
+
+class CorpusIndex(object):
+
+    """Searchable index of the requests of a corpus and of the scripts generated for them."""
+
+    def __init__(self, path):
+        """Open the index, creating it if needed.
+
+        :param str path: Path of the SQLite database.
+
+        :raises sqlite3.Error: When the database cannot be opened.
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._connection.execute('SELECT COUNT(*) FROM requests').fetchone()[0]
+
+    def add(self, headers, details):
+        """Index a parsed request.
+
+        :param list headers: Headers list containing lines like 'Host: google.com'.
+        :param dict details: Request specific details dictionary like body and method of the request.
+
+        :return: Id of the request in the index.
+        :rtype: int
+        """
+        cursor = self._connection.execute(
+            'INSERT INTO requests (method, host, path, header_fingerprint, body_hash, headers, details) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (
+                details.get('method', '').upper(),
+                details.get('Host', '').lower(),
+                details.get('path', ''),
+                header_fingerprint(headers),
+                body_hash(details),
+                json.dumps(headers),
+                json.dumps(details)))
+        return cursor.lastrowid
+
+    def add_artifact(self, request_id, language, location):
+        """Record where the script generated for an indexed request was written.
+
+        :param int request_id: Id of the request in the index.
+        :param str language: Language of the script.
+        :param str location: Path of the script.
+        """
+        self._connection.execute(
+            'INSERT OR REPLACE INTO artifacts (request_id, language, location) VALUES (?, ?, ?)',
+            (request_id, language, location))
+
+    def artifacts(self, request_id):
+        """Find the scripts generated for an indexed request.
+
+        :param int request_id: Id of the request in the index.
+
+        :return: A dictionary of language name and respective script location.
+        :rtype: dict
+        """
+        return dict(self._connection.execute(
+            'SELECT language, location FROM artifacts WHERE request_id = ?', (request_id,)))
+
+    def query(self, method=None, host=None, path_prefix=None, header_fingerprint=None, body_hash=None):
+        """Find the indexed requests matching every given criterion.
+
+        :param str method: HTTP method of the requests (case insensitive).
+        :param str host: Host header of the requests (case insensitive).
+        :param str path_prefix: Beginning of the path of the requests.
+        :param str header_fingerprint: Fingerprint of the header names, see :func:`header_fingerprint`.
+        :param str body_hash: Hash of the body, see :func:`body_hash`.
+
+        :return: Generator of tuples of request id, headers and details, ordered by id.
+        :rtype: generator
+        """
+        clauses, parameters = [], []
+        for column, value in (
+                ('method', method.upper() if method else method),
+                ('host', host.lower() if host else host),
+                ('header_fingerprint', header_fingerprint),
+                ('body_hash', body_hash)):
+            if value:
+                clauses.append('%s = ?' % column)
+                parameters.append(value)
+        if path_prefix:
+            # A range keeps the lookup on the indexes, unlike LIKE which is case insensitive.
+            clauses.append('path >= ? AND path < ?')
+            parameters.extend([path_prefix, path_prefix[:-1] + chr(ord(path_prefix[-1]) + 1)])
+        # Filter on the covering indexes first, then only load the matching rows.
+        ids = 'SELECT id FROM requests'
+        if clauses:
+            ids += ' WHERE ' + ' AND '.join(clauses)
+        cursor = self._connection.execute(
+            'SELECT id, headers, details FROM requests WHERE id IN (%s) ORDER BY id' % ids, parameters)
+        for request_id, headers, details in cursor:
+            yield request_id, json.loads(headers), json.loads(details)
+
+    def commit(self):
+        """Save the pending changes."""
+        self._connection.commit()
+
+    def close(self):
+        """Save the pending changes and close the index."""
+        self._connection.commit()
+        self._connection.close()
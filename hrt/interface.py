@@ -3,15 +3,17 @@ try:
 except ImportError:
     from urllib.parse import urlparse
 
-from .plugin_manager import generate_script
-from .url import get_url, check_valid_url
+from .plugin_manager import generate_script, generate_payload_script
+from .url import get_proxy_details, get_connection_details
 
 
 class HttpRequestTranslator(object):
 
     """Main Interface for the tool."""
 
-    def __init__(self, languages=['bash'], request=None, proxy=None, search_string='', data=None):
+    def __init__(self, languages=['bash'], request=None, proxy=None, search_string='', data=None, interner=None,
+                 parsed=None, payloads=None, profile='debug', first_match=False, output_body=None,
+                 output_hash=None, timings=False, unix_socket=None, connect_to=None):
         """Initialises all the parameters of the object.
 
         :param list languages: list of languages in which request's code is to be generated.
@@ -19,34 +21,54 @@ class HttpRequestTranslator(object):
         :param str proxy: custom proxy, if required in the code.
         :param str search_string: search phrase(can be regex too) to be searched in the response.
         :param str data: data string to be sent along with the header.
+        :param interner: :class:`hrt.interner.StringInterner` shared by the requests of a batch, if any.
+        :param tuple parsed: headers and details already parsed from a request (e.g. loaded from a
+            :class:`hrt.store.CorpusStore`), used instead of parsing `request` again.
+        :param str payloads: payloads file, one payload per line, sent in place of the placeholders of the request
+            like '\xa7param\xa7' by a single script per language.
+        :param str profile: generation profile of the scripts, 'debug' or 'fast'.
+        :param bool first_match: whether the scripts stop receiving the responses at the first match of the search.
+        :param str output_body: directory the scripts write the response bodies into, if any.
+        :param str output_hash: hash computed on the response bodies written to files, if any.
+        :param bool timings: whether the scripts report the timings of the phases of every request.
+        :param str unix_socket: Unix socket the requests are sent through instead of the host of their URL, if any.
+        :param str connect_to: address the requests connect to instead of the host of their URL, like
+            '127.0.0.1:8080', if any.
         """
         self.languages = languages
         self.request = request
         self.data = data
         self.proxy = proxy
         self.search_string = search_string
+        self.interner = interner
+        self.parsed = parsed
+        self.payloads = payloads
+        self.profile = profile
+        self.first_match = first_match
+        self.output_body = output_body
+        self.output_hash = output_hash
+        self.timings = timings
+        self.unix_socket = unix_socket
+        self.connect_to = connect_to
 
         # extract headers, other details(data, method, host, etc.)
         self._extract_request_details()
 
     def _extract_request_details(self):
-        self.headers, self.details = self._parse_request()
+        if self.parsed is not None:
+            headers, details = self.parsed
+            self.headers, self.details = list(headers), dict(details)
+        else:
+            self.headers, self.details = self._parse_request()
 
         if self.data:
             self.details['data'] = self.data
 
         if self.proxy:
-            # If proxy already doesn't starts with http and is like 127.0.0.1:8010
-            if not self.proxy.startswith(('http', 'https')):
-                proxy = get_url(self.proxy)  # Fix proxy to add appropriate scheme
-            else:
-                proxy = self.proxy.strip()
-            if not check_valid_url(proxy):
-                raise ValueError("Proxy provided is invalid.")
-            try:
-                self.details['proxy_host'], self.details['proxy_port'] = proxy.rsplit(":", 1)
-            except IndexError:
-                raise ValueError("Proxy provided is invalid.")
+            self.details.update(get_proxy_details(self.proxy))
+
+        # The connection overrides are details of the request like the proxy, the URL and Host header being kept
+        self.details.update(get_connection_details(self.unix_socket, self.connect_to))
 
     def generate_code(self):
         """Generates code for all the languages defined in the object.
@@ -54,12 +76,31 @@ class HttpRequestTranslator(object):
         :return: A dictionary of language name and respective code.
         :rtype: dict
         """
-        self._parse_request()
         all_code = {}
         for language in self.languages:
-            all_code[language] = generate_script(language, self.headers, self.details, self.search_string)
+            if self.payloads:
+                all_code[language] = generate_payload_script(
+                    language, self.headers, self.details, self.payloads, self.search_string, self.profile,
+                    self.first_match, self.output_body, self.output_hash, self.timings)
+            else:
+                all_code[language] = generate_script(
+                    language, self.headers, self.details, self.search_string, self.profile, self.first_match,
+                    self.output_body, self.output_hash, self.timings)
         return all_code
 
+    def _intern(self, value, field):
+        """Deduplicate `value` through the interner of the batch, if any.
+
+        :param str value: Parsed string to deduplicate.
+        :param str field: Request field `value` belongs to (e.g. 'headers', 'hosts').
+
+        :return: Shared copy of `value`, or `value` itself when there is no interner.
+        :rtype: str
+        """
+        if self.interner is None:
+            return value
+        return self.interner.intern(value, field)
+
     def _parse_request(self):
         """Parses Raw HTTP request into separate dictionaries for headers and body and other parameters.
 
@@ -80,7 +121,7 @@ class HttpRequestTranslator(object):
             line = headers_lines.pop(0)
             if not line.strip('\r\n'):  # Empty line? Therefore the headers are over and the content is starting.
                 break
-            header_list.append(line)
+            header_list.append(line if self.interner is None else self.interner.intern_header(line))
             try:
                 header, value = line.split(":", 1)
                 # stripping one left blank space from value induced after split.
@@ -89,7 +130,7 @@ class HttpRequestTranslator(object):
             except IndexError:
                 raise ValueError("Headers Malformed. Please Enter a Valid HTTP request.")
             if header.lower() == "host":
-                host = value.strip()  # Keep hostname for further checks
+                host = self._intern(value.strip(), 'hosts')  # Keep hostname for further checks
         # Data
         data = ''
         if headers_lines:
@@ -97,7 +138,7 @@ class HttpRequestTranslator(object):
         # Details
         details_dict = {}
         details_dict['data'] = data
-        details_dict['method'] = new_request_method.split(' ', 1)[0].strip()
+        details_dict['method'] = self._intern(new_request_method.split(' ', 1)[0].strip(), 'methods')
         details_dict['Host'] = host
         # Not using whatever stored in parsed_request for the reason to keep the request as original as possible
         try:  # try to split the path from request if one is passed.
@@ -123,7 +164,7 @@ class HttpRequestTranslator(object):
             path = path + "?" + query
         if frag:
             path = path + "#" + frag
-        details_dict['path'] = path
+        details_dict['path'] = self._intern(path, 'paths')
         # If scheme is specified in GET Path and Header 'Host' Field doesn't already starts with it
         if scheme and not host.startswith(scheme):
             details_dict['pre_scheme'] = scheme + "://"  # Store the scheme defined in GET path for later checks
@@ -0,0 +1,101 @@
+"""
+
+:synopsis: Deduplicate the strings shared by the requests of a corpus.
+
+"""
+
+import sys
+
+
+# Default bound of the strings kept by :class:`StringInterner`.
+MAX_SIZE = 65536
+
+
+class StringInterner(object):
+
+    """Pool of strings shared by every request parsed in a batch.
+
+    Header lines, hosts, paths and methods repeat a lot across a real capture. Parsing each request through the same
+    interner makes equal strings reference a single object, keeping only one copy of each of them in memory as long as
+    the requests are kept, e.g. by a batch. At most `max_size` strings are pooled, the later ones are returned
+    untouched.
+    """
+
+    FIELDS = ('headers', 'hosts', 'paths', 'methods')
+
+    def __init__(self, fields=None, max_size=MAX_SIZE):
+        """Initialize the interner.
+
+        :param iterable fields: Request fields to deduplicate, any of :attr:`FIELDS`. Defaults to all of them.
+        :param int max_size: Maximum number of strings kept in the pool.
+
+        :raises ValueError: When an unknown field is given.
+        """
+        self.fields = frozenset(self.FIELDS if fields is None else fields)
+        unknown = self.fields.difference(self.FIELDS)
+        if unknown:
+            raise ValueError("Unknown interning field(s): %s" % ', '.join(sorted(unknown)))
+        self.max_size = max_size
+        self._pool = {}
+        self.hits = 0
+        self.saved_bytes = 0
+
+    def __len__(self):
+        return len(self._pool)
+
+    def __contains__(self, value):
+        return value in self._pool
+
+    def _pooled(self, value):
+        """Return the pooled copy of `value` and whether it was already pooled, adding it while the pool has room."""
+        try:
+            return self._pool[value], True
+        except KeyError:
+            if len(self._pool) < self.max_size:
+                self._pool[value] = value
+            return value, False
+
+    def intern(self, value, field=None):
+        """Return the pooled copy of `value`, adding it to the pool first if needed.
+
+        :param str value: String to deduplicate.
+        :param str field: Request field `value` comes from. Values of fields the interner is not configured for are
+            returned untouched.
+
+        :return: String equal to `value`, shared with every previous call for an equal string while the pool has room.
+        :rtype: str
+        """
+        if field is not None and field not in self.fields:
+            return value
+        pooled, found = self._pooled(value)
+        if found and pooled is not value:
+            self.hits += 1
+            self.saved_bytes += sys.getsizeof(value)
+        return pooled
+
+    def intern_header(self, line):
+        """Return the pooled copy of a header line, through its name and value interned separately.
+
+        A line is only pooled once its value was seen before, thus the lines holding a value unique to a request (e.g.
+        a cookie or a token) do not fill the pool, only their value does.
+
+        :param str line: Header line like 'Host: google.com'.
+
+        :return: String equal to `line`, shared with the previous equal lines once pooled.
+        :rtype: str
+        """
+        if 'headers' not in self.fields:
+            return line
+        name, _, value = line.partition(':')
+        self._pooled(name)
+        if not self._pooled(value)[1] and line not in self._pool:
+            return line
+        return self.intern(line)
+
+    def stats(self):
+        """Summarize how much the interner deduplicated so far.
+
+        :return: Number of strings pooled, number of duplicates dropped and the bytes they used.
+        :rtype: dict
+        """
+        return {'unique': len(self._pool), 'hits': self.hits, 'saved_bytes': self.saved_bytes}
@@ -0,0 +1,225 @@
+"""
+
+:synopsis: Open-loop load generation, sending parsed requests at a target rate.
+
+The arrivals of the requests are scheduled ahead, at a constant rate or following a Poisson process, and every request
+is sent at its arrival whatever the number of responses still awaited. The latency of a request is measured from its
+scheduled arrival rather than from the moment it was actually sent, so that a stalled target delaying the sending of
+the next requests inflates their latencies instead of being hidden (the coordinated omission).
+
+.. note::
+
+    This module requires Python 3.7 or newer, and is only imported by the ``hrt load`` command.
+
+"""
+
+import asyncio
+import itertools
+import multiprocessing
+import random
+import time
+
+from .histogram import LatencyHistogram
+from .replay import Replayer
+
+
+class LoadGenerator(object):
+
+    """Send requests at a target rate for a duration, over one or several processes.
+
+    Each process runs its own event loop and connection pool, sending its share of the rate, and their histograms are
+    merged into the report.
+    """
+
+    ARRIVALS = ('constant', 'poisson')
+    # Percentiles of the latencies in the summary of the reports.
+    PERCENTILES = (50, 90, 99, 99.9)
+
+    def __init__(self, rate, duration=10, arrivals='constant', processes=1, connections=100, timeout=30, proxy=None,
+                 unix_socket=None, connect_to=None, seed=None):
+        """
+        :param float rate: Requests sent per second, by all the processes.
+        :param float duration: Seconds during which the requests are sent.
+        :param str arrivals: Distribution of the arrivals, one of :attr:`ARRIVALS`.
+        :param int processes: Number of worker processes sending the requests.
+        :param int connections: Maximum number of connections open to a host, per process.
+        :param float timeout: Seconds given to each request to complete, ``None`` to wait forever.
+        :param str proxy: HTTP proxy the requests are sent through, if any.
+        :param str unix_socket: Unix socket the requests are sent through, if any.
+        :param str connect_to: Address the requests connect to instead of the host of their URL, if any.
+        :param int seed: Seed of the Poisson arrivals, for reproducible schedules.
+
+        :raises ValueError: When the rate, the duration, the arrivals, the number of processes, the proxy or the
+            connection overrides are invalid.
+        """
+        if rate <= 0:
+            raise ValueError("Rate must be positive, not %s." % rate)
+        if duration <= 0:
+            raise ValueError("Duration must be positive, not %s." % duration)
+        if arrivals not in self.ARRIVALS:
+            raise ValueError("'%s' arrivals are not supported! Supported ones are: %s" % (
+                arrivals, ', '.join(self.ARRIVALS)))
+        if processes < 1:
+            raise ValueError("Number of processes must be positive, not %s." % processes)
+        self.rate = rate
+        self.duration = duration
+        self.arrivals = arrivals
+        self.processes = processes
+        self.seed = seed
+        self.options = {
+            'concurrency': connections, 'timeout': timeout, 'proxy': proxy, 'unix_socket': unix_socket,
+            'connect_to': connect_to}
+        # Validates the options before starting any process
+        Replayer(**self.options)
+
+    def run(self, requests):
+        """Send the requests, cycling through them, until the end of the duration and the last response.
+
+        :param list requests: Tuples of headers and details of the requests.
+
+        :raises ValueError: When there is no request to send.
+
+        :return: The merged :class:`LoadReport` of every process.
+        :rtype: :class:`LoadReport`
+        """
+        requests = list(requests)
+        if not requests:
+            raise ValueError("No request to send.")
+        shares = [(requests, index) for index in range(self.processes)]
+        if self.processes == 1:
+            reports = [self._run_share(shares[0])]
+        else:
+            pool = multiprocessing.Pool(self.processes)
+            try:
+                reports = pool.map(self._run_share, shares)
+            finally:
+                pool.close()
+                pool.join()
+        report = reports[0]
+        for other in reports[1:]:
+            report.merge(other)
+        return report
+
+    def _run_share(self, share):
+        requests, index = share
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self._send_share(requests, index))
+        finally:
+            loop.close()
+
+    def _arrivals(self, index):
+        """Yield the arrivals of the share of a process, in seconds since its start."""
+        if self.arrivals == 'poisson':
+            rate = float(self.rate) / self.processes
+            # The superposition of the Poisson processes of every process is a Poisson process of the whole rate
+            generator = random.Random(None if self.seed is None else self.seed + index)
+            arrival = 0.0
+            while True:
+                arrival += generator.expovariate(rate)
+                yield arrival
+        # The processes interleave their constant arrivals, computed from their number not to accumulate errors
+        for number in itertools.count():
+            yield (index + number * self.processes) / float(self.rate)
+
+    async def _send_share(self, requests, index):
+        replayer = Replayer(**self.options)
+        report = LoadReport(self.rate, self.duration)
+        pending = set()
+        start = time.monotonic()
+        cycle = itertools.cycle(requests)
+        try:
+            for number, offset in enumerate(self._arrivals(index), 1):
+                if offset >= self.duration:
+                    break
+                arrival = start + offset
+                delay = arrival - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                headers, details = next(cycle)
+                task = asyncio.ensure_future(self._send(replayer, report, number, headers, details, arrival))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.wait(pending)
+        finally:
+            replayer.pool.close()
+        report.elapsed = time.monotonic() - start
+        return report
+
+    @staticmethod
+    async def _send(replayer, report, number, headers, details, arrival):
+        result = await replayer.send(number, headers, details)
+        report.add(result, time.monotonic() - arrival)
+
+
+class LoadReport(object):
+
+    """Latencies and outcomes of the requests sent by a :class:`LoadGenerator`.
+
+    ``latency`` holds the latencies measured from the scheduled arrivals of the requests, and ``service`` the
+    durations of the requests from the moment they were sent, waits for a connection included, both in microseconds.
+    """
+
+    def __init__(self, rate, duration):
+        self.rate = rate
+        self.duration = duration
+        self.latency = LatencyHistogram()
+        self.service = LatencyHistogram()
+        self.errors = 0
+        self.statuses = {}
+        self.elapsed = 0.0
+
+    def add(self, result, latency):
+        """Record the outcome of a request.
+
+        :param dict result: Result of the request, see :class:`hrt.replay.Replayer`.
+        :param float latency: Seconds elapsed since the scheduled arrival of the request.
+        """
+        self.latency.record(latency * 1e6)
+        self.service.record(result['elapsed'] * 1e6)
+        if 'error' in result:
+            self.errors += 1
+        else:
+            self.statuses[result['status']] = self.statuses.get(result['status'], 0) + 1
+
+    def merge(self, other):
+        """Add the outcomes of the requests of another process to this report."""
+        self.latency.merge(other.latency)
+        self.service.merge(other.service)
+        self.errors += other.errors
+        for status, count in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + count
+        # The processes ran at the same time
+        self.elapsed = max(self.elapsed, other.elapsed)
+
+    def throughput(self):
+        """Return the responses received per second."""
+        return self.latency.total / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        """Return a summary of the report.
+
+        :return: Dictionary of the target and achieved rates, the number of requests and errors, the statuses and the
+            percentiles of the latencies and of the service times, in milliseconds.
+        :rtype: dict
+        """
+        def milliseconds(histogram):
+            percentiles = {}
+            for percentile in LoadGenerator.PERCENTILES:
+                value = histogram.percentile(percentile)
+                percentiles['p%s' % percentile] = None if value is None else value / 1000.0
+            mean = histogram.mean()
+            percentiles['mean'] = None if mean is None else round(mean / 1000.0, 3)
+            percentiles['max'] = None if histogram.max is None else histogram.max / 1000.0
+            return percentiles
+
+        return {
+            'rate': self.rate,
+            'duration': round(self.elapsed, 3),
+            'requests': self.latency.total,
+            'errors': self.errors,
+            'throughput': round(self.throughput(), 1),
+            'statuses': dict((str(status), count) for status, count in sorted(self.statuses.items())),
+            'latency': milliseconds(self.latency),
+            'service': milliseconds(self.service)}
@@ -0,0 +1,286 @@
+"""
+
+:synopsis: Mutate a parsed request into many variants and render their scripts incrementally.
+
+"""
+
+from .plugin_manager import get_script_class
+from .url import get_url
+
+
+def _header_name(header):
+    return header.split(':', 1)[0].strip().lower()
+
+
+def _set_body(headers, details, data):
+    """Change the body of a request, keeping its Content-Length header, if any, in line with it.
+
+    :return: A tuple of the headers, the details and the names of the changed fields.
+    :rtype: tuple
+    """
+    changed = set(['data', 'url'])
+    if any(_header_name(header) == 'content-length' for header in headers):
+        length = str(len(data.encode('utf-8')))
+        headers = [
+            'Content-Length: ' + length if _header_name(header) == 'content-length' else header for header in headers]
+        changed.add('headers')
+    return headers, dict(details, data=data), changed
+
+
+def _set_parameter(string, name, value):
+    """Substitute the value of a parameter of a query string or a form body.
+
+    :return: A tuple of the new string and whether the parameter was found.
+    :rtype: tuple
+    """
+    found = False
+    parameters = string.split('&') if string else []
+    for index, parameter in enumerate(parameters):
+        if parameter.split('=', 1)[0] == name:
+            parameters[index] = '%s=%s' % (name, value)
+            found = True
+    return '&'.join(parameters), found
+
+
+class AddHeader(object):
+
+    """Add a header to the request, after the existing ones."""
+
+    def __init__(self, name, value):
+        self.header = '%s: %s' % (name, value)
+
+    def apply(self, headers, details):
+        """Apply the mutation.
+
+        :param list headers: Headers list containing lines like 'Host: google.com'.
+        :param dict details: Request specific details dictionary like body and method of the request.
+
+        :return: A tuple of the mutated headers, the mutated details and the names of the changed fields.
+        :rtype: tuple
+        """
+        return headers + [self.header], details, set(['headers'])
+
+
+class RemoveHeader(object):
+
+    """Remove every occurrence of a header from the request."""
+
+    def __init__(self, name):
+        self.name = name.strip().lower()
+
+    def apply(self, headers, details):
+        """Apply the mutation, see :meth:`AddHeader.apply`."""
+        return [header for header in headers if _header_name(header) != self.name], details, set(['headers'])
+
+
+class SetHeader(object):
+
+    """Change the value of every occurrence of a header of the request, adding it when missing.
+
+    Changing the Host header changes the host, and thus the URL, of the request too.
+    """
+
+    def __init__(self, name, value):
+        self.name = name.strip().lower()
+        self.header = '%s: %s' % (name, value)
+        self.value = value
+
+    def apply(self, headers, details):
+        """Apply the mutation, see :meth:`AddHeader.apply`."""
+        mutated = [self.header if _header_name(header) == self.name else header for header in headers]
+        if mutated == headers and self.header not in headers:
+            mutated.append(self.header)
+        if self.name == 'host':
+            return mutated, dict(details, Host=self.value), set(['headers', 'host', 'url'])
+        return mutated, details, set(['headers'])
+
+
+class SetParameter(object):
+
+    """Substitute the value of a query string or form body parameter of the request, wherever it is found."""
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+    def apply(self, headers, details):
+        """Apply the mutation, see :meth:`AddHeader.apply`.
+
+        :raises ValueError: When the request has no such parameter.
+        """
+        path, hash_sign, fragment = details.get('path', '').partition('#')
+        path, question_mark, query = path.partition('?')
+        query, in_query = _set_parameter(query, self.name, self.value)
+        data, in_data = _set_parameter(details.get('data', ''), self.name, self.value)
+        if not in_query and not in_data:
+            raise ValueError("Parameter '%s' not found in the query string or the body." % self.name)
+        changed = set()
+        if in_query:
+            details = dict(details, path=path + question_mark + query + hash_sign + fragment)
+            changed.add('url')
+        if in_data:
+            headers, details, body_changed = _set_body(headers, details, data)
+            changed.update(body_changed)
+        return headers, details, changed
+
+
+class SetMethod(object):
+
+    """Swap the method of the request."""
+
+    def __init__(self, method):
+        self.method = method
+
+    def apply(self, headers, details):
+        """Apply the mutation, see :meth:`AddHeader.apply`."""
+        return headers, dict(details, method=self.method), set(['method', 'url'])
+
+
+class SetBody(object):
+
+    """Replace the body of the request, updating its Content-Length header, if any."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def apply(self, headers, details):
+        """Apply the mutation, see :meth:`AddHeader.apply`."""
+        return _set_body(headers, details, self.data)
+
+
+def mutate(headers, details, mutations):
+    """Apply mutations, in order, to a parsed request.
+
+    :param list headers: Headers list containing lines like 'Host: google.com'.
+    :param dict details: Request specific details dictionary like body and method of the request.
+    :param iterable mutations: Mutations like :class:`AddHeader` or :class:`SetParameter`.
+
+    :raises ValueError: When a mutation does not apply to the request.
+
+    :return: A tuple of the mutated headers, the mutated details and the names of the changed fields.
+    :rtype: tuple
+    """
+    changed = set()
+    for mutation in mutations:
+        headers, details, mutation_changed = mutation.apply(headers, details)
+        changed.update(mutation_changed)
+    return headers, details, changed
+
+
+class MutationEngine(object):
+
+    """Render the scripts of the variants of a request, only re-rendering the fragments of the script changed by
+    the mutations of each variant.
+
+    The result is the same as :meth:`hrt.base.AbstractScript.generate_script` on the mutated request, without parsing
+    the request again nor rendering the unchanged fragments of the script.
+    """
+
+    # Fragments of a script, in order, with the fields of the request each one is rendered from.
+    FRAGMENTS = (
+        ('begin', frozenset(['url', 'headers', 'method'])),
+        ('proxy', frozenset()),
+        ('connection', frozenset()),
+        ('post', frozenset(['data', 'method'])),
+        ('https', frozenset()),
+        ('request', frozenset(['url', 'headers', 'method'])),
+    )
+
+    def __init__(self, language, headers, details, search=None, profile='debug', first_match=False, output_body=None,
+                 output_hash=None, timings=False):
+        """Render the fragments of the script of the original request.
+
+        :param str language: Name of the language for which the scripts are generated.
+        :param list headers: Headers list containing fields like 'Host', 'User-Agent', etc.
+        :param dict details: Request specific details dictionary like body and method of the request.
+        :param str search: String to search for in the responses to the requests.
+        :param str profile: Generation profile of the scripts, 'debug' or 'fast'.
+        :param bool first_match: Whether the scripts stop receiving the responses at the first match of the search.
+        :param str output_body: Directory the scripts write the response bodies into, if any.
+        :param str output_hash: Hash computed on the response bodies written to files, if any.
+        :param bool timings: Whether the scripts report the timings of the phases of every request.
+
+        :raises ValueError: When the language, the HTTP method or the profile is not supported, or the URL is invalid.
+        """
+        self.headers = list(headers)
+        self.details = dict(details)
+        self._script = get_script_class(language)(
+            headers=self.headers, details=self.details, search=search, profile=profile, first_match=first_match,
+            output_body=output_body, output_hash=output_hash, timings=timings)
+        self._fragments = self._render_fragments(self.headers, self.details, None, {})
+
+    def _render_fragments(self, headers, details, changed, fragments):
+        """Render the fragments depending on the changed fields, reusing the other ones.
+
+        :param list headers: Headers of the request.
+        :param dict details: Details of the request.
+        :param set changed: Names of the changed fields, ``None`` to render every fragment.
+        :param dict fragments: Fragments of the original request, by name.
+
+        :raises ValueError: When the HTTP method is not supported, or the URL is invalid.
+
+        :return: A dictionary of fragment name and respective code.
+        :rtype: dict
+        """
+        script = self._script
+        script.headers = headers
+        script.details = details
+        if changed is None or 'host' in changed:
+            script.url = script.encode_url(script.create_url())
+        elif 'url' in changed:
+            # Only the validation of the host is costly, and the host did not change.
+            script.url = script.encode_url(self._origin + details.get('path', ''))
+        else:
+            script.url = self._url
+        method = details.get('method', '').strip().lower()
+        if method not in ('get', 'post'):
+            raise ValueError("'%s' is not supported! Only GET and POST are supported for now." % details['method'])
+        rendered = {}
+        for name, fields in self.FRAGMENTS:
+            if changed is not None and not fields & changed:
+                rendered[name] = fragments[name]
+            elif name == 'begin':
+                rendered[name] = script._generate_begin() if script.code_begin else ''
+            elif name == 'proxy':
+                rendered[name] = script._generate_proxy() if script.code_proxy else ''
+            elif name == 'connection':
+                rendered[name] = script._generate_connection(script.code_unix_socket, script.code_connect_to)
+            elif name == 'post':
+                rendered[name] = script._generate_post() if method == 'post' and script.code_post else ''
+            elif name == 'https':
+                rendered[name] = script._generate_https() if script.code_https else ''
+            else:
+                rendered[name] = script._generate_request()
+        if changed is None:
+            self._origin = get_url(details.get('Host', ''), details.get('pre_scheme', ''))
+            self._url = script.url
+        return rendered
+
+    def render(self, mutations=()):
+        """Render the script of a variant of the request.
+
+        :param iterable mutations: Mutations like :class:`AddHeader` or :class:`SetParameter`, applied in order.
+
+        :raises ValueError: When a mutation does not apply to the request, the mutated HTTP method is not supported or
+            the mutated URL is invalid.
+
+        :return: Generated script code.
+        :rtype: str
+        """
+        headers, details, changed = mutate(self.headers, self.details, mutations)
+        if not changed:
+            fragments = self._fragments
+        else:
+            fragments = self._render_fragments(headers, details, changed, self._fragments)
+        return ''.join(fragments[name] for name, _ in self.FRAGMENTS)
+
+    def variants(self, mutation_sets):
+        """Lazily render the scripts of many variants of the request.
+
+        :param iterable mutation_sets: Iterables of mutations, one per variant.
+
+        :return: Generator of the generated script codes, in the order of `mutation_sets`.
+        :rtype: generator
+        """
+        for mutations in mutation_sets:
+            yield self.render(mutations)
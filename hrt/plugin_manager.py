@@ -1,7 +1,8 @@
 from __future__ import print_function
 
 from .base import AbstractScript
-from .script import BashScript, PHPScript, PythonScript, RubyScript
+from .script import (AiohttpScript, BashScript, GoScript, K6Script, LocustScript, PHPScript, PythonScript, RubyScript,
+                     WrkScript)
 
 
 def get_script_class(script_name):
@@ -22,16 +23,76 @@ def get_script_class(script_name):
     raise ValueError("The {} language is not supported.".format(script_name))
 
 
-def generate_script(script, headers, details, search_string=None):
+def generate_script(script, headers, details, search_string=None, profile='debug', first_match=False, output_body=None,
+                    output_hash=None, timings=False):
     """Returns the script code for the HTTP request passed in script language
 
     :param str script: Name of the language for which script is to be generated
     :param dict headers: Headers information
     :param dict details: Details information
     :param str search_string: string to be searched for in the response for given request
+    :param str profile: generation profile, 'debug' or 'fast'
+    :param bool first_match: whether the script stops receiving the response at the first match of the search
+    :param str output_body: directory the script writes the response body into, if any
+    :param str output_hash: hash computed on the response body written to a file, if any
+    :param bool timings: whether the script reports the timings of the phases of the request
 
     :return: A combined string of generated code
     :rtype: `str`
     """
     class_script = get_script_class(script.strip().lower())
-    return class_script(headers=headers, details=details, search=search_string).generate_script()
+    return class_script(
+        headers=headers, details=details, search=search_string, profile=profile, first_match=first_match,
+        output_body=output_body, output_hash=output_hash, timings=timings).generate_script()
+
+
+def generate_payload_script(script, headers, details, payloads, search_string=None, profile='debug',
+                            first_match=False, output_body=None, output_hash=None, timings=False):
+    """Returns the script code sending the HTTP request once per payload of a file, in script language
+
+    :param str script: Name of the language for which script is to be generated
+    :param dict headers: Headers information
+    :param dict details: Details information
+    :param str payloads: Path of the payloads file, inserted at the placeholders of the request
+    :param str search_string: string to be searched for in the responses
+    :param str profile: generation profile, 'debug' or 'fast'
+    :param bool first_match: whether the script stops receiving each response at the first match of the search
+    :param str output_body: directory the script writes the response bodies into, if any
+    :param str output_hash: hash computed on the response bodies written to files, if any
+    :param bool timings: whether the script reports the timings of the phases of every request
+
+    :return: A combined string of generated code
+    :rtype: `str`
+    """
+    class_script = get_script_class(script.strip().lower())
+    return class_script(
+        headers=headers, details=details, search=search_string, profile=profile, first_match=first_match,
+        output_body=output_body, output_hash=output_hash, timings=timings).generate_payload_script(payloads)
+
+
+def generate_batch_script(script, requests, search_string=None, proxy=None, concurrency=10, profile='debug',
+                          first_match=False, output_body=None, output_hash=None, timings=False, unix_socket=None,
+                          connect_to=None):
+    """Returns a single script code sending a batch of HTTP requests concurrently, in script language
+
+    :param str script: Name of the language for which script is to be generated
+    :param iterable requests: Tuples of headers and details of the requests
+    :param str search_string: string to be searched for in the responses
+    :param str proxy: proxy the requests are sent through, if any
+    :param int concurrency: maximum number of requests in flight at once
+    :param str profile: generation profile, 'debug' or 'fast'
+    :param bool first_match: whether the script stops receiving each response at the first match of the search
+    :param str output_body: directory the script writes the response bodies into, if any
+    :param str output_hash: hash computed on the response bodies written to files, if any
+    :param bool timings: whether the script reports the timings of the phases of every request
+    :param str unix_socket: Unix socket the requests are sent through, if any
+    :param str connect_to: address the requests connect to instead of the host of their URL, if any
+
+    :return: A combined string of generated code
+    :rtype: `str`
+    """
+    class_script = get_script_class(script.strip().lower())
+    return class_script(
+        profile=profile, first_match=first_match, output_body=output_body, output_hash=output_hash, timings=timings
+    ).generate_batch_script(
+        requests, search_string, proxy, concurrency, unix_socket, connect_to)
@@ -0,0 +1,554 @@
+"""
+
+:synopsis: Send parsed requests in-process, over asyncio, instead of generating scripts.
+
+The requests are sent over HTTP/1.1 by a pool of workers, through connections kept alive and shared per host. The
+responses are streamed, scanned for the search string as they arrive, and reported as they complete.
+
+.. note::
+
+    This module requires Python 3.7 or newer, and is only imported by the ``hrt replay`` command.
+
+"""
+
+import asyncio
+import ssl
+import time
+import zlib
+from urllib.parse import urlparse
+
+from .cache import is_conditional
+from .dedup import canonicalize
+from .search import REGEX_PREFIX, SearchPatterns
+from .url import check_valid_url, get_connection_details, get_proxy_details, get_url
+
+
+# Size of the chunks the response bodies are received in.
+CHUNK_SIZE = 65536
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+# Headers of the request computed from the body sent.
+_FRAMING_HEADERS = ('content-length', 'transfer-encoding')
+# Idempotent methods whose identical requests in flight share a single response, when coalescing.
+COALESCED_METHODS = ('GET', 'HEAD')
+# Headers not making two requests different when coalescing them, on top of the hop-by-hop ones.
+COALESCE_IGNORED_HEADERS = frozenset(['date'])
+
+
+class ReplayError(Exception):
+
+    """The server, or the proxy, sent an invalid response."""
+
+
+class Connection(object):
+
+    """Connection to a server, or to a proxy, kept alive between the requests."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        # Whether a request was already sent over the connection.
+        self.reused = False
+
+    def is_alive(self):
+        return not self.reader.at_eof() and not self.writer.is_closing()
+
+    def close(self):
+        self.writer.close()
+
+
+class ConnectionPool(object):
+
+    """Connections kept alive between the requests, per host.
+
+    A connection is either idle in the pool or used by a single request. Every host has its own limit of open
+    connections, the requests exceeding it waiting for a connection of the host to be released.
+    """
+
+    def __init__(self, limit_per_host=10, proxy=None, unix_socket=None, connect_to=None, ssl_context=None):
+        """
+        :param int limit_per_host: Maximum number of connections open to a host.
+        :param str proxy: HTTP proxy the requests are sent through, if any.
+        :param str unix_socket: Unix socket the requests are sent through, if any.
+        :param str connect_to: Address the requests connect to instead of the host of their URL, if any.
+        :param ssl_context: :class:`ssl.SSLContext` of the HTTPS connections, verifying the certificates by default.
+
+        :raises ValueError: When the limit, the proxy or the connection overrides are invalid.
+        """
+        if limit_per_host < 1:
+            raise ValueError("Limit of connections per host must be positive, not %s." % limit_per_host)
+        self.limit_per_host = limit_per_host
+        self.proxy = None
+        if proxy:
+            details = get_proxy_details(proxy)
+            scheme, netloc = details['proxy_host'].split('://', 1)
+            if scheme != 'http':
+                raise ValueError("Only HTTP proxies are supported, not '%s'." % proxy)
+            self.proxy = (netloc.strip('[]'), int(details['proxy_port']))
+        connection = get_connection_details(unix_socket, connect_to)
+        if connection and self.proxy:
+            raise ValueError("Requests cannot connect to both a proxy and another address.")
+        self.unix_socket = connection.get('unix_socket')
+        self.connect_to = None
+        if 'connect_host' in connection:
+            self.connect_to = (connection['connect_host'].strip('[]'), int(connection['connect_port']))
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self._idle = {}
+        self._limits = {}
+
+    def tunnels(self, scheme):
+        """Whether the requests of a scheme are sent through a tunnel of the proxy instead of the proxy itself."""
+        return self.proxy is not None and scheme == 'https'
+
+    def _key(self, scheme, host, port):
+        # Every plain HTTP request is sent to the proxy itself, whatever its host
+        if self.proxy is not None and not self.tunnels(scheme):
+            return ('proxy',)
+        return (scheme, host, port)
+
+    async def acquire(self, scheme, host, port):
+        """Take an idle connection to a host, or open a new one.
+
+        :param str scheme: 'http' or 'https'.
+        :param str host: Host of the URL.
+        :param int port: Port of the URL.
+
+        :raises OSError: When the connection fails.
+        :raises ReplayError: When the proxy refuses to open a tunnel.
+
+        :return: A tuple of the key of the host in the pool and the connection.
+        :rtype: tuple
+        """
+        key = self._key(scheme, host, port)
+        limit = self._limits.get(key)
+        if limit is None:
+            limit = self._limits[key] = asyncio.Semaphore(self.limit_per_host)
+        await limit.acquire()
+        try:
+            idle = self._idle.get(key, [])
+            while idle:
+                connection = idle.pop()
+                if connection.is_alive():
+                    return key, connection
+                connection.close()
+            return key, await self._open(scheme, host, port)
+        except BaseException:
+            limit.release()
+            raise
+
+    def release(self, key, connection, reusable):
+        """Give a connection back to the pool, closing it when it cannot be reused.
+
+        :param tuple key: Key of the host, from :meth:`acquire`.
+        :param connection: :class:`Connection` from :meth:`acquire`.
+        :param bool reusable: Whether another request can be sent over the connection.
+        """
+        if reusable and connection.is_alive():
+            connection.reused = True
+            self._idle.setdefault(key, []).append(connection)
+        else:
+            connection.close()
+        self._limits[key].release()
+
+    def close(self):
+        """Close the idle connections."""
+        for idle in self._idle.values():
+            for connection in idle:
+                connection.close()
+        self._idle = {}
+        self._limits = {}
+
+    async def _open(self, scheme, host, port):
+        ssl_context = self.ssl_context if scheme == 'https' else None
+        # The TLS server name is the host of the URL, whatever the address connected to
+        server_hostname = host if ssl_context else None
+        if self.unix_socket:
+            reader, writer = await asyncio.open_unix_connection(
+                self.unix_socket, ssl=ssl_context, server_hostname=server_hostname)
+        elif self.proxy is not None:
+            reader, writer = await asyncio.open_connection(*self.proxy)
+            if self.tunnels(scheme):
+                reader, writer = await self._tunnel(reader, writer, host, port)
+        else:
+            address = self.connect_to or (host, port)
+            reader, writer = await asyncio.open_connection(
+                *address, ssl=ssl_context, server_hostname=server_hostname)
+        return Connection(reader, writer)
+
+    async def _tunnel(self, reader, writer, host, port):
+        """Open a tunnel to a host through the proxy, then negotiate TLS through it."""
+        authority = '%s:%d' % ('[%s]' % host if ':' in host else host, port)
+        writer.write(('CONNECT %s HTTP/1.1\r\nHost: %s\r\n\r\n' % (authority, authority)).encode('ascii'))
+        try:
+            await writer.drain()
+            _, status, _ = await read_head(reader)
+            if status != 200:
+                raise ReplayError("Proxy refused to connect to %s: %d." % (authority, status))
+            if hasattr(writer, 'start_tls'):  # Python 3.11+
+                await writer.start_tls(self.ssl_context, server_hostname=host)
+                return reader, writer
+            loop = asyncio.get_event_loop()
+            protocol = writer.transport.get_protocol()
+            transport = await loop.start_tls(
+                writer.transport, protocol, self.ssl_context, server_hostname=host)
+            return reader, asyncio.StreamWriter(transport, protocol, reader, loop)
+        except BaseException:
+            writer.close()
+            raise
+
+
+async def read_head(reader):
+    """Read the status line and the headers of a response, skipping the informational ones.
+
+    :param reader: :class:`asyncio.StreamReader` of the connection.
+
+    :raises ReplayError: When the response is malformed.
+    :raises ConnectionError: When the connection is closed before the end of the headers.
+
+    :return: A tuple of the HTTP version, the status code and the headers, by lowercase name.
+    :rtype: tuple
+    """
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionResetError("Connection closed before the response.")
+        try:
+            version, status = line.decode('latin-1').split(None, 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise ReplayError("Malformed status line %r." % line)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionResetError("Connection closed before the response.")
+            line = line.rstrip(b'\r\n')
+            if not line:
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name = name.strip().lower()
+            value = value.strip()
+            headers[name] = headers[name] + ', ' + value if name in headers else value
+        if not 100 <= status < 200:
+            return version, status, headers
+
+
+async def iter_body(reader, method, status, headers):
+    """Stream the body of a response, as it is framed on the wire.
+
+    :param reader: :class:`asyncio.StreamReader` of the connection.
+    :param str method: Method of the request.
+    :param int status: Status code of the response.
+    :param dict headers: Headers of the response, by lowercase name.
+
+    :raises ReplayError: When the framing of the body is malformed.
+    :raises asyncio.IncompleteReadError: When the connection is closed before the end of the body.
+
+    :return: Asynchronous generator of the chunks of the body, ending with ``None`` when the body is delimited by
+        the end of the connection.
+    :rtype: async_generator
+    """
+    if method == 'HEAD' or status in (204, 304):
+        return
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        while True:
+            line = await reader.readline()
+            try:
+                size = int(line.split(b';', 1)[0].strip(), 16)
+            except ValueError:
+                raise ReplayError("Malformed chunk size %r." % line)
+            if not size:
+                break
+            async for chunk in _read_exactly(reader, size):
+                yield chunk
+            await reader.readexactly(2)
+        # Trailers
+        while (await reader.readline()).strip(b'\r\n'):
+            pass
+    elif 'content-length' in headers:
+        try:
+            length = int(headers['content-length'])
+        except ValueError:
+            raise ReplayError("Malformed Content-Length %r." % headers['content-length'])
+        async for chunk in _read_exactly(reader, length):
+            yield chunk
+    else:
+        while True:
+            chunk = await reader.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+        yield None
+
+
+async def _read_exactly(reader, size):
+    while size:
+        chunk = await reader.read(min(size, CHUNK_SIZE))
+        if not chunk:
+            raise asyncio.IncompleteReadError(b'', size)
+        size -= len(chunk)
+        yield chunk
+
+
+async def _iter_cached(body):
+    for start in range(0, len(body), CHUNK_SIZE):
+        yield body[start:start + CHUNK_SIZE]
+
+
+def _decompressor(encoding):
+    """Return a decompressor of the chunks of a body, if its content encoding is supported."""
+    encoding = encoding.strip().lower()
+    if encoding in ('gzip', 'x-gzip'):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        return zlib.decompressobj()
+    return None
+
+
+def _keeps_alive(version, headers):
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.0':
+        return 'keep-alive' in connection
+    return 'close' not in connection
+
+
+class Replayer(object):
+
+    """Send parsed requests concurrently, over the connections of a :class:`ConnectionPool`.
+
+    Every request is reported once its response is received, as a dictionary of its number, method and URL, the
+    status code, the size and the duration of its response, and the matches of the search, if any, along with the
+    ``hits`` of every pattern found when searching for :class:`hrt.search.SearchPatterns`. A request which fails is
+    reported along with its error instead of stopping the replay. A response answered from the cache, the server
+    having answered the revalidation with ``304 Not Modified``, is reported as ``cached`` with its cached status.
+
+    When coalescing, a GET or HEAD request identical to a request in flight is not sent: it waits for the response to
+    the request in flight, and is reported along with it as ``coalesced``, ``coalesced`` counting these requests.
+    """
+
+    def __init__(self, search=None, first_match=False, concurrency=10, limit_per_host=None, timeout=30, proxy=None,
+                 unix_socket=None, connect_to=None, ssl_context=None, cache=None, coalesce=False,
+                 coalesce_ignored_headers=COALESCE_IGNORED_HEADERS):
+        """
+        :param search: Regular expression searched for in the response bodies, or :class:`hrt.search.SearchPatterns`,
+            if any.
+        :param bool first_match: Whether to stop receiving each response at the first match of the search.
+        :param int concurrency: Maximum number of requests in flight at once.
+        :param int limit_per_host: Maximum number of connections open to a host, `concurrency` by default.
+        :param float timeout: Seconds given to each request to complete, ``None`` to wait forever.
+        :param str proxy: HTTP proxy the requests are sent through, if any.
+        :param str unix_socket: Unix socket the requests are sent through, if any.
+        :param str connect_to: Address the requests connect to instead of the host of their URL, if any.
+        :param ssl_context: :class:`ssl.SSLContext` of the HTTPS connections, verifying the certificates by default.
+        :param cache: :class:`hrt.cache.ResponseCache` revalidating the responses of the previous replays, if any.
+        :param bool coalesce: Whether the identical GET and HEAD requests in flight share a single response.
+        :param iterable coalesce_ignored_headers: Names of the headers not making two requests different when
+            coalescing them, the hop-by-hop headers being always ignored.
+
+        :raises ValueError: When the concurrency, the search, the proxy or the connection overrides are invalid.
+        """
+        if concurrency < 1:
+            raise ValueError("Concurrency must be positive, not %s." % concurrency)
+        # A single regular expression is searched for like a pattern file of one regex, without reporting its hits
+        self.patterns = search
+        self.report_hits = isinstance(search, SearchPatterns)
+        if search and not self.report_hits:
+            self.patterns = SearchPatterns([REGEX_PREFIX + search])
+        self.first_match = first_match
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.cache = cache
+        self.coalesce = coalesce
+        self.coalesce_ignored_headers = frozenset(name.strip().lower() for name in coalesce_ignored_headers)
+        self.coalesced = 0
+        # Futures of the results of the requests in flight, by canonical request
+        self._in_flight = {}
+        self.pool = ConnectionPool(
+            limit_per_host=limit_per_host or concurrency, proxy=proxy, unix_socket=unix_socket, connect_to=connect_to,
+            ssl_context=ssl_context)
+
+    def replay(self, requests, report):
+        """Send the requests, blocking until every one of them is reported.
+
+        :param iterable requests: Tuples of headers and details of the requests, consumed lazily.
+        :param callable report: Called with the result of each request, as soon as it completes.
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self.replay_async(requests, report))
+        finally:
+            loop.close()
+
+    async def replay_async(self, requests, report):
+        """Coroutine sending the requests, see :meth:`replay`."""
+        numbered = enumerate(requests, 1)
+        workers = [asyncio.ensure_future(self._worker(numbered, report)) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            # A worker failing, on an invalid request of the corpus for instance, stops the others
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self.pool.close()
+
+    async def _worker(self, numbered, report):
+        # The workers share the iterator of the requests, only taking the next one once theirs is reported
+        for number, (headers, details) in numbered:
+            report(await self.send(number, headers, details))
+
+    async def send(self, number, headers, details):
+        """Send a request and receive its response, or wait for the response to an identical request in flight when
+        coalescing.
+
+        :param int number: Number of the request, reported along with its result.
+        :param list headers: Headers list containing lines like 'Host: google.com'.
+        :param dict details: Request specific details dictionary like body and method of the request.
+
+        :return: Result of the request.
+        :rtype: dict
+        """
+        if not self.coalesce or details.get('method', '').strip().upper() not in COALESCED_METHODS:
+            return await self._send(number, headers, details)
+        key = canonicalize(headers, details, self.coalesce_ignored_headers)
+        leader = self._in_flight.get(key)
+        if leader is not None:
+            self.coalesced += 1
+            start = time.monotonic()
+            # The request in flight is not cancelled along with a request waiting for it
+            result = dict(await asyncio.shield(leader), id=number, coalesced=True)
+            result['elapsed'] = round(time.monotonic() - start, 6)
+            return result
+        leader = self._in_flight[key] = asyncio.get_event_loop().create_future()
+        try:
+            result = await self._send(number, headers, details)
+            leader.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+            if not leader.done():
+                leader.cancel()
+
+    async def _send(self, number, headers, details):
+        method = details.get('method', '').strip().upper()
+        url = get_url(details.get('Host', ''), details.get('pre_scheme', '')) + details.get('path', '')
+        result = {'id': number, 'method': method, 'url': url}
+        start = time.monotonic()
+        try:
+            if not check_valid_url(url):
+                raise ValueError("Invalid URL '%s'." % url)
+            if self.timeout:
+                await asyncio.wait_for(self._exchange(headers, details, url, result), self.timeout)
+            else:
+                await self._exchange(headers, details, url, result)
+        except asyncio.TimeoutError:
+            result['error'] = 'Timed out after %s seconds' % self.timeout
+        except (OSError, ValueError, ReplayError, asyncio.IncompleteReadError, zlib.error) as error:
+            result['error'] = str(error) or error.__class__.__name__
+        result['elapsed'] = round(time.monotonic() - start, 6)
+        return result
+
+    async def _exchange(self, headers, details, url, result):
+        parsed = urlparse(url)
+        scheme, host = parsed.scheme, parsed.hostname
+        port = parsed.port or _DEFAULT_PORTS.get(scheme)
+        if port is None:
+            raise ValueError("Scheme '%s' is not supported." % scheme)
+        target = details.get('path', '').split('#', 1)[0] or '/'
+        if self.pool.proxy is not None and not self.pool.tunnels(scheme):
+            target = '%s://%s%s' % (scheme, parsed.netloc, target)
+        cached = None
+        if self.cache is not None and not is_conditional(headers):
+            cached = self.cache.lookup(result['method'], url, headers)
+        request = self._format(
+            result['method'], target, (headers + self.cache.validators(cached)) if cached else headers,
+            details.get('data', ''))
+        while True:
+            key, connection = await self.pool.acquire(scheme, host, port)
+            reusable = False
+            try:
+                connection.writer.write(request)
+                try:
+                    # Waits for the large bodies to be flushed, the transport buffering them otherwise
+                    await connection.writer.drain()
+                    version, status, response_headers = await read_head(connection.reader)
+                except OSError:
+                    # The server may have closed the kept-alive connection meanwhile, the request is sent again once
+                    # over a new connection.
+                    if connection.reused:
+                        continue
+                    raise
+                if cached is not None and status == 304:
+                    self.cache.hit(cached, response_headers)
+                    result.update(status=cached.status, cached=True)
+                    await self._receive(_iter_cached(cached.body), result, cached.headers)
+                    reusable = _keeps_alive(version, response_headers)
+                    return
+                result['status'] = status
+                capture = None
+                if self.cache is not None and self.cache.cacheable(result['method'], status, response_headers):
+                    capture = []
+                reusable = await self._receive(
+                    iter_body(connection.reader, result['method'], status, response_headers), result,
+                    response_headers, capture)
+                # Neither stopped at the first match nor too large for the cache
+                if capture is not None and sum(len(chunk) for chunk in capture) == result['bytes'] and (
+                        'stopped' not in result):
+                    self.cache.store(result['method'], url, headers, status, response_headers, b''.join(capture))
+                reusable = reusable and _keeps_alive(version, response_headers)
+                return
+            finally:
+                self.pool.release(key, connection, reusable)
+
+    def _format(self, method, target, headers, data):
+        """Format the request line, the headers and the body of a request.
+
+        :return: The request, as sent on the wire.
+        :rtype: bytes
+        """
+        body = data.encode('utf-8')
+        lines = ['%s %s HTTP/1.1' % (method, target)]
+        # The body is sent at once, thus framed by its length whatever the captured request was framed with
+        lines.extend(header for header in headers if header.split(':', 1)[0].strip().lower() not in _FRAMING_HEADERS)
+        if body or method in ('POST', 'PUT', 'PATCH'):
+            lines.append('Content-Length: %d' % len(body))
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8') + body
+
+    async def _receive(self, chunks, result, headers, capture=None):
+        """Receive the body of a response, searching it as it arrives.
+
+        :param chunks: Asynchronous iterable of the chunks of the body, see :func:`iter_body`.
+        :param dict result: Result of the request, updated with the size of the body and the matches of the search.
+        :param dict headers: Headers of the response, by lowercase name.
+        :param list capture: List the chunks are appended to as long as the body fits into the cache, if any.
+
+        :return: Whether the whole body was received, the connection being left ready for the next request.
+        :rtype: bool
+        """
+        scanner = None
+        if self.patterns:
+            scanner = self.patterns.scanner(self.first_match)
+            if self.report_hits:
+                # Counted by the scanner as it goes
+                result['hits'] = scanner.hits
+        decompressor = _decompressor(headers.get('content-encoding', ''))
+        result['bytes'] = 0
+        if scanner is not None:
+            result['matches'] = []
+        async for chunk in chunks:
+            if chunk is None:  # The body ended with the connection
+                return False
+            result['bytes'] += len(chunk)
+            if capture is not None and result['bytes'] <= self.cache.max_size:
+                capture.append(chunk)
+            if scanner is None:
+                continue
+            if decompressor is not None:
+                chunk = decompressor.decompress(chunk)
+            matches = scanner.feed(chunk)
+            result['matches'].extend(match.decode('utf-8', 'replace') for _, match in matches)
+            if matches and self.first_match:
+                # The rest of the response is not received, the connection cannot be reused
+                result['stopped'] = True
+                return False
+        return True
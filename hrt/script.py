@@ -4,25 +4,113 @@
 
 """
 
-from .base import AbstractScript
+from .base import AbstractScript, EscapedQuoteMixin
 
 
 class BashScript(AbstractScript):
 
     """Extended `AbstractScript` class for Bash script code generation.
     Fills code variables for the request from `bash_template`.
-    Overrides `_generate_request` method to generate bash specific code.
+    Overrides `_generate_request`, `_generate_search` and `_generate_timings` methods to generate bash specific code.
+    Overrides `_quote`, `_generate_loop_rows` and `_generate_loop_request` methods to generate bash specific loop code.
+    Overrides `_generate_batch_begin`, `_generate_batch_request` and `_generate_batch_connection` methods to write the
+    batch into a curl config file, and `_generate_batch_loop` method to search every response on its own.
     """
 
     __language__ = 'bash'
+    __extension__ = 'sh'
 
     def _generate_request(self):
         code = self.code_nosearch.format(
             method=self.details.get('method', ''),
             url=self.url,
             headers=self._generate_headers())
-        if self.search:
-            code += self.code_search.format(search_string=self.search.replace('"', '\\"'))
+        code += self._generate_timings(self.code_timings)
+        if self.output_body:
+            # The body is written into its file instead of being printed along with the headers.
+            code = code.replace(' --include', '') + self._generate_output(self.code_output)
+            if self.output_hash:
+                code += self.code_output_hash.format(algorithm=self.output_hash, path=self._quote(self.output_body))
+        elif self.search:
+            code += self._generate_search(self.search)
+        return code
+
+    def _generate_search(self, search_string=''):
+        # grep exits at its first match when stopping there, curl then failing to write the rest of the response.
+        code = self.code_search_first if self.first_match else self.code_search
+        return code.format(**self._search_fields(search_string))
+
+    def _generate_timings(self, template):
+        code = super(BashScript, self)._generate_timings(template)
+        if self.search and not self.output_body:
+            # grep would filter the timings out along with the rest of the responses, they are written to stderr.
+            code = code.replace('\\n{', '%{stderr}\\n{', 1)
+        return code
+
+    def _quote(self, value):
+        return "'%s'" % value.replace("'", "'\\''")
+
+    def _generate_loop_rows(self, rows):
+        # Bash has no nested arrays, the values of all the rows are flattened and read back `width` at a time.
+        width = max([len(row) for row in rows] + [1])
+        code = ''
+        for row in rows:
+            code += self.code_loop_row.format(values=' '.join(self._quote(value) for value in row or ['']))
+        return self.code_loop_rows.format(rows=code, width=width, **self._loop_fields())
+
+    def _generate_loop_request(self):
+        if self.search and self.first_match and not self.output_body:
+            # grep exiting at its first match would stop the single curl process along with the requests left.
+            post = ''
+            if self.details.get('method', '').strip().lower() == 'post':
+                post = self.code_loop_post.format(**self._loop_fields())
+            fields = self._loop_fields()
+            fields.update(self._search_fields(self.search))
+            return self.code_loop_search_first.format(post=post, **fields)
+        code = super(BashScript, self)._generate_loop_request()
+        if self.search and not self.output_body:
+            code += self._generate_search(self.search)
+        return code
+
+    def _config_quote(self, value):
+        # Strings of a curl config file are double quoted, with C-like escapes.
+        value = value.replace('\\', '\\\\').replace('"', '\\"').replace('\t', '\\t')
+        return '"%s"' % value.replace('\r', '\\r').replace('\n', '\\n')
+
+    def _generate_batch_begin(self, concurrency):
+        output = self._quote(self.output_body) if self.output_body else 'responses'
+        return self.code_batch_begin.format(concurrency=concurrency, output=output)
+
+    def _generate_batch_connection(self):
+        # The connection overrides are options of every section of the config file.
+        return ''
+
+    def _generate_batch_loop(self):
+        if self.search and self.first_match and not self.output_body:
+            return self.code_batch_search_first.format(**self._search_fields(self.search))
+        return super(BashScript, self)._generate_batch_loop()
+
+    def _generate_batch_request(self, index):
+        # Every request is a section of the curl config file, sections being separated by `next`.
+        template = self.code_batch_request
+        if self.output_body:
+            # Only the bodies are written into the files.
+            template = template.replace('include\n', '')
+        method = self.details.get('method', '').strip().upper()
+        data = ''
+        if method == 'POST':
+            data = self.code_batch_post.format(data=self._config_quote(self.details.get('data', '')))
+        code = template.format(
+            index=index,
+            method=method,
+            url=self._config_quote(self.url),
+            headers=''.join(self.code_batch_header.format(header=self._config_quote(item)) for item in self.headers),
+            data=data,
+            connection=self._generate_connection(
+                self.code_batch_unix_socket, self.code_batch_connect_to, quote=self._config_quote),
+            timings=self._generate_timings(self.code_batch_timings))
+        if index > 1:
+            code = self.code_batch_next + code
         return code
 
 
@@ -30,38 +118,229 @@ class PHPScript(AbstractScript):
 
     """Extended `AbstractScript` class for PHP script code generation.
     Fills code variables for the request from `php_template`.
-    Overrides `_generate_begin` method to generate php specific code.
+    Overrides `_generate_begin` and `_generate_nosearch` methods to generate php specific code.
     """
 
     __language__ = 'php'
+    __extension__ = 'php'
 
     def _generate_begin(self):
         return self.code_begin.format(url=self.url) + self._generate_headers()
 
+    def _generate_nosearch(self):
+        return self.code_nosearch.format(timings=self._generate_timings(self.code_timings))
 
-class PythonScript(AbstractScript):
+
+class PythonScript(EscapedQuoteMixin, AbstractScript):
 
     """Extended `AbstractScript` class for Python script code generation.
     Fills code variables for the request from `python_template`.
-    Overrides `_generate_begin` method to generate python specific code.
+    Overrides `_generate_begin` and `_generate_nosearch` methods to generate python specific code.
+    Overrides `_boolean` and `_patterns_fields` methods to generate python specific search code.
     """
 
     __language__ = 'python'
+    __extension__ = 'py'
 
     def _generate_begin(self):
         return self.code_begin.format(url=self.url, headers=str(self.headers))
 
+    def _generate_nosearch(self):
+        return self.code_nosearch.format(timings=self._generate_timings(self.code_timings))
+
+    def _boolean(self, value):
+        return 'True' if value else 'False'
+
+    def _patterns_fields(self, patterns):
+        # The tables are embedded as literals, the script not having to build the automaton
+        fields = dict((name, repr(value)) for name, value in patterns.tables().items())
+        # Python 2 writes the byte strings without the prefix Python 3 reads them with
+        fields['starts'] = self._bytes(patterns.automaton.starts)
+        fields['regex'] = self._bytes(patterns.regex)
+        fields['regexes'] = '[%s]' % ', '.join(
+            '(%d, %s)' % (index, self._bytes(source)) for index, source in patterns.regexes)
+        return fields
+
+    def _bytes(self, value):
+        return 'b' + repr(value).lstrip('b')
+
 
 class RubyScript(AbstractScript):
 
     """Extended `AbstractScript` class for Ruby script code generation.
     Fills code variables for the request from `ruby_template`.
     Overrides `_generate_begin` method to generate Ruby specific code.
+    Overrides `_generate_batch_begin` method to memoize the identical requests of the batch.
     """
 
     __language__ = 'ruby'
+    __extension__ = 'rb'
 
     def _generate_begin(self):
-        code = self.code_begin.format(url=self.url, method=self.details.get('method', '').strip().lower())
+        code = self.code_begin.format(
+            url=self.url,
+            method=self.details.get('method', '').strip().lower(),
+            timings=self._generate_timings(self.code_timings))
         code += self.code_headers.format(headers=self._generate_headers())
         return code
+
+    def _generate_batch_begin(self, concurrency):
+        # The memoized responses skip the scanner of the search, their matches would be missed.
+        memoize = self.profile == 'fast' and not self.search
+        return self.code_batch_begin.format(
+            concurrency=concurrency, timings=self._generate_timings(self.code_batch_timings),
+            memoize=self._boolean(memoize))
+
+
+class AiohttpScript(EscapedQuoteMixin, AbstractScript):
+
+    """Extended `AbstractScript` class for asyncio Python script code generation, based on aiohttp.
+    Fills code variables for the request from `aiohttp_template`.
+    Overrides `_generate_begin` method to generate the table of requests sent by the script, a single request being a
+    batch of one.
+    Overrides `_generate_batch_begin` and `_generate_loop_main` methods to generate aiohttp specific batch and loop
+    code.
+    Overrides `_boolean` method to generate python specific search code.
+    """
+
+    __language__ = 'aiohttp'
+    __extension__ = 'py'
+
+    def _generate_begin(self):
+        code = self.code_begin.format(concurrency=1, proxy=self._proxy())
+        return code + self.code_batch_requests.format(requests=self._generate_batch_request(1))
+
+    def _boolean(self, value):
+        return 'True' if value else 'False'
+
+    def _generate_batch_begin(self, concurrency):
+        return self.code_batch_begin.format(concurrency=concurrency, proxy=self._proxy())
+
+    def _generate_loop_main(self):
+        return self.code_loop_main.format(proxy=self._proxy(), **self._loop_fields())
+
+
+class WrkScript(EscapedQuoteMixin, AbstractScript):
+
+    """Extended `AbstractScript` class for wrk Lua script code generation.
+    Fills code variables for the request from `wrk_template`.
+    Overrides `_generate_begin` method to generate the table of requests cycled through by the script, a single request
+    being a batch of one.
+    Overrides `_generate_batch_begin` and `_generate_batch_request` methods to generate wrk specific batch code.
+    """
+
+    __language__ = 'wrk'
+    __extension__ = 'lua'
+
+    def _generate_begin(self):
+        code = self.code_begin.format(concurrency=1, proxy=self._proxy())
+        return code + self.code_batch_requests.format(requests=self._generate_batch_request(1))
+
+    def _generate_batch_begin(self, concurrency):
+        return self.code_batch_begin.format(concurrency=concurrency, proxy=self._proxy())
+
+    def _generate_batch_request(self, index):
+        # wrk connects to a single address, given on its command line, the requests only carry their path.
+        parts = self.url.split('/', 3)
+        path = '/' + parts[3] if len(parts) > 3 else '/'
+        method = self.details.get('method', '').strip()
+        return self.code_batch_request.format(
+            method=self._quote(method.upper()),
+            url=self._quote(self.url),
+            path=self._quote(path),
+            headers=', '.join(self._generate_batch_headers()),
+            data=self._quote(self.details.get('data', '') if method.lower() == 'post' else ''))
+
+
+class K6Script(EscapedQuoteMixin, AbstractScript):
+
+    """Extended `AbstractScript` class for k6 JavaScript script code generation.
+    Fills code variables for the request from `k6_template`.
+    Overrides `_generate_begin` method to generate the scenario and the array of requests cycled through by the script,
+    a single request being a batch of one.
+    Overrides `_proxy` and `_generate_batch_begin` methods to generate k6 specific batch code.
+    """
+
+    __language__ = 'k6'
+    __extension__ = 'js'
+
+    def _proxy(self):
+        # k6 only reads the proxy from the environment.
+        if 'proxy_host' in self.details and 'proxy_port' in self.details:
+            return 'HTTP_PROXY={0} HTTPS_PROXY={0} '.format(
+                '%s:%s' % (self.details['proxy_host'], self.details['proxy_port']))
+        return ''
+
+    def _generate_begin(self):
+        code = self.code_begin.format(concurrency=1, proxy=self._proxy())
+        return code + self.code_batch_requests.format(requests=self._generate_batch_request(1))
+
+    def _generate_batch_begin(self, concurrency):
+        return self.code_batch_begin.format(concurrency=concurrency, proxy=self._proxy())
+
+
+class LocustScript(EscapedQuoteMixin, AbstractScript):
+
+    """Extended `AbstractScript` class for Locust script code generation.
+    Fills code variables for the request from `locust_template`.
+    Overrides `_generate_begin` method to generate the list of requests the tasks of the script are made of, a single
+    request being a batch of one.
+    Overrides `_generate_batch_begin` method to generate Locust specific batch code.
+    """
+
+    __language__ = 'locust'
+    __extension__ = 'py'
+
+    def _generate_begin(self):
+        code = self.code_begin.format(concurrency=1, proxy=self._proxy())
+        return code + self.code_batch_requests.format(requests=self._generate_batch_request(1))
+
+    def _generate_batch_begin(self, concurrency):
+        return self.code_batch_begin.format(concurrency=concurrency, proxy=self._proxy())
+
+
+class GoScript(AbstractScript):
+
+    """Extended `AbstractScript` class for Go program code generation, based on net/http.
+    Fills code variables for the request from `go_template`.
+    Overrides `_generate_begin` method to generate the slice of requests sent by the program, a single request being a
+    batch of one.
+    Overrides `_quote` and `_generate_batch_begin` methods to generate Go specific batch code.
+    Overrides `_output_fields` method to generate the Go code hashing the response bodies written to files.
+    """
+
+    __language__ = 'go'
+    __extension__ = 'go'
+
+    # Packages imported by every program.
+    PACKAGES = ('fmt', 'io', 'math', 'net/http', 'net/url', 'sort', 'strings', 'sync', 'time')
+
+    def _imports(self):
+        # Go refuses unused imports, the packages only needed by some scripts are only imported by them.
+        packages = set(self.PACKAGES)
+        if self.profile == 'fast':
+            packages.add('net')
+        if self.output_body:
+            packages.update(['os', 'path/filepath'])
+            if self.output_hash:
+                packages.update(['crypto/' + self.output_hash, 'encoding/hex'])
+        elif self.search:
+            packages.add('regexp')
+        return ''.join('\n\t"%s"' % package for package in sorted(packages))
+
+    def _output_fields(self):
+        fields = super(GoScript, self)._output_fields()
+        save = self.code_output_digest if self.output_hash else self.code_output_copy
+        fields['save'] = save.format(algorithm=self.output_hash)
+        return fields
+
+    def _generate_begin(self):
+        code = self.code_begin.format(concurrency=1, proxy=self._proxy(), imports=self._imports())
+        return code + self.code_batch_requests.format(requests=self._generate_batch_request(1))
+
+    def _quote(self, value):
+        value = value.replace('\\', '\\\\').replace('"', '\\"').replace('\t', '\\t')
+        return '"%s"' % value.replace('\r', '\\r').replace('\n', '\\n')
+
+    def _generate_batch_begin(self, concurrency):
+        return self.code_batch_begin.format(concurrency=concurrency, proxy=self._proxy(), imports=self._imports())
@@ -0,0 +1,256 @@
+"""
+
+:synopsis: Search the responses for many patterns at once, literal strings and regular expressions.
+
+The literal patterns are matched by a single Aho-Corasick automaton, scanning every byte once whatever the number of
+patterns, and the regular expressions are combined into a single alternation, each one captured by its own group so
+that every match is attributed to its pattern. The regular expressions the alternation would change the meaning of,
+referring to their groups by number or holding inline flags, are compiled on their own.
+
+"""
+
+import collections
+import re
+
+
+# Prefix of the lines of a pattern file holding a regular expression instead of a literal string.
+REGEX_PREFIX = 'regex:'
+# Longest regex match expected to span two chunks, the last bytes of every chunk being scanned again with the next one.
+OVERLAP = 4096
+# Regular expression never matching, standing for an empty set of patterns.
+NEVER = b'(?!)'
+
+# Numbered group references, conditional groups and inline flags, which a regex cannot hold to be combined with the
+# others. The escaped characters are matched too, `\\1` being no reference.
+re_uncombinable = re.compile(r'\\(?:[1-9]|.)|\(\?(?:[aiLmsux-]|\()')
+# Names of the groups capturing the regexes in the alternation.
+re_reserved_group = re.compile(r'\(\?P<_[0-9]+>')
+
+
+class AhoCorasick(object):
+
+    """Automaton matching many keywords in a single pass over the data, reporting every occurrence of each one.
+
+    ``goto`` holds the transitions of every state on the bytes, ``fail`` the state to fall back to when the next byte
+    has no transition, and ``output`` the keywords ending in every state. The state of the root is 0.
+    """
+
+    def __init__(self, keywords):
+        """
+        :param list keywords: Keywords, as byte strings.
+
+        :raises ValueError: When a keyword is empty.
+        """
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+        for index, keyword in enumerate(keywords):
+            if not keyword:
+                raise ValueError("Cannot search for an empty keyword.")
+            state = 0
+            for byte in bytearray(keyword):
+                following = self.goto[state].get(byte)
+                if following is None:
+                    following = len(self.goto)
+                    self.goto[state][byte] = following
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                state = following
+            self.output[state] += (index,)
+        # Breadth first, the failure link of a state pointing to a shallower one whose output is complete
+        queue = collections.deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for byte, following in self.goto[state].items():
+                queue.append(following)
+                fallback = self.fail[state]
+                while fallback and byte not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[following] = self.goto[fallback].get(byte, 0)
+                self.output[following] += self.output[self.fail[following]]
+        # From the root, the scan skips ahead to the next byte starting a keyword
+        self.starts = b'[' + b''.join(b'\\x%02x' % byte for byte in sorted(self.goto[0])) + b']' if keywords else NEVER
+        self._starts = re.compile(self.starts)
+
+    def scan(self, data, state=0):
+        """Scan data, from the state reached at the end of the previous data, if any.
+
+        :param bytes data: Data to scan.
+        :param int state: State of the automaton at the start of the data.
+
+        :return: A tuple of the state at the end of the data, and the list of tuples of the index of every keyword
+            found and the offset of its end in the data.
+        :rtype: tuple
+        """
+        goto, fail, output, starts = self.goto, self.fail, self.output, self._starts
+        data = bytearray(data)
+        found = []
+        position = 0
+        while position < len(data):
+            if not state:
+                start = starts.search(data, position)
+                if start is None:
+                    break
+                position = start.start()
+            byte = data[position]
+            while state and byte not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(byte, 0)
+            position += 1
+            for index in output[state]:
+                found.append((index, position))
+        return state, found
+
+
+class SearchPatterns(object):
+
+    """Literal strings and regular expressions searched for in the responses, matched at once.
+
+    The patterns are the lines of a pattern file, the regular expressions being prefixed by :data:`REGEX_PREFIX`.
+    Every occurrence of the literal patterns is found, while a single regex match of the alternation is found at a
+    position, the one of the first regex matching there. The regexes compiled on their own are matched independently.
+    """
+
+    def __init__(self, patterns):
+        """
+        :param list patterns: Patterns, in the format of the lines of a pattern file. Duplicates are ignored.
+
+        :raises ValueError: When there is no pattern, or a regex is invalid or names a group like the ones of the
+            alternation.
+        """
+        self.patterns = []
+        for pattern in patterns:
+            if pattern not in self.patterns:
+                self.patterns.append(pattern)
+        if not self.patterns:
+            raise ValueError("No pattern to search for.")
+        # Index of the pattern of every keyword of the automaton
+        self.literals = []
+        regexes = []
+        # Indexes of the patterns and sources of the regexes compiled on their own
+        self.regexes = []
+        for index, pattern in enumerate(self.patterns):
+            if not pattern.startswith(REGEX_PREFIX):
+                self.literals.append(index)
+                continue
+            source = pattern[len(REGEX_PREFIX):]
+            try:
+                re.compile(source.encode('utf-8'))
+            except re.error as error:
+                raise ValueError("Invalid regex '%s': %s." % (source, error))
+            if re_reserved_group.search(source):
+                raise ValueError("Invalid regex '%s': the group names made of '_' and digits are reserved." % source)
+            if any(token[0] == '(' or token[1].isdigit() for token in re_uncombinable.findall(source)):
+                self.regexes.append((index, source.encode('utf-8')))
+            else:
+                regexes.append('(?P<_%d>%s)' % (index, source))
+        self.automaton = AhoCorasick([self.patterns[index].encode('utf-8') for index in self.literals])
+        self.regex = '|'.join(regexes).encode('utf-8') if regexes else NEVER
+        try:
+            self._regex = re.compile(self.regex)
+        except re.error as error:
+            # Like a group name used by two regexes
+            raise ValueError("The regexes cannot be combined: %s." % error)
+        self._regexes = [(index, re.compile(source)) for index, source in self.regexes]
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def scanner(self, first_match=False):
+        """Return a new :class:`PatternScanner`, to scan a response.
+
+        :param bool first_match: Whether the scanner stops at the first match.
+        """
+        return PatternScanner(self, first_match)
+
+    def tables(self):
+        """Return the tables of the matcher, for the scripts to embed it instead of building it.
+
+        :return: A dictionary of the `patterns`, the `goto`, `fail` and `output` tables of the automaton, the last
+            one holding the indexes of the patterns, the sources of the regexes of the bytes starting a literal
+            (`starts`) and of the alternation of the regexes (`regex`), whose groups are named after the index of
+            their pattern prefixed by an underscore, and the tuples of the index of the pattern and the source of the
+            regexes compiled on their own (`regexes`).
+        :rtype: dict
+        """
+        return {
+            'patterns': self.patterns,
+            'goto': self.automaton.goto,
+            'fail': self.automaton.fail,
+            'output': [tuple(self.literals[keyword] for keyword in keywords) for keywords in self.automaton.output],
+            'starts': self.automaton.starts,
+            'regex': self.regex,
+            'regexes': self.regexes}
+
+
+class PatternScanner(object):
+
+    """Search a response for :class:`SearchPatterns`, chunk by chunk, counting the hits of every pattern.
+
+    The literal patterns are found whatever the chunks they span, the regex matches spanning two chunks as long as they
+    are shorter than :data:`OVERLAP`.
+    """
+
+    def __init__(self, patterns, first_match=False):
+        """
+        :param patterns: :class:`SearchPatterns` to search for.
+        :param bool first_match: Whether the scan stops at the first match.
+        """
+        self.patterns = patterns
+        self.first_match = first_match
+        self.state = 0
+        self.tail = b''
+        self.hits = collections.Counter()
+
+    def feed(self, chunk):
+        """Scan the next chunk of the response.
+
+        :param bytes chunk: Chunk of the response.
+
+        :return: Tuples of the pattern and the bytes of every match ending in the chunk, in the order of their ends,
+            only the first one when stopping at the first match.
+        :rtype: list
+        """
+        patterns = self.patterns
+        found = []
+        if patterns.literals:
+            self.state, keywords = patterns.automaton.scan(chunk, self.state)
+            for keyword, end in keywords:
+                pattern = patterns.patterns[patterns.literals[keyword]]
+                found.append((end, pattern, pattern.encode('utf-8')))
+        if patterns.regex != NEVER or patterns.regexes:
+            data = self.tail + chunk
+            for index, regex in [(None, patterns._regex)] + patterns._regexes:
+                for match in regex.finditer(data):
+                    # Matches ending in the tail were already found in the previous chunk
+                    if match.end() > len(self.tail):
+                        pattern = patterns.patterns[int(match.lastgroup[1:]) if index is None else index]
+                        found.append((match.end() - len(self.tail), pattern, match.group(0)))
+            self.tail = data[-OVERLAP:]
+        found.sort(key=lambda item: item[0])
+        if self.first_match:
+            del found[1:]
+        self.hits.update(pattern for _, pattern, _ in found)
+        return [(pattern, match) for _, pattern, match in found]
+
+
+def load_patterns(pattern_file):
+    """Read the patterns of a pattern file, one per line.
+
+    The lines prefixed by :data:`REGEX_PREFIX` hold regular expressions, the others literal strings. Blank lines and
+    lines starting with ``#`` are skipped.
+
+    :param pattern_file: Opened pattern file.
+
+    :raises ValueError: When there is no pattern, or a regex is invalid.
+
+    :return: The patterns of the file.
+    :rtype: :class:`SearchPatterns`
+    """
+    patterns = []
+    for line in pattern_file:
+        line = line.rstrip('\r\n')
+        if line.strip() and not line.startswith('#'):
+            patterns.append(line)
+    return SearchPatterns(patterns)
@@ -0,0 +1,264 @@
+"""
+
+:synopsis: Columnar, memory-mapped store of parsed requests.
+
+A store file is made of a fixed size header, a heap of the strings, then the columns::
+
+    header | heap | string offsets | method | Host | path | protocol | version | pre_scheme | data
+           | headers start | headers
+
+Each column of a request field holds one string id per request, ``headers start`` holds the index of the first header
+of each request in the ``headers`` column (plus a final entry) and ``string offsets`` holds the position of each
+string in the heap (plus a final entry). All the integers are little-endian so any request can be read in O(1) from
+the memory-mapped file.
+
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+
+
+# Parsed request fields kept in the store, in the order of their columns.
+STORE_FIELDS = ('method', 'Host', 'path', 'protocol', 'version', 'pre_scheme', 'data')
+# Fields with few distinct values across a corpus, deduplicated in the heap like the header lines. The paths and the
+# bodies are mostly unique, remembering them would grow with the corpus.
+DEDUPLICATED_FIELDS = ('method', 'Host', 'protocol', 'version', 'pre_scheme')
+# Default bound of the strings remembered by :class:`CorpusStoreWriter` to deduplicate them.
+MAX_STRINGS = 65536
+
+_MAGIC = b'HRTSTORE'
+_VERSION = 1
+# magic, version, number of requests, number of headers, number of strings, heap size.
+_HEADER = struct.Struct('<8sIIIIQ')
+_ID = struct.Struct('<I')
+_OFFSET = struct.Struct('<Q')
+_OFFSETS_PAIR = struct.Struct('<QQ')
+
+
+def _offsets_array():
+    """Return an empty array of unsigned 64 bits integers."""
+    try:
+        return array('Q')
+    except ValueError:  # Python 2 has no 'Q' typecode, 'L' is 64 bits wide on LP64 platforms.
+        offsets = array('L')
+        if offsets.itemsize != _OFFSET.size:
+            raise
+        return offsets
+
+
+def _tofile(column, fp):
+    """Write an array to `fp` in little-endian byte order."""
+    if sys.byteorder != 'little':
+        column = array(column.typecode, column)
+        column.byteswap()
+    try:
+        fp.write(column.tobytes())
+    except AttributeError:  # Python 2
+        fp.write(column.tostring())
+
+
+class CorpusStoreWriter(object):
+
+    """Serialize parsed requests into a store file.
+
+    Strings are streamed to the heap as soon as they are seen. The integer columns are kept in memory until
+    :meth:`close` writes them, along with at most `max_strings` strings of :data:`DEDUPLICATED_FIELDS` and of the
+    headers, which are only written once to the heap. The other strings are written again each time.
+    """
+
+    def __init__(self, path, max_strings=MAX_STRINGS):
+        """Create the store file.
+
+        :param str path: Path of the store file, overwritten if it exists.
+        :param int max_strings: Maximum number of distinct strings remembered to deduplicate them.
+
+        :raises OSError, IOError: When the file cannot be created.
+        """
+        self.path = path
+        self.max_strings = max_strings
+        self._fp = open(path, 'wb')
+        self._fp.write(b'\0' * _HEADER.size)
+        self._ids = {}
+        self._offsets = _offsets_array()
+        self._offsets.append(0)
+        self._columns = dict((field, array('I')) for field in STORE_FIELDS)
+        self._headers_start = array('I', [0])
+        self._headers = array('I')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self._headers_start) - 1
+
+    def _string_id(self, value, deduplicate=True):
+        """Return the id of `value` in the heap, appending it first if it is not remembered.
+
+        The appended string is remembered when `deduplicate` is set, until `max_strings` strings are.
+        """
+        try:
+            return self._ids[value]
+        except KeyError:
+            pass
+        encoded = value.encode('utf-8')
+        self._fp.write(encoded)
+        self._offsets.append(self._offsets[-1] + len(encoded))
+        string_id = len(self._offsets) - 2
+        if deduplicate and len(self._ids) < self.max_strings:
+            self._ids[value] = string_id
+        return string_id
+
+    def add(self, headers, details):
+        """Append a parsed request to the store.
+
+        :param list headers: Headers list containing lines like 'Host: google.com'.
+        :param dict details: Request specific details dictionary. Only the fields of :data:`STORE_FIELDS` are kept.
+
+        :return: Index of the request in the store.
+        :rtype: int
+        """
+        for field in STORE_FIELDS:
+            self._columns[field].append(self._string_id(details.get(field, ''), field in DEDUPLICATED_FIELDS))
+        for header in headers:
+            self._headers.append(self._string_id(header))
+        self._headers_start.append(len(self._headers))
+        return len(self) - 1
+
+    def close(self):
+        """Write the columns and the header, then close the store file."""
+        if self._fp.closed:
+            return
+        _tofile(self._offsets, self._fp)
+        for field in STORE_FIELDS:
+            _tofile(self._columns[field], self._fp)
+        _tofile(self._headers_start, self._fp)
+        _tofile(self._headers, self._fp)
+        self._fp.seek(0)
+        self._fp.write(_HEADER.pack(
+            _MAGIC, _VERSION, len(self), len(self._headers), len(self._offsets) - 1, self._offsets[-1]))
+        self._fp.close()
+
+
+def write_store(path, parsed_requests):
+    """Serialize parsed requests into a store file.
+
+    :param str path: Path of the store file, overwritten if it exists.
+    :param iterable parsed_requests: Tuples of headers and details (e.g. from :meth:`CorpusStore.__iter__`).
+
+    :raises OSError, IOError: When the file cannot be created.
+
+    :return: Number of requests written.
+    :rtype: int
+    """
+    with CorpusStoreWriter(path) as writer:
+        for headers, details in parsed_requests:
+            writer.add(headers, details)
+    return len(writer)
+
+
+class CorpusStore(object):
+
+    """Read-only, memory-mapped access to the requests of a store file."""
+
+    def __init__(self, path):
+        """Map the store file in memory.
+
+        :param str path: Path of the store file.
+
+        :raises OSError, IOError: When the file cannot be opened.
+        :raises ValueError: When the file is not a valid store.
+        """
+        self.path = path
+        with open(path, 'rb') as fp:
+            try:
+                self._map = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty file.
+                raise ValueError("'%s' is not a valid request store." % path)
+        try:
+            magic, version, self._count, headers_count, strings_count, heap_size = _HEADER.unpack_from(self._map)
+        except struct.error:
+            magic = version = None
+        if magic != _MAGIC or version != _VERSION:
+            self._map.close()
+            raise ValueError("'%s' is not a valid request store." % path)
+        self._heap = _HEADER.size
+        self._string_offsets = self._heap + heap_size
+        position = self._string_offsets + (strings_count + 1) * _OFFSET.size
+        self._columns = {}
+        for field in STORE_FIELDS:
+            self._columns[field] = position
+            position += self._count * _ID.size
+        self._headers_start = position
+        self._headers = position + (self._count + 1) * _ID.size
+        if self._headers + headers_count * _ID.size > len(self._map):
+            self._map.close()
+            raise ValueError("'%s' is a truncated request store." % self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def __getitem__(self, index):
+        """Load a request from the store.
+
+        :param int index: Index of the request, negative values count from the end.
+
+        :raises IndexError: When `index` is out of range.
+
+        :return: A tuple of the headers list and the details dictionary of the request.
+        :rtype: tuple
+        """
+        index = self._check_index(index)
+        details = dict((field, self._field(index, field)) for field in STORE_FIELDS)
+        start, end = self._id(self._headers_start, index), self._id(self._headers_start, index + 1)
+        headers = [self._string(self._id(self._headers, position)) for position in range(start, end)]
+        return headers, details
+
+    def _check_index(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Request index out of range.")
+        return index
+
+    def _id(self, column, index):
+        return _ID.unpack_from(self._map, column + index * _ID.size)[0]
+
+    def _string(self, string_id):
+        start, end = _OFFSETS_PAIR.unpack_from(self._map, self._string_offsets + string_id * _OFFSET.size)
+        return self._map[self._heap + start:self._heap + end].decode('utf-8')
+
+    def _field(self, index, field):
+        return self._string(self._id(self._columns[field], index))
+
+    def get_field(self, index, field):
+        """Load a single field of a request, without loading the rest of it.
+
+        :param int index: Index of the request, negative values count from the end.
+        :param str field: One of :data:`STORE_FIELDS`.
+
+        :raises IndexError: When `index` is out of range.
+        :raises KeyError: When `field` is not stored.
+
+        :return: Value of the field.
+        :rtype: str
+        """
+        return self._field(self._check_index(index), field)
+
+    def close(self):
+        """Unmap the store file."""
+        self._map.close()
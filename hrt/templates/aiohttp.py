@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+# Value of PROXY when no proxy is set.
+code_proxy_none = 'None'
+
+code_begin = """#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import hashlib
+import os
+import re
+
+import aiohttp
+
+CONCURRENCY = {concurrency}
+PROXY = {proxy}
+"""
+
+
+code_batch_begin = code_begin
+
+
+code_batch_requests = """REQUESTS = [{requests}
+]
+
+
+def requests():
+    return REQUESTS
+"""
+
+
+code_batch_request = """
+    ({method}, {url}, [{headers}], {data}),"""
+
+
+code_batch_header = """({name}, {value})"""
+
+
+# Sends the requests over the connections of a single session. Free of braces, it is used as is or formatted.
+_code_replay = """
+
+async def fetch(session, semaphore, method, url, headers, data):
+    # The semaphore bounds the number of requests in flight
+    async with semaphore:
+        try:
+            async with session.request(method, url, headers=headers, data=data or None, proxy=PROXY) as response:
+                body = bytearray()
+                # Streams the body by chunks instead of reading it at once
+                async for chunk in response.content.iter_chunked(65536):
+                    body.extend(chunk)
+                return method, url, response.status, bytes(body), None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            return method, url, None, b'', error
+
+
+async def replay(requests, concurrency=CONCURRENCY):
+    # The connector pool of the shared session keeps the connections alive between the requests
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [fetch(session, semaphore, *request) for request in requests]
+        for task in asyncio.as_completed(tasks):
+            yield await task
+
+"""
+
+
+_code_main_nosearch = """
+async def main():
+    async for method, url, status, body, error in replay(requests()):
+        if error is not None:
+            print(method, url, 'An error occurred: ', error)
+            continue
+        print(method, url, status)
+        print(body.decode('iso-8859-1'))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
+"""
+
+
+_code_main_search = """
+STOP_AT_FIRST_MATCH = {first_match}
+
+
+async def main():
+    async for method, url, status, body, error in replay(requests()):
+        if error is not None:
+            print(method, url, 'An error occurred: ', error)
+            continue
+        print(method, url, status)
+        response = body.decode('iso-8859-1')
+        for item in re.findall(r"{search_string}", response):
+            print("Matched item: ", item)
+            if STOP_AT_FIRST_MATCH:
+                break
+        print(response)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
+"""
+
+
+# Writes the bodies into their own files of a directory instead of keeping them in memory, hashed on the fly.
+_code_replay_output = _code_replay.replace("""
+async def fetch(session, semaphore, method, url, headers, data):""", """
+async def fetch(session, semaphore, number, method, url, headers, data):""").replace("""
+                body = bytearray()
+                # Streams the body by chunks instead of reading it at once
+                async for chunk in response.content.iter_chunked(65536):
+                    body.extend(chunk)
+                return method, url, response.status, bytes(body), None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            return method, url, None, b'', error""", """
+                digest = hashlib.new(OUTPUT_HASH) if OUTPUT_HASH else None
+                # Streams the body into its file by chunks instead of reading it at once
+                with open(os.path.join(OUTPUT_BODY, 'response-%d' % number), 'wb') as body:
+                    async for chunk in response.content.iter_chunked(65536):
+                        body.write(chunk)
+                        if digest:
+                            digest.update(chunk)
+                return method, url, response.status, digest.hexdigest() if digest else '', None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            return method, url, None, '', error""").replace("""
+        tasks = [fetch(session, semaphore, *request) for request in requests]""", """
+        tasks = [fetch(session, semaphore, number, *request) for number, request in enumerate(requests, 1)]""")
+
+
+_code_main_output = """
+OUTPUT_BODY = {path}
+OUTPUT_HASH = {algorithm}
+
+
+async def main():
+    os.makedirs(OUTPUT_BODY, exist_ok=True)
+    async for method, url, status, digest, error in replay(requests()):
+        if error is not None:
+            print(method, url, 'An error occurred: ', error)
+            continue
+        print(method, url, status, digest)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
+"""
+
+
+code_search = _code_replay + _code_main_search
+
+
+code_nosearch = _code_replay + _code_main_nosearch
+
+
+code_batch_search = code_search
+
+
+code_batch_nosearch = code_nosearch
+
+
+code_output = _code_replay_output + _code_main_output
+
+
+code_batch_output = code_output
+
+
+code_loop_begin = """#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import hashlib
+import os
+import re
+
+import aiohttp
+
+URL = {url}
+HEADERS = [{headers}
+]
+DATA = {data}
+"""
+
+
+code_loop_header = """
+    ({name}, {value}),"""
+
+
+code_loop_rows = """ROWS = [{rows}
+]
+
+
+def rows():
+    return ROWS
+"""
+
+
+code_loop_row = """
+    [{values}],"""
+
+
+code_loop_payloads = """PAYLOADS = {payloads}
+
+
+def rows():
+    # Streams the payloads of the file, one per line
+    with open(PAYLOADS, 'rb') as payloads:
+        for line in payloads:
+            yield [line.rstrip(b'\\r\\n').decode('utf-8')]
+"""
+
+
+code_loop_main = """
+CONCURRENCY = 10
+PROXY = {proxy}
+
+
+def fill(template, row):
+    # Replaces the markers of the template by the values of the row
+    for index, value in enumerate(row):
+        template = template.replace('§%d§' % index, value)
+    return template
+"""
+
+
+code_loop_post = """
+        data = fill(DATA, row)"""
+
+
+_code_loop_requests = """
+
+def requests():
+    for row in rows():
+        headers = [(fill(name, row), fill(value, row)) for name, value in HEADERS]
+        data = ''{post}
+        yield '{method}', fill(URL, row), headers, data
+"""
+
+
+code_loop_search = _code_loop_requests + _code_replay + _code_main_search
+
+
+code_loop_nosearch = _code_loop_requests + _code_replay + _code_main_nosearch
+
+
+code_loop_output = _code_loop_requests + _code_replay_output + _code_main_output
+
+
+# The fast profile bounds the time spent on each request. aiohttp already requests compressed responses and
+# decompresses them, and keeps its connections alive.
+_code_session = """
+    async with aiohttp.ClientSession(connector=connector) as session:"""
+
+
+_code_fast_session = """
+    timeout = aiohttp.ClientTimeout(total=30, connect=10)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:"""
+
+
+code_fast_search = code_search.replace(_code_session, _code_fast_session)
+
+
+code_fast_nosearch = code_nosearch.replace(_code_session, _code_fast_session)
+
+
+code_fast_batch_search = code_batch_search.replace(_code_session, _code_fast_session)
+
+
+code_fast_batch_nosearch = code_batch_nosearch.replace(_code_session, _code_fast_session)
+
+
+code_fast_loop_search = code_loop_search.replace(_code_session, _code_fast_session)
+
+
+code_fast_loop_nosearch = code_loop_nosearch.replace(_code_session, _code_fast_session)
+
+
+code_fast_output = code_output.replace(_code_session, _code_fast_session)
+
+
+code_fast_batch_output = code_batch_output.replace(_code_session, _code_fast_session)
+
+
+code_fast_loop_output = code_loop_output.replace(_code_session, _code_fast_session)
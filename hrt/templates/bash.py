@@ -1,3 +1,4 @@
+# -*- coding: utf-8 -*-
 code_begin = """#!/usr/bin/env bash
 curl"""
 
@@ -8,10 +9,326 @@ code_header = """ --header "{header}:{value}" """
 code_proxy = " -x {proxy}"
 
 
+# Connects to the Unix socket or to the address instead of the host of the URL, which is kept along with the Host
+# header.
+code_unix_socket = " --unix-socket {path}"
+
+
+code_connect_to = " --connect-to ::{host}:{port}"
+
+
 code_post = """ --data "{data}" """
 
 
 code_search = """ | egrep --color " {search_string} |$" """
 
 
+# Stops at the first match, curl failing to write the rest of the response once grep exited.
+code_search_first = """ | grep -E --color --max-count 1 -- "{search_string}" """
+
+
 code_nosearch = """ -v --request {method} {url} {headers} --include"""
+
+
+# Writes the response body into its own file of a directory instead of printing it along with the headers.
+code_output = """ --create-dirs --output {path}/response-1"""
+
+
+# Hashes the body once written, curl not hashing it on the fly.
+code_output_hash = """ && {algorithm}sum {path}/response-1"""
+
+
+code_loop_begin = """#!/usr/bin/env bash
+url={url}
+headers=({headers}
+)
+data={data}
+"""
+
+
+code_loop_header = """
+    {header}"""
+
+
+code_loop_rows = """width={width}
+values=({rows}
+)
+
+rows() {{
+    printf '%s\\0' "${{values[@]}}"
+}}
+"""
+
+
+code_loop_row = """
+    {values}"""
+
+
+code_loop_payloads = """width=1
+payloads={payloads}
+
+# Streams the payloads of the file, one per line
+rows() {{
+    while IFS= read -r payload || [ -n "$payload" ]; do
+        printf '%s\\0' "${{payload%$'\\r'}}"
+    done < "$payloads"
+}}
+"""
+
+
+code_loop_main = """
+# Percent-encodes $1 into $encoded, keeping the reserved characters and the bytes already encoded
+encode() {{
+    local LC_ALL=C
+    local index char
+    encoded=
+    for ((index = 0; index < ${{#1}}; index++)); do
+        char=${{1:index:1}}
+        case $char in
+            [-a-zA-Z0-9._~!\\$\\&\\'\\(\\)\\*+,/:\\;=?@%\\[\\]]) encoded+=$char ;;
+            *) printf -v char '%%%02X' "'$char"; encoded+=$char ;;
+        esac
+    done
+}}
+
+# Replaces the markers of $1 by the values of the current row, percent-encoded if $2 is set, and quotes it for curl,
+# into $filled
+fill() {{
+    filled=$1
+    local index value
+    for ((index = 0; index < ${{#row[@]}}; index++)); do
+        value=${{row[index]}}
+        if [ -n "$2" ]; then
+            encode "$value"
+            value=$encoded
+        fi
+        filled=${{filled//"§$index§"/"$value"}}
+    done
+    filled=${{filled//\\\\/\\\\\\\\}}
+    filled=${{filled//\\"/\\\\\\"}}
+    filled=${{filled//$'\\t'/\\\\t}}
+    filled=${{filled//$'\\r'/\\\\r}}
+    filled=${{filled//$'\\n'/\\\\n}}
+}}
+"""
+
+
+code_loop_proxy = """
+proxy='{proxy}'
+"""
+
+
+code_loop_unix_socket = """
+unix_socket={path}
+"""
+
+
+code_loop_connect_to = """
+connect_to='::{host}:{port}'
+"""
+
+
+code_loop_post = """
+    fill "$data"
+    echo "data-raw = \\"$filled\\"\""""
+
+
+code_loop_nosearch = """
+# Every request is written to the config of a single curl process, which keeps the connection alive between them
+row=()
+while IFS= read -r -d '' value; do
+    row+=("$value")
+    if ((${{#row[@]}} < width)); then
+        continue
+    fi
+    if [ -n "$started" ]; then
+        echo "next"
+    fi
+    started=1
+    fill "$url" encode
+    echo "url = \\"$filled\\""
+    echo "request = {method}"
+    for header in "${{headers[@]}}"; do
+        fill "$header"
+        echo "header = \\"$filled\\""
+    done{post}
+    if [ -n "$proxy" ]; then
+        echo "proxy = \\"$proxy\\""
+    fi
+    if [ -n "$unix_socket" ]; then
+        fill "$unix_socket"
+        echo "unix-socket = \\"$filled\\""
+    fi
+    if [ -n "$connect_to" ]; then
+        echo "connect-to = \\"$connect_to\\""
+    fi{timings}
+    echo "verbose"
+    echo "include"
+    row=()
+done < <(rows) | curl --config -"""
+
+
+_code_loop_include = """
+    echo "include"
+"""
+
+
+_code_loop_output = """
+    count=$((count + 1))
+    echo "create-dirs"
+    echo "output = \\"$output/response-$count\\""
+"""
+
+
+_code_output_hash = """
+# Hashes the bodies once written, curl not hashing them on the fly
+if [ -n "$hash" ]; then
+    "${{hash}}sum" {files}
+fi
+"""
+
+
+code_loop_output = """
+output={path}
+hash={algorithm}
+""" + code_loop_nosearch.replace(_code_loop_include, _code_loop_output) + _code_output_hash.replace(
+    '{files}', '"$output"/response-*')
+
+
+# Stops at the first match of every response. grep exiting at the first match of the output of curl would stop the
+# requests left along with it, every response is saved into its own file and searched on its own once received.
+code_loop_search_first = """
+output=$(mktemp -d)
+trap 'rm -rf "$output"' EXIT
+""" + code_loop_nosearch.replace(_code_loop_include, _code_loop_include + _code_loop_output.lstrip('\n')) + """
+(cd "$output" && grep -E --color --max-count 1 -- "{search_string}" response-*)
+"""
+
+
+code_batch_begin = """#!/usr/bin/env bash
+concurrency={concurrency}
+# Every response is saved into its own file of this directory
+output=${{1:-{output}}}
+
+config=$(mktemp)
+trap 'rm -f "$config"' EXIT
+# Every request is a section of the config of a single curl process
+cat > "$config" <<'CONFIG'
+"""
+
+
+code_batch_requests = """{requests}CONFIG
+"""
+
+
+code_batch_request = """url = {url}
+request = {method}
+{headers}{data}{connection}output = "response-{index}"
+include
+write-out = "response-{index} %{{http_code}} {method} %{{url_effective}}\\n{timings}"
+"""
+
+
+code_batch_next = """next
+"""
+
+
+code_batch_header = """header = {header}
+"""
+
+
+code_batch_post = """data-raw = {data}
+"""
+
+
+code_batch_unix_socket = """unix-socket = {path}
+"""
+
+
+code_batch_connect_to = """connect-to = "::{host}:{port}"
+"""
+
+
+code_batch_main = """
+mkdir -p "$output" && cd "$output" || exit 1
+"""
+
+
+code_batch_proxy = """export http_proxy='{proxy}' https_proxy='{proxy}'
+"""
+
+
+code_batch_search = """# Sends every request concurrently over reused connections
+curl --no-progress-meter --parallel --parallel-max "$concurrency" --config "$config"
+# Searches the saved responses
+grep -E --color -- "{search_string}" response-*
+"""
+
+
+# Stops at the first match of every response, grep counting the matches of every file on its own.
+code_batch_search_first = code_batch_search.replace(' --color ', ' --color --max-count 1 ')
+
+
+code_batch_nosearch = """# Sends every request concurrently over reused connections
+curl --no-progress-meter --parallel --parallel-max "$concurrency" --config "$config"
+"""
+
+
+code_batch_output = code_batch_nosearch + """hash={algorithm}""" + _code_output_hash.replace('{files}', 'response-*')
+
+
+# Reports the phases of a transfer, in seconds since its start, and the bytes transferred, as a single JSON line
+# written out by curl.
+_code_write_out = (
+    '{"url":"%{url_effective}","status":%{http_code},"dns":%{time_namelookup},"connect":%{time_connect},'
+    '"tls":%{time_appconnect},"ttfb":%{time_starttransfer},"total":%{time_total},"downloaded":%{size_download},'
+    '"uploaded":%{size_upload}}')
+
+
+code_timings = """ --write-out '\\n""" + _code_write_out + """\\n'"""
+
+
+code_loop_timings = """
+    echo 'write-out = "\\n""" + _code_write_out.replace('"', '\\"') + """\\n"'"""
+
+
+code_batch_timings = _code_write_out.replace('"', '\\"') + """\\n"""
+
+
+# The fast profile replaces the verbosity of the scripts by throughput oriented options. curl requests compressed
+# responses and decompresses them, and attempts HTTP/2 over TLS by default since its 7.62.0 version.
+code_fast_nosearch = code_nosearch.replace(
+    ' -v ', ' --silent --show-error --compressed --keepalive-time 60 --connect-timeout 10 --max-time 30 ')
+
+
+_code_loop_verbose = """
+    echo "verbose"
+"""
+
+
+_code_loop_fast = """
+    echo "silent"
+    echo "show-error"
+    echo "compressed"
+    echo "keepalive-time = 60"
+    echo "connect-timeout = 10"
+    echo "max-time = 30"
+"""
+
+
+code_fast_loop_nosearch = code_loop_nosearch.replace(_code_loop_verbose, _code_loop_fast)
+
+
+code_fast_loop_output = code_loop_output.replace(_code_loop_verbose, _code_loop_fast)
+
+
+code_fast_loop_search_first = code_loop_search_first.replace(_code_loop_verbose, _code_loop_fast)
+
+
+code_fast_batch_request = code_batch_request.replace("""include
+""", """include
+compressed
+keepalive-time = 60
+connect-timeout = 10
+max-time = 30
+""")
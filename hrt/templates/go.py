@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+# Value of PROXY when no proxy is set.
+code_proxy_none = '""'
+
+code_begin = """// Usage: go run <this program>
+package main
+
+import ({imports}
+)
+
+const concurrency = {concurrency}
+
+// Proxy the requests are sent through, if not empty
+const proxy = {proxy}
+
+type request struct {{
+	method  string
+	url     string
+	headers [][2]string
+	data    string
+}}
+"""
+
+
+code_batch_begin = code_begin
+
+
+code_batch_requests = """
+var requests = []request{{{requests}
+}}
+"""
+
+
+code_batch_request = """
+	{{{method}, {url}, [][2]string{{{headers}}}, {data}}},"""
+
+
+code_batch_header = """{{{name}, {value}}}"""
+
+
+_code_replay = """
+type result struct {{
+	request request
+	status  string
+	body    []byte
+	err     error
+	latency time.Duration
+}}
+
+func send(client *http.Client, request request) result {{
+	var data io.Reader
+	if request.data != "" {{
+		data = strings.NewReader(request.data)
+	}}
+	message, err := http.NewRequest(request.method, request.url, data)
+	if err != nil {{
+		return result{{request: request, err: err}}
+	}}
+	for _, header := range request.headers {{
+		if strings.EqualFold(header[0], "Host") {{
+			message.Host = header[1]
+			continue
+		}}
+		message.Header.Add(header[0], header[1])
+	}}
+	start := time.Now()
+	response, err := client.Do(message)
+	if err != nil {{
+		return result{{request: request, err: err, latency: time.Since(start)}}
+	}}
+	defer response.Body.Close()
+	// Reading the whole body lets the connection be reused
+	body, err := io.ReadAll(response.Body)
+	return result{{request, response.Status, body, err, time.Since(start)}}
+}}
+
+func replay() <-chan result {{
+	// A single transport keeps the connections alive and shares them between the workers
+	transport := &http.Transport{{
+		Proxy:               http.ProxyFromEnvironment,
+		ForceAttemptHTTP2:   true,
+		MaxIdleConns:        concurrency,
+		MaxIdleConnsPerHost: concurrency,
+		IdleConnTimeout:     90 * time.Second,
+	}}
+	if proxy != "" {{
+		address := proxy
+		if !strings.Contains(address, "://") {{
+			address = "http://" + address
+		}}
+		if proxyURL, err := url.Parse(address); err == nil {{
+			transport.Proxy = http.ProxyURL(proxyURL)
+		}}
+	}}
+	client := &http.Client{{Transport: transport}}
+	jobs := make(chan request)
+	results := make(chan result)
+	var workers sync.WaitGroup
+	for worker := 0; worker < concurrency; worker++ {{
+		workers.Add(1)
+		go func() {{
+			defer workers.Done()
+			for request := range jobs {{
+				results <- send(client, request)
+			}}
+		}}()
+	}}
+	go func() {{
+		for _, request := range requests {{
+			jobs <- request
+		}}
+		close(jobs)
+		workers.Wait()
+		close(results)
+	}}()
+	return results
+}}
+
+func printPercentiles(latencies []time.Duration) {{
+	if len(latencies) == 0 {{
+		return
+	}}
+	sort.Slice(latencies, func(i, j int) bool {{ return latencies[i] < latencies[j] }})
+	for _, percentile := range []float64{{50, 90, 99, 100}} {{
+		index := int(math.Ceil(percentile/100*float64(len(latencies)))) - 1
+		fmt.Printf("p%v latency: %v\\n", percentile, latencies[index])
+	}}
+}}
+"""
+
+
+_code_main_nosearch = """
+func main() {{
+	latencies := make([]time.Duration, 0, len(requests))
+	for result := range replay() {{
+		latencies = append(latencies, result.latency)
+		if result.err != nil {{
+			fmt.Println(result.request.method, result.request.url, "An error occurred: ", result.err)
+			continue
+		}}
+		fmt.Println(result.request.method, result.request.url, result.status)
+		fmt.Println(string(result.body))
+	}}
+	printPercentiles(latencies)
+}}
+"""
+
+
+_code_main_search = """
+var search = regexp.MustCompile(`{search_string}`)
+var stopAtFirstMatch = {first_match}
+
+func main() {{
+	latencies := make([]time.Duration, 0, len(requests))
+	for result := range replay() {{
+		latencies = append(latencies, result.latency)
+		if result.err != nil {{
+			fmt.Println(result.request.method, result.request.url, "An error occurred: ", result.err)
+			continue
+		}}
+		fmt.Println(result.request.method, result.request.url, result.status)
+		for _, item := range search.FindAll(result.body, -1) {{
+			fmt.Println("Matched item: ", string(item))
+			if stopAtFirstMatch {{
+				break
+			}}
+		}}
+		fmt.Println(string(result.body))
+	}}
+	printPercentiles(latencies)
+}}
+"""
+
+
+code_search = _code_replay + _code_main_search
+
+
+code_nosearch = (_code_replay + _code_main_nosearch).format()
+
+
+code_batch_search = code_search
+
+
+code_batch_nosearch = _code_replay + _code_main_nosearch
+
+
+def _stream_bodies(replay):
+    # Streams the bodies into their own files instead of reading them in memory, each worker sending a request by index.
+    return replay.replace("""
+	body    []byte
+""", """
+	digest  string
+""").replace("""
+func send(client *http.Client, request request) result {{""", """
+func send(client *http.Client, number int, request request) result {{""").replace("""
+	// Reading the whole body lets the connection be reused
+	body, err := io.ReadAll(response.Body)
+	return result{{request, response.Status, body, err, time.Since(start)}}""", """
+	// Reading the whole body lets the connection be reused
+	digest, err := save(response.Body, fmt.Sprintf("response-%d", number))
+	return result{{request, response.Status, digest, err, time.Since(start)}}""").replace("""
+	jobs := make(chan request)""", """
+	jobs := make(chan int)""").replace("""
+			for request := range jobs {{
+				results <- send(client, request)""", """
+			for index := range jobs {{
+				results <- send(client, index+1, requests[index])""").replace("""
+		for _, request := range requests {{
+			jobs <- request""", """
+		for index := range requests {{
+			jobs <- index""")
+
+
+_code_main_output = """
+// Directory the bodies of the responses are written into
+const outputBody = {path}
+
+// Writes a body into its own file of outputBody in chunks of a fixed size, returns its hash if computed
+func save(body io.Reader, name string) (string, error) {{
+	file, err := os.Create(filepath.Join(outputBody, name))
+	if err != nil {{
+		return "", err
+	}}
+	defer file.Close()
+	buffer := make([]byte, 65536){save}
+}}
+
+func main() {{
+	if err := os.MkdirAll(outputBody, 0755); err != nil {{
+		fmt.Println("An error occurred: ", err)
+		return
+	}}
+	latencies := make([]time.Duration, 0, len(requests))
+	for result := range replay() {{
+		latencies = append(latencies, result.latency)
+		if result.err != nil {{
+			fmt.Println(result.request.method, result.request.url, "An error occurred: ", result.err)
+			continue
+		}}
+		fmt.Println(result.request.method, result.request.url, result.status, result.digest)
+	}}
+	printPercentiles(latencies)
+}}
+"""
+
+
+# Bodies of save, without or with the hash of the body, formatted with the name of its package.
+code_output_copy = """
+	// Hides the ReadFrom method of the file, which would not use the buffer
+	_, err = io.CopyBuffer(struct{{ io.Writer }}{{file}}, body, buffer)
+	return "", err"""
+
+
+code_output_digest = """
+	digest := {algorithm}.New()
+	if _, err := io.CopyBuffer(io.MultiWriter(file, digest), body, buffer); err != nil {{
+		return "", err
+	}}
+	return hex.EncodeToString(digest.Sum(nil)), nil"""
+
+
+code_output = _stream_bodies(_code_replay) + _code_main_output
+
+
+code_batch_output = code_output
+
+
+# The fast profile bounds the time spent on each request, and leaves the Accept-Encoding header to the transport, which
+# only decompresses the responses to the compressed requests it asked for itself.
+_code_fast_replay = _code_replay.replace("""		if strings.EqualFold(header[0], "Host") {{""", """\
+		if strings.EqualFold(header[0], "Accept-Encoding") {{
+			continue
+		}}
+		if strings.EqualFold(header[0], "Host") {{""").replace("""		Proxy:               http.ProxyFromEnvironment,
+""", """		Proxy:               http.ProxyFromEnvironment,
+		DialContext:         (&net.Dialer{{Timeout: 10 * time.Second, KeepAlive: 30 * time.Second}}).DialContext,
+""").replace("""	client := &http.Client{{Transport: transport}}""", """\
+	client := &http.Client{{Transport: transport, Timeout: 30 * time.Second}}""")
+
+
+code_fast_search = _code_fast_replay + _code_main_search
+
+
+code_fast_nosearch = (_code_fast_replay + _code_main_nosearch).format()
+
+
+code_fast_batch_search = code_fast_search
+
+
+code_fast_batch_nosearch = _code_fast_replay + _code_main_nosearch
+
+
+code_fast_output = _stream_bodies(_code_fast_replay) + _code_main_output
+
+
+code_fast_batch_output = code_fast_output
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+code_begin = """// Usage: {proxy}k6 run <this script>
+import http from 'k6/http';
+import {{ check }} from 'k6';
+
+export const options = {{
+  scenarios: {{
+    replay: {{
+      executor: 'constant-vus',
+      vus: {concurrency},
+      duration: '30s',
+    }},
+  }},
+}};
+"""
+
+
+code_batch_begin = code_begin
+
+
+code_batch_requests = """
+const REQUESTS = [{requests}
+];
+"""
+
+
+code_batch_request = """
+  {{method: {method}, url: {url}, headers: {{{headers}}}, body: {data}}},"""
+
+
+code_batch_header = """{name}: {value}"""
+
+
+_code_main_nosearch = """
+export default function () {{
+  // Every virtual user cycles through the requests, starting from its own offset
+  const request = REQUESTS[(__VU + __ITER) % REQUESTS.length];
+  http.request(request.method, request.url, request.body || null, {{ headers: request.headers }});
+}}
+"""
+
+
+_code_main_search = """
+const SEARCH = new RegExp("{search_string}");
+
+export default function () {{
+  // Every virtual user cycles through the requests, starting from its own offset
+  const request = REQUESTS[(__VU + __ITER) % REQUESTS.length];
+  const response = http.request(request.method, request.url, request.body || null, {{ headers: request.headers }});
+  check(response, {{
+    'response matches the search': (r) => SEARCH.test(r.body),
+  }});
+}}
+"""
+
+
+code_search = _code_main_search
+
+
+code_nosearch = _code_main_nosearch.format()
+
+
+code_batch_search = _code_main_search
+
+
+code_batch_nosearch = _code_main_nosearch
+
+
+# The fast profile requests compressed responses, decompressed by k6, bounds the time spent on each request and, when
+# not searching them, discards the bodies of the responses instead of keeping them in memory.
+_code_params = """{{ headers: request.headers }}"""
+
+
+_code_fast_params = """{{
+    headers: Object.assign({{ 'Accept-Encoding': 'gzip, deflate' }}, request.headers),
+    timeout: '30s',{discard}
+  }}"""
+
+
+code_fast_search = _code_main_search.replace(_code_params, _code_fast_params.replace('{discard}', ''))
+
+
+code_fast_nosearch = _code_main_nosearch.replace(
+    _code_params, _code_fast_params.replace('{discard}', """
+    responseType: 'none',""")).format()
+
+
+code_fast_batch_search = code_fast_search
+
+
+code_fast_batch_nosearch = _code_main_nosearch.replace(
+    _code_params, _code_fast_params.replace('{discard}', """
+    responseType: 'none',"""))
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# Value of PROXY when no proxy is set.
+code_proxy_none = 'None'
+
+code_begin = """#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Usage: locust --locustfile <this script> --users {concurrency} --spawn-rate {concurrency}
+import re
+from collections import Counter
+
+from locust import HttpUser, constant
+
+PROXY = {proxy}
+"""
+
+
+code_batch_begin = code_begin
+
+
+code_batch_requests = """REQUESTS = [{requests}
+]
+"""
+
+
+code_batch_request = """
+    ({method}, {url}, [{headers}], {data}),"""
+
+
+code_batch_header = """({name}, {value})"""
+
+
+_code_task_nosearch = """
+
+def replay(method, url, headers, data):
+    def send(user):
+        user.client.request(method, url, headers=dict(headers), data=data or None, proxies=PROXIES)
+    return send
+"""
+
+
+_code_task_search = """
+
+def replay(method, url, headers, data):
+    def send(user):
+        with user.client.request(
+                method, url, headers=dict(headers), data=data or None, proxies=PROXIES, catch_response=True) as response:
+            if not re.search(r"{search_string}", response.text):
+                response.failure('The response does not match the search')
+    return send
+"""
+
+
+_code_user = """
+# Identical requests are a single task, weighted by their number of occurrences
+WEIGHTS = Counter((method, url, tuple(headers), data) for method, url, headers, data in REQUESTS)
+
+
+class ReplayUser(HttpUser):
+    tasks = dict((replay(*request), weight) for request, weight in WEIGHTS.items())
+    wait_time = constant(0)
+    # Locust requires a host, though the requests have absolute URLs
+    host = REQUESTS[0][1]
+"""
+
+
+_code_proxies = """
+PROXIES = {{'http': PROXY, 'https': PROXY}} if PROXY else None
+"""
+
+
+code_search = _code_proxies + _code_task_search + _code_user
+
+
+code_nosearch = (_code_proxies + _code_task_nosearch + _code_user).format()
+
+
+code_batch_search = code_search
+
+
+code_batch_nosearch = _code_proxies + _code_task_nosearch + _code_user
+
+
+# The fast profile bounds the time spent connecting and reading. The client of Locust already requests compressed
+# responses and decompresses them, and keeps its connections alive.
+_code_fast_task_nosearch = _code_task_nosearch.replace('proxies=PROXIES)', 'proxies=PROXIES, timeout=(10, 30))')
+
+
+_code_fast_task_search = _code_task_search.replace(
+    'proxies=PROXIES, catch_response=True)', 'proxies=PROXIES, timeout=(10, 30),\n                catch_response=True)')
+
+
+code_fast_search = _code_proxies + _code_fast_task_search + _code_user
+
+
+code_fast_nosearch = (_code_proxies + _code_fast_task_nosearch + _code_user).format()
+
+
+code_fast_batch_search = code_fast_search
+
+
+code_fast_batch_nosearch = _code_proxies + _code_fast_task_nosearch + _code_user
@@ -1,3 +1,4 @@
+# -*- coding: utf-8 -*-
 code_begin = """if (!extension_loaded('curl')) {{
     print 'Curl Extension not found. Exiting';
     exit;
@@ -22,6 +23,18 @@ curl_setopt($ch, CURLOPT_PROXY, '{proxy}');
 """
 
 
+# Connects to the Unix socket or to the address instead of the host of the URL, which is kept along with the Host
+# header.
+code_unix_socket = """
+curl_setopt($ch, CURLOPT_UNIX_SOCKET_PATH, {path});
+"""
+
+
+code_connect_to = """
+curl_setopt($ch, CURLOPT_CONNECT_TO, array('::{host}:{port}'));
+"""
+
+
 code_post = """
 $content = "{data}";
 curl_setopt($ch, CURLOPT_POST, 1);
@@ -29,9 +42,75 @@ curl_setopt($ch, CURLOPT_POSTFIELDS, $content);
 """
 
 
+# Scans the responses as they arrive instead of buffering them, the last bytes of every chunk being scanned again
+# with the next one for the matches spanning both. Formatted with the search string and whether to abort the
+# transfer at the first match.
+_code_scan = """
+$string = "{search_string}";
+$stop_at_first_match = {first_match};
+
+// Returns the write function of a transfer, printing the matches of its response with the label
+function scanner($label) {{
+    global $string, $stop_at_first_match;
+    $tail = '';
+    return function ($ch, $chunk) use ($label, $string, $stop_at_first_match, &$tail) {{
+        $data = $tail . $chunk;
+        $found = 0;
+        // Checks if the passed string is a regex or a simple string
+        if (preg_match("/^\\/.+\\/[a-z]*$/i", $string)) {{
+            preg_match_all($string, $data, $matches, PREG_OFFSET_CAPTURE);
+            foreach ($matches[0] as $match) {{
+                // Matches ending in the tail were already found in the previous chunk
+                if ($match[1] + strlen($match[0]) > strlen($tail)) {{
+                    print $label . ' Found a match: ' . $match[0] . "\\n";
+                    $found++;
+                    if ($stop_at_first_match) {{
+                        break;
+                    }}
+                }}
+            }}
+        }}
+        else {{
+            $offset = max(0, strlen($tail) - strlen($string) + 1);
+            while (($offset = strpos($data, $string, $offset)) !== false) {{
+                print $label . ' Found a match: ' . $string . "\\n";
+                $found++;
+                if ($stop_at_first_match) {{
+                    break;
+                }}
+                $offset += strlen($string);
+            }}
+        }}
+        // Longest match expected to span two chunks
+        $tail = substr($data, -4096);
+        if ($found && $stop_at_first_match) {{
+            // Aborts the transfer
+            return 0;
+        }}
+        return strlen($chunk);
+    }};
+}}
+"""
+
+
 code_search = """
+curl_setopt($ch, CURLOPT_HTTPHEADER, $headers);""" + _code_scan + """
+curl_setopt($ch, CURLOPT_WRITEFUNCTION, scanner('{url}'));
+curl_exec($ch);{timings}
+
+if (curl_errno($ch) == CURLE_WRITE_ERROR) {{
+ print 'Stopped at the first match';
+}} elseif (curl_errno($ch)) {{
+ print curl_error($ch);
+}} else {{
+ curl_close($ch);
+}}
+"""
+
+
+code_nosearch = """
 curl_setopt($ch, CURLOPT_HTTPHEADER, $headers);
-$response = curl_exec($ch);
+$response = curl_exec($ch);{timings}
 
 if (curl_errno($ch)) {{
  print curl_error($ch);
@@ -39,30 +118,363 @@ if (curl_errno($ch)) {{
  curl_close($ch);
 }}
 print $response;
-$string = "{search_string}";
-// Blindly copied from http://stackoverflow.com/questions/10778318/test-if-a-string-is-regex
-// Checks if the passed string is a regex or a simple string
-if( preg_match("/^\/.+\/[a-z]*$/i",$string)) {{
-    if (preg_match($string, $response, $match)) {{
-        print 'Found a match!';
-    }}
+"""
+
+
+# Writes the response bodies into their own files of a directory instead of printing them, received in chunks of a
+# fixed size and hashed on the fly. Formatted with the directory and the hash, if any.
+_code_output = """
+$output_body = {path};
+$output_hash = {algorithm};
+if (!is_dir($output_body)) {{
+    mkdir($output_body, 0777, true);
 }}
-else {{
-    if (strpos($response,$string) !== false) {{
-        print 'Found a match!';
-    }}
+
+// Sets the write function of a transfer, returns what close_body needs once it is over
+function writer($ch, $name) {{
+    global $output_body, $output_hash;
+    $body = fopen($output_body . '/' . $name, 'wb');
+    $digest = $output_hash ? hash_init($output_hash) : null;
+    curl_setopt($ch, CURLOPT_BUFFERSIZE, 65536);
+    curl_setopt($ch, CURLOPT_WRITEFUNCTION, function ($ch, $chunk) use ($body, $digest) {{
+        if ($digest) {{
+            hash_update($digest, $chunk);
+        }}
+        return fwrite($body, $chunk);
+    }});
+    return array($name, $body, $digest);
+}}
+
+function close_body($written) {{
+    global $output_body;
+    list($name, $body, $digest) = $written;
+    fclose($body);
+    print $output_body . '/' . $name . ' ' . ($digest ? hash_final($digest) : '') . "\\n";
 }}
 """
 
 
-code_nosearch = """
-curl_setopt($ch, CURLOPT_HTTPHEADER, $headers);
-$response = curl_exec($ch);
+code_output = """
+curl_setopt($ch, CURLOPT_HTTPHEADER, $headers);""" + _code_output + """
+$written = writer($ch, 'response-1');
+curl_exec($ch);{timings}
 
-if (curl_errno($ch)) {
+if (curl_errno($ch)) {{
  print curl_error($ch);
-} else {
+}} else {{
  curl_close($ch);
-}
-print $response;
+}}
+close_body($written);
+"""
+
+
+code_loop_begin = """if (!extension_loaded('curl')) {{
+    print 'Curl Extension not found. Exiting';
+    exit;
+}}
+$url = {url};
+$headers = array({headers}
+);
+$data = {data};
+"""
+
+
+code_loop_header = """
+    {header},"""
+
+
+code_loop_rows = """
+function rows() {{
+    return array({rows}
+    );
+}}
+"""
+
+
+code_loop_row = """
+        array({values}),"""
+
+
+code_loop_payloads = """
+$payloads = {payloads};
+
+// Streams the payloads of the file, one per line
+function rows() {{
+    global $payloads;
+    $file = fopen($payloads, 'r');
+    while (($line = fgets($file)) !== false) {{
+        yield array(rtrim($line, "\\r\\n"));
+    }}
+    fclose($file);
+}}
+"""
+
+
+code_loop_main = """
+// Replaces the markers of the template by the values of the row
+function fill($template, $row) {{
+    $markers = array();
+    foreach (array_keys($row) as $index) {{
+        $markers[] = '§' . $index . '§';
+    }}
+    return str_replace($markers, $row, $template);
+}}
+
+// Percent-encodes the values, keeping the reserved characters and the bytes already encoded
+function fill_url($row) {{
+    global $url;
+    return fill($url, preg_replace_callback("#[^-A-Za-z0-9._~!$&'()*+,/:;=?@\\[\\]%]#", function ($match) {{
+        return rawurlencode($match[0]);
+    }}, $row));
+}}
+
+// A single handle keeps the connection alive between the requests
+$ch = curl_init();
+// Set so curl_exec returns the result instead of outputting it.
+curl_setopt($ch, CURLOPT_RETURNTRANSFER, 1);
+// Set verbosity
+curl_setopt($ch, CURLOPT_VERBOSE, 1);
+"""
+
+
+code_loop_post = """
+    curl_setopt($ch, CURLOPT_POST, 1);
+    curl_setopt($ch, CURLOPT_POSTFIELDS, fill($data, $row));"""
+
+
+code_loop_search = _code_scan + """
+foreach (rows() as $row) {{
+    $request_url = fill_url($row);
+    curl_setopt($ch, CURLOPT_URL, $request_url);
+    $request_headers = array();
+    foreach ($headers as $header) {{
+        $request_headers[] = fill($header, $row);
+    }}
+    curl_setopt($ch, CURLOPT_HTTPHEADER, $request_headers);{post}
+    curl_setopt($ch, CURLOPT_WRITEFUNCTION, scanner($request_url));
+    curl_exec($ch);{timings}
+    if (curl_errno($ch) == CURLE_WRITE_ERROR) {{
+        print $request_url . " Stopped at the first match\\n";
+    }}
+    elseif (curl_errno($ch)) {{
+        print curl_error($ch);
+    }}
+}}
+curl_close($ch);
+"""
+
+
+code_loop_nosearch = """
+foreach (rows() as $row) {{
+    curl_setopt($ch, CURLOPT_URL, fill_url($row));
+    $request_headers = array();
+    foreach ($headers as $header) {{
+        $request_headers[] = fill($header, $row);
+    }}
+    curl_setopt($ch, CURLOPT_HTTPHEADER, $request_headers);{post}
+    $response = curl_exec($ch);{timings}
+    if (curl_errno($ch)) {{
+        print curl_error($ch);
+        continue;
+    }}
+    print $response;
+}}
+curl_close($ch);
+"""
+
+
+code_loop_output = _code_output + """
+$number = 0;
+foreach (rows() as $row) {{
+    $number++;
+    curl_setopt($ch, CURLOPT_URL, fill_url($row));
+    $request_headers = array();
+    foreach ($headers as $header) {{
+        $request_headers[] = fill($header, $row);
+    }}
+    curl_setopt($ch, CURLOPT_HTTPHEADER, $request_headers);{post}
+    $written = writer($ch, 'response-' . $number);
+    curl_exec($ch);{timings}
+    if (curl_errno($ch)) {{
+        print curl_error($ch);
+    }}
+    close_body($written);
+}}
+curl_close($ch);
+"""
+
+
+code_batch_begin = """if (!extension_loaded('curl')) {{
+    print 'Curl Extension not found. Exiting';
+    exit;
+}}
+$concurrency = {concurrency};
+"""
+
+
+code_batch_requests = """$requests = array({requests}
+);
+"""
+
+
+code_batch_request = """
+    array({method}, {url}, array({headers}), {data}),"""
+
+
+code_batch_header = """{header}"""
+
+
+code_batch_main = """
+// The handles share their DNS and TLS session caches
+$share = curl_share_init();
+curl_share_setopt($share, CURLSHOPT_SHARE, CURL_LOCK_DATA_DNS);
+curl_share_setopt($share, CURLSHOPT_SHARE, CURL_LOCK_DATA_SSL_SESSION);
+$options = array(
+    CURLOPT_RETURNTRANSFER => 1,
+    CURLOPT_FOLLOWLOCATION => 1,
+    CURLOPT_TCP_KEEPALIVE => 1,
+    CURLOPT_SHARE => $share,
+"""
+
+
+code_batch_proxy = """    CURLOPT_PROXY => '{proxy}',
+"""
+
+
+code_batch_unix_socket = """    CURLOPT_UNIX_SOCKET_PATH => {path},
+"""
+
+
+code_batch_connect_to = """    CURLOPT_CONNECT_TO => array('::{host}:{port}'),
+"""
+
+
+# Sends the requests through a multi handle, which keeps the connections alive between them.
+_code_batch_multi = """);
+
+function add_request($multi, $options, $index, $request) {{
+    list($method, $url, $headers, $data) = $request;
+    $ch = curl_init($url);
+    curl_setopt_array($ch, $options);
+    curl_setopt($ch, CURLOPT_HTTPHEADER, $headers);
+    if ($method == 'POST') {{
+        curl_setopt($ch, CURLOPT_POST, 1);
+        curl_setopt($ch, CURLOPT_POSTFIELDS, $data);
+    }}
+    curl_setopt($ch, CURLOPT_PRIVATE, $index);{write}
+    curl_multi_add_handle($multi, $ch);
+}}
+
+$multi = curl_multi_init();
+$next = 0;
+$active = 0;
+// Keeps at most $concurrency requests in flight
+while ($next < count($requests) && $active < $concurrency) {{
+    add_request($multi, $options, $next, $requests[$next]);
+    $next++;
+    $active++;
+}}
+while ($active > 0) {{
+    curl_multi_exec($multi, $running);
+    while ($info = curl_multi_info_read($multi)) {{
+        $ch = $info['handle'];
+        $index = (int) curl_getinfo($ch, CURLINFO_PRIVATE);
+        list($method, $url) = $requests[$index];{timings}
+        if ($info['result'] == CURLE_OK) {{
+            print $method . ' ' . $url . ' ' . curl_getinfo($ch, CURLINFO_HTTP_CODE) . "\\n";{response}
+        }}{search}
+        else {{
+            print $method . ' ' . $url . ' ' . curl_strerror($info['result']) . "\\n";
+        }}{done}
+        curl_multi_remove_handle($multi, $ch);
+        curl_close($ch);
+        $active--;
+        if ($next < count($requests)) {{
+            add_request($multi, $options, $next, $requests[$next]);
+            $next++;
+            $active++;
+        }}
+    }}
+    if ($running) {{
+        curl_multi_select($multi);
+    }}
+}}
+curl_multi_close($multi);
+curl_share_close($share);
+"""
+
+
+code_batch_search = _code_batch_multi.replace(');\n', ');\n' + _code_scan, 1).replace('{write}', """
+    curl_setopt($ch, CURLOPT_WRITEFUNCTION, scanner($method . ' ' . $url));""").replace('{response}', '').replace(
+    '{done}', '').replace('{search}', """
+        elseif ($info['result'] == CURLE_WRITE_ERROR) {{
+            print $method . ' ' . $url . " Stopped at the first match\\n";
+        }}""")
+
+
+code_batch_nosearch = _code_batch_multi.replace('{write}', '').replace('{response}', """
+            print curl_multi_getcontent($ch);""").replace('{search}', '').replace('{done}', '')
+
+
+code_batch_output = _code_batch_multi.replace(');\n', ');\n' + _code_output, 1).replace('{write}', """
+    global $written;
+    $written[$index] = writer($ch, 'response-' . ($index + 1));""").replace('{response}', '').replace(
+    '{search}', '').replace('{done}', """
+        close_body($written[$index]);
+        unset($written[$index]);""")
+
+
+# Reports the phases of a transfer, in seconds since its start, and the bytes transferred, as a single JSON line.
+code_timings = """
+$timings = curl_getinfo($ch);
+print json_encode(array(
+    'url' => $timings['url'],
+    'status' => $timings['http_code'],
+    'dns' => $timings['namelookup_time'],
+    'connect' => $timings['connect_time'],
+    'tls' => $timings['appconnect_time'],
+    'ttfb' => $timings['starttransfer_time'],
+    'total' => $timings['total_time'],
+    'downloaded' => $timings['size_download'],
+    'uploaded' => $timings['size_upload'],
+)) . "\\n";"""
+
+
+code_loop_timings = code_timings.replace('\n', '\n    ')
+
+
+code_batch_timings = code_timings.replace('\n', '\n' + ' ' * 8)
+
+
+# The fast profile replaces the verbosity of the scripts by throughput oriented options.
+_code_verbose = """// Set verbosity
+curl_setopt($ch, CURLOPT_VERBOSE, 1);
+"""
+
+
+_code_fast = """// Requests compressed responses, decompressed by curl
+curl_setopt($ch, CURLOPT_ENCODING, '');
+// Attempts HTTP/2 over TLS when curl supports it
+if (curl_version()['features'] & CURL_VERSION_HTTP2) {{
+    curl_setopt($ch, CURLOPT_HTTP_VERSION, CURL_HTTP_VERSION_2TLS);
+}}
+curl_setopt($ch, CURLOPT_TCP_KEEPALIVE, 1);
+curl_setopt($ch, CURLOPT_CONNECTTIMEOUT, 10);
+curl_setopt($ch, CURLOPT_TIMEOUT, 30);
+"""
+
+
+code_fast_begin = code_begin.replace(_code_verbose, _code_fast)
+
+
+code_fast_loop_main = code_loop_main.replace(_code_verbose, _code_fast)
+
+
+code_fast_batch_main = code_batch_main + """    // Requests compressed responses, decompressed by curl
+    CURLOPT_ENCODING => '',
+    // Attempts HTTP/2 over TLS when curl supports it, multiplexing the requests
+    CURLOPT_HTTP_VERSION => curl_version()['features'] & CURL_VERSION_HTTP2
+        ? CURL_HTTP_VERSION_2TLS : CURL_HTTP_VERSION_NONE,
+    CURLOPT_CONNECTTIMEOUT => 10,
+    CURLOPT_TIMEOUT => 30,
 """
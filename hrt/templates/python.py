@@ -1,5 +1,9 @@
+# -*- coding: utf-8 -*-
 code_begin = """#!/usr/bin/python
 from __future__ import print_function
+import hashlib
+import json
+import os
 import re
 import pycurl
 try:
@@ -27,6 +31,18 @@ code_proxy = """
 """
 
 
+# Connects to the Unix socket or to the address instead of the host of the URL, which is kept along with the Host
+# header.
+code_unix_socket = """
+    curl_handler.setopt(curl_handler.UNIX_SOCKET_PATH, {path})
+"""
+
+
+code_connect_to = """
+    curl_handler.setopt(curl_handler.CONNECT_TO, ['::{host}:{port}'])
+"""
+
+
 code_post = """
     # Sets request method to POST
     curl_handler.setopt(curl_handler.POSTFIELDS, "{data}")  #expects body to urlencoded
@@ -41,11 +57,123 @@ code_https = """
 """
 
 
-code_search = """
+# Scans the responses as they arrive instead of buffering them, the last bytes of every chunk being scanned again
+# with the next one for the matches spanning both. Formatted with the search string and whether to abort the
+# transfer at the first match, then given to the search templates as their scan.
+code_scan = """
+    pattern = re.compile(r"{search_string}".encode('utf-8'))
+    stop_at_first_match = {first_match}
+    # Longest match expected to span two chunks
+    overlap = 4096
+
+    def scanner(label):
+        state = {{'tail': b'', 'stopped': False}}
+
+        def scan(chunk):
+            data = state['tail'] + chunk
+            for match in pattern.finditer(data):
+                # Matches ending in the tail were already found in the previous chunk
+                if match.end() > len(state['tail']):
+                    print(label, "Matched item: ", match.group(0).decode('iso-8859-1'))
+                    if stop_at_first_match:
+                        # Aborts the transfer
+                        state['stopped'] = True
+                        return 0
+            state['tail'] = data[-overlap:]
+        return scan, state
+"""
+
+
+# Scans the responses for many patterns at once, counting the hits of every pattern: the literal ones through an
+# Aho-Corasick automaton, whose tables are computed when generating the script, and the regexes through their
+# alternation, whose groups are named after the index of their pattern, or on their own. Formatted with the tables and
+# whether to abort the transfer at the first match, then given to the search templates as their scan.
+code_patterns_scan = """
+    import atexit
+
+    patterns = {patterns}
+    # Transitions, failure links and patterns ending in every state of the automaton
+    goto = {goto}
+    fail = {fail}
+    output = {output}
+    # Bytes starting a literal pattern, skipped to from the root of the automaton
+    starts = re.compile({starts})
+    # The alternation, then the regexes compiled on their own along with the index of their pattern
+    regexes = [(None, re.compile({regex}))] + [(index, re.compile(source)) for index, source in {regexes}]
+    stop_at_first_match = {first_match}
+    # Longest regex match expected to span two chunks
+    overlap = 4096
+    hits = [0] * len(patterns)
+
+    def report_hits():
+        for pattern, count in zip(patterns, hits):
+            print("Hits of ", pattern, ": ", count)
+    atexit.register(report_hits)
+
+    def scanner(label):
+        state = {{'node': 0, 'tail': b'', 'stopped': False}}
+
+        def stop():
+            # Aborts the transfer
+            state['stopped'] = True
+            return 0
+
+        def scan(chunk):
+            data = bytearray(chunk)
+            node = state['node']
+            position = 0
+            while position < len(data):
+                if not node:
+                    start = starts.search(data, position)
+                    if start is None:
+                        break
+                    position = start.start()
+                byte = data[position]
+                while node and byte not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(byte, 0)
+                position += 1
+                for index in output[node]:
+                    print(label, "Matched item: ", patterns[index])
+                    hits[index] += 1
+                    if stop_at_first_match:
+                        return stop()
+            state['node'] = node
+            data = state['tail'] + chunk
+            for index, regex in regexes:
+                for match in regex.finditer(data):
+                    # Matches ending in the tail were already found in the previous chunk
+                    if match.end() > len(state['tail']):
+                        print(label, "Matched item: ", match.group(0).decode('iso-8859-1'))
+                        hits[int(match.lastgroup[1:]) if index is None else index] += 1
+                        if stop_at_first_match:
+                            return stop()
+            state['tail'] = data[-overlap:]
+        return scan, state
+"""
+
+
+code_search = """{scan}
+    scan, state = scanner('{url}')
+    curl_handler.setopt(curl_handler.WRITEFUNCTION, scan)
     try:
         curl_handler.perform()
-    except pycurl.error, error:
-        print('An error occurred: ', error)
+    except pycurl.error as error:
+        if not state['stopped']:
+            print('An error occurred: ', error){timings}
+    curl_handler.close()
+
+
+if __name__ == '__main__':
+    main()
+"""
+
+
+code_nosearch = """
+    try:
+        curl_handler.perform()
+    except pycurl.error as error:
+        print('An error occurred: ', error){timings}
     curl_handler.close()
 
     body = buffer.getvalue()
@@ -54,20 +182,6 @@ code_search = """
     # end up with a Unicode string.
     response = body.decode('iso-8859-1')
 
-    match = re.findall(r"{search_string}", str(response))
-    try:
-        from termcolor import colored
-        lib_available = True
-    except ImportError:
-        lib_available = False
-    if match:
-        for item in match:
-            if lib_available:
-                replace_string = colored(match[item], 'green')
-                response = re.sub(match[item], replace_string, str(response))
-            else:
-                print("Matched item: ",item)
-
     print(response)
 
 
@@ -76,22 +190,430 @@ if __name__ == '__main__':
 """
 
 
-code_nosearch = """
+# Writes the response bodies into their own files of a directory instead of printing them, received in chunks of a
+# fixed size and hashed on the fly. Formatted with the directory and the hash, if any.
+_code_output = """
+    output_body = {path}
+    output_hash = {algorithm}
+    # Size of the chunks the bodies are received and written in
+    chunk_size = 65536
+    if not os.path.isdir(output_body):
+        os.makedirs(output_body)
+
+    def writer(name):
+        body = open(os.path.join(output_body, name), 'wb')
+        digest = hashlib.new(output_hash) if output_hash else None
+
+        def write(chunk):
+            body.write(chunk)
+            if digest:
+                digest.update(chunk)
+
+        def close():
+            body.close()
+            print(body.name, digest.hexdigest() if digest else '')
+        return write, close
+"""
+
+
+code_output = _code_output + """
+    write, close = writer('response-1')
+    curl_handler.setopt(curl_handler.BUFFERSIZE, chunk_size)
+    curl_handler.setopt(curl_handler.WRITEFUNCTION, write)
     try:
         curl_handler.perform()
-    except pycurl.error, error:
+    except pycurl.error as error:
         print('An error occurred: ', error)
+    close(){timings}
     curl_handler.close()
 
-    body = buffer.getvalue()
-    # Body is a string on Python 2 and a byte string on Python 3.
-    # If we know the encoding, we can always decode the body and
-    # end up with a Unicode string.
-    response = body.decode('iso-8859-1')
 
-    print(response)
+if __name__ == '__main__':
+    main()
+"""
+
+
+code_loop_begin = """#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+import hashlib
+import json
+import os
+import re
+import pycurl
+try:
+    from io import BytesIO
+except ImportError:
+    from StringIO import StringIO as BytesIO
+try:
+    from urllib.parse import quote
+except ImportError:
+    from urllib import quote
+
+URL = {url}
+HEADERS = [{headers}
+]
+DATA = {data}
+"""
+
+
+code_loop_header = """
+    {header},"""
+
+
+code_loop_rows = """ROWS = [{rows}
+]
+
+
+def rows():
+    return ROWS
+"""
+
+
+code_loop_row = """
+    [{values}],"""
+
+
+code_loop_payloads = """PAYLOADS = {payloads}
+
+
+def rows():
+    # Streams the payloads of the file, one per line
+    with open(PAYLOADS, 'rb') as payloads:
+        for line in payloads:
+            yield [line.rstrip(b'\\r\\n').decode('utf-8')]
+"""
+
+
+code_loop_main = """
+
+def fill(template, row, encode=None):
+    # Replaces the markers of the template by the values of the row
+    for index, value in enumerate(row):
+        template = template.replace('§%d§' % index, encode(value) if encode else value)
+    return template
+
+
+def fill_url(row):
+    # Percent-encodes the values, keeping the reserved characters and the bytes already encoded
+    return fill(URL, row, lambda value: quote(value.encode('utf-8'), safe="!$&'()*+,/:;=?@[]~%"))
+
+
+def main():
+    # A single handler keeps the connection alive between the requests
+    curl_handler = pycurl.Curl()
+    # for verbosity
+    curl_handler.setopt(curl_handler.VERBOSE, True)
+    # Follow redirects
+    curl_handler.setopt(curl_handler.FOLLOWLOCATION, True)
+"""
+
+
+code_loop_post = """
+        # Sets request method to POST
+        curl_handler.setopt(curl_handler.POSTFIELDS, fill(DATA, row).encode('utf-8'))  #expects body to urlencoded"""
+
+
+code_loop_search = """{scan}
+    for row in rows():
+        url = fill_url(row)
+        scan, state = scanner(url)
+        curl_handler.setopt(curl_handler.URL, url)
+        curl_handler.setopt(curl_handler.HTTPHEADER, [fill(header, row).encode('utf-8') for header in HEADERS])
+        curl_handler.setopt(curl_handler.WRITEFUNCTION, scan){post}
+        try:
+            curl_handler.perform()
+        except pycurl.error as error:
+            if not state['stopped']:
+                print('An error occurred: ', error){timings}
+    curl_handler.close()
 
 
 if __name__ == '__main__':
     main()
 """
+
+
+code_loop_nosearch = """
+    for row in rows():
+        buffer = BytesIO()
+        curl_handler.setopt(curl_handler.URL, fill_url(row))
+        curl_handler.setopt(curl_handler.HTTPHEADER, [fill(header, row).encode('utf-8') for header in HEADERS])
+        curl_handler.setopt(curl_handler.WRITEDATA, buffer){post}
+        try:
+            curl_handler.perform()
+        except pycurl.error as error:
+            print('An error occurred: ', error)
+        else:
+            print(buffer.getvalue().decode('iso-8859-1')){timings}
+    curl_handler.close()
+
+
+if __name__ == '__main__':
+    main()
+"""
+
+
+code_loop_output = _code_output + """
+    curl_handler.setopt(curl_handler.BUFFERSIZE, chunk_size)
+    for number, row in enumerate(rows(), 1):
+        write, close = writer('response-%d' % number)
+        curl_handler.setopt(curl_handler.URL, fill_url(row))
+        curl_handler.setopt(curl_handler.HTTPHEADER, [fill(header, row).encode('utf-8') for header in HEADERS])
+        curl_handler.setopt(curl_handler.WRITEFUNCTION, write){post}
+        try:
+            curl_handler.perform()
+        except pycurl.error as error:
+            print('An error occurred: ', error)
+        close(){timings}
+    curl_handler.close()
+
+
+if __name__ == '__main__':
+    main()
+"""
+
+
+code_batch_begin = """#!/usr/bin/python
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+import hashlib
+import json
+import os
+import re
+import pycurl
+try:
+    from io import BytesIO
+except ImportError:
+    from StringIO import StringIO as BytesIO
+
+CONCURRENCY = {concurrency}
+"""
+
+
+code_batch_requests = """REQUESTS = [{requests}
+]
+"""
+
+
+code_batch_request = """
+    ({method}, {url}, [{headers}], {data}),"""
+
+
+code_batch_header = """{header}"""
+
+
+code_batch_main = """
+
+def send(multi, handle, request, write=None):
+    method, url, headers, data = request
+    handle.request = request
+    handle.setopt(pycurl.URL, url)
+    handle.setopt(pycurl.HTTPHEADER, headers)
+    if write is None:
+        handle.buffer = BytesIO()
+        handle.setopt(pycurl.WRITEDATA, handle.buffer)
+    else:
+        handle.setopt(pycurl.WRITEFUNCTION, write)
+    if method == 'POST':
+        handle.setopt(pycurl.POSTFIELDS, data)
+    else:
+        handle.setopt(pycurl.HTTPGET, True)
+    multi.add_handle(handle)
+
+
+def main():
+    # The handles share their DNS, TLS session and connection caches
+    share = pycurl.CurlShare()
+    share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS)
+    share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION)
+    if hasattr(pycurl, 'LOCK_DATA_CONNECT'):
+        share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_CONNECT)
+    multi = pycurl.CurlMulti()
+    free_handles = []
+    for _ in range(min(CONCURRENCY, len(REQUESTS))):
+        handle = pycurl.Curl()
+        handle.setopt(pycurl.SHARE, share)
+        # Follow redirects
+        handle.setopt(pycurl.FOLLOWLOCATION, True)
+"""
+
+
+code_batch_proxy = """        handle.setopt(pycurl.PROXY, '{proxy}')
+"""
+
+
+code_batch_unix_socket = """        handle.setopt(pycurl.UNIX_SOCKET_PATH, {path})
+"""
+
+
+code_batch_connect_to = """        handle.setopt(pycurl.CONNECT_TO, ['::{host}:{port}'])
+"""
+
+
+code_batch_https = """        handle.setopt(pycurl.SSL_VERIFYPEER, 1)
+        handle.setopt(pycurl.SSL_VERIFYHOST, 2)
+"""
+
+
+code_batch_search = """        free_handles.append(handle){scan}
+    pending = list(reversed(REQUESTS))
+    remaining = len(REQUESTS)
+    while remaining:
+        # Keeps at most CONCURRENCY requests in flight
+        while pending and free_handles:
+            handle, request = free_handles.pop(), pending.pop()
+            handle.scan, handle.state = scanner(request[0] + ' ' + request[1])
+            send(multi, handle, request, handle.scan)
+        while multi.perform()[0] == pycurl.E_CALL_MULTI_PERFORM:
+            pass
+        while True:
+            queued, succeeded, failed = multi.info_read()
+            for handle in succeeded:
+                multi.remove_handle(handle)
+                print(handle.request[0], handle.request[1], handle.getinfo(pycurl.RESPONSE_CODE)){timings}
+                free_handles.append(handle)
+            for handle, _, message in failed:
+                multi.remove_handle(handle)
+                if not handle.state['stopped']:
+                    print(handle.request[0], handle.request[1], 'An error occurred: ', message){timings}
+                free_handles.append(handle)
+            remaining -= len(succeeded) + len(failed)
+            if not queued:
+                break
+        multi.select(1.0)
+    for handle in free_handles:
+        handle.close()
+    multi.close()
+
+
+if __name__ == '__main__':
+    main()
+"""
+
+
+code_batch_nosearch = """        free_handles.append(handle)
+    pending = list(reversed(REQUESTS))
+    remaining = len(REQUESTS)
+    while remaining:
+        # Keeps at most CONCURRENCY requests in flight
+        while pending and free_handles:
+            send(multi, free_handles.pop(), pending.pop())
+        while multi.perform()[0] == pycurl.E_CALL_MULTI_PERFORM:
+            pass
+        while True:
+            queued, succeeded, failed = multi.info_read()
+            for handle in succeeded:
+                multi.remove_handle(handle)
+                print(handle.request[0], handle.request[1], handle.getinfo(pycurl.RESPONSE_CODE))
+                print(handle.buffer.getvalue().decode('iso-8859-1')){timings}
+                free_handles.append(handle)
+            for handle, _, message in failed:
+                multi.remove_handle(handle)
+                print(handle.request[0], handle.request[1], 'An error occurred: ', message){timings}
+                free_handles.append(handle)
+            remaining -= len(succeeded) + len(failed)
+            if not queued:
+                break
+        multi.select(1.0)
+    for handle in free_handles:
+        handle.close()
+    multi.close()
+
+
+if __name__ == '__main__':
+    main()
+"""
+
+
+code_batch_output = """        free_handles.append(handle)""" + _code_output + """
+    pending = list(reversed(list(enumerate(REQUESTS, 1))))
+    remaining = len(REQUESTS)
+    while remaining:
+        # Keeps at most CONCURRENCY requests in flight
+        while pending and free_handles:
+            handle, (number, request) = free_handles.pop(), pending.pop()
+            handle.write, handle.close_body = writer('response-%d' % number)
+            handle.setopt(pycurl.BUFFERSIZE, chunk_size)
+            send(multi, handle, request, handle.write)
+        while multi.perform()[0] == pycurl.E_CALL_MULTI_PERFORM:
+            pass
+        while True:
+            queued, succeeded, failed = multi.info_read()
+            for handle in succeeded:
+                multi.remove_handle(handle)
+                print(handle.request[0], handle.request[1], handle.getinfo(pycurl.RESPONSE_CODE))
+                handle.close_body(){timings}
+                free_handles.append(handle)
+            for handle, _, message in failed:
+                multi.remove_handle(handle)
+                print(handle.request[0], handle.request[1], 'An error occurred: ', message)
+                handle.close_body(){timings}
+                free_handles.append(handle)
+            remaining -= len(succeeded) + len(failed)
+            if not queued:
+                break
+        multi.select(1.0)
+    for handle in free_handles:
+        handle.close()
+    multi.close()
+
+
+if __name__ == '__main__':
+    main()
+"""
+
+
+# Reports the phases of a transfer, in seconds since its start, and the bytes transferred, as a single JSON line.
+code_timings = """
+    print(json.dumps({
+        'url': curl_handler.getinfo(pycurl.EFFECTIVE_URL),
+        'status': curl_handler.getinfo(pycurl.RESPONSE_CODE),
+        'dns': curl_handler.getinfo(pycurl.NAMELOOKUP_TIME),
+        'connect': curl_handler.getinfo(pycurl.CONNECT_TIME),
+        'tls': curl_handler.getinfo(pycurl.APPCONNECT_TIME),
+        'ttfb': curl_handler.getinfo(pycurl.STARTTRANSFER_TIME),
+        'total': curl_handler.getinfo(pycurl.TOTAL_TIME),
+        'downloaded': curl_handler.getinfo(pycurl.SIZE_DOWNLOAD),
+        'uploaded': curl_handler.getinfo(pycurl.SIZE_UPLOAD),
+    }))"""
+
+
+code_loop_timings = code_timings.replace('\n', '\n    ')
+
+
+code_batch_timings = code_timings.replace('curl_handler', 'handle').replace('\n', '\n' + ' ' * 12)
+
+
+# The fast profile replaces the verbosity of the scripts by throughput oriented options.
+_code_verbose = """    # for verbosity
+    curl_handler.setopt(curl_handler.VERBOSE, True)
+"""
+
+
+_code_fast = """    # Requests compressed responses, decompressed by libcurl
+    curl_handler.setopt(curl_handler.ACCEPT_ENCODING, '')
+    # Attempts HTTP/2 over TLS when libcurl supports it
+    if pycurl.version_info()[4] & pycurl.VERSION_HTTP2:
+        curl_handler.setopt(curl_handler.HTTP_VERSION, pycurl.CURL_HTTP_VERSION_2TLS)
+    curl_handler.setopt(curl_handler.TCP_KEEPALIVE, 1)
+    curl_handler.setopt(curl_handler.CONNECTTIMEOUT, 10)
+    curl_handler.setopt(curl_handler.TIMEOUT, 30)
+"""
+
+
+code_fast_begin = code_begin.replace(_code_verbose, _code_fast)
+
+
+code_fast_loop_main = code_loop_main.replace(_code_verbose, _code_fast)
+
+
+code_fast_batch_main = code_batch_main + """        # Requests compressed responses, decompressed by libcurl
+        handle.setopt(pycurl.ACCEPT_ENCODING, '')
+        # Attempts HTTP/2 over TLS when libcurl supports it, multiplexing the requests
+        if pycurl.version_info()[4] & pycurl.VERSION_HTTP2:
+            handle.setopt(pycurl.HTTP_VERSION, pycurl.CURL_HTTP_VERSION_2TLS)
+        handle.setopt(pycurl.TCP_KEEPALIVE, 1)
+        handle.setopt(pycurl.CONNECTTIMEOUT, 10)
+        handle.setopt(pycurl.TIMEOUT, 30)
+"""
@@ -1,4 +1,5 @@
-code_begin = """require "typhoeus"
+# -*- coding: utf-8 -*-
+code_begin = """require "typhoeus"{timings}
 
 url = '{url}'
 
@@ -14,6 +15,18 @@ code_proxy = """
 """
 
 
+# Connects to the Unix socket or to the address instead of the host of the URL, which is kept along with the Host
+# header.
+code_unix_socket = """
+    unix_socket_path: {path},
+"""
+
+
+code_connect_to = """
+    connect_to: ['::{host}:{port}'],
+"""
+
+
 code_header = """
     "{header}" => "{value}","""
 
@@ -29,35 +42,45 @@ code_post = """
 """
 
 
-code_search = """
-}}
-req = Typhoeus::Request.new(url, options)
-req.on_complete do |response|
-  if response.success?
-    puts 'Response #{{response.code}}:'
-    begin
-        require 'colorize'
-        lib_available = true
-    rescue LoadError
-        lib_available = false
-    end
+# Scans the responses as they arrive instead of buffering them, the last bytes of every chunk being scanned again
+# with the next one for the matches spanning both. Formatted with the search string and whether to abort the
+# transfer at the first match.
+_code_scan = """
+PATTERN = /{search_string}/
+STOP_AT_FIRST_MATCH = {first_match}
+# Longest match expected to span two chunks
+OVERLAP = 4096
 
-    matched = response.body.match /{search_string}/
-
-    original = response.body
-    if matched then
-        if lib_available then
-            for i in 0..matched.length
-                original.gsub! /#{{matched[i]}}/, "#{{matched[i]}}".green
-            end
-        else
-            for i in 0..matched.length
-                puts 'Matched item: #{{matched[i]}}'
-            end
-        end
+def scanner(label)
+  tail = ''.b
+  proc do |chunk|
+    data = tail + chunk
+    found = false
+    data.to_enum(:scan, PATTERN).each do
+      match = Regexp.last_match
+      # Matches ending in the tail were already found in the previous chunk
+      next if match.end(0) <= tail.length
+      puts "#{{label}} Matched item: #{{match[0]}}"
+      found = true
+      break if STOP_AT_FIRST_MATCH
     end
-    puts original
+    tail = data[-OVERLAP..-1] || data
+    # Aborts the transfer
+    :abort if found && STOP_AT_FIRST_MATCH
+  end
+end
+"""
 
+
+code_search = """
+}}""" + _code_scan + """
+req = Typhoeus::Request.new(url, options)
+req.on_body(&scanner(url))
+req.on_complete do |response|
+  if response.return_code == :write_error
+    puts 'Stopped at the first match'
+  elsif response.success?
+    puts "Response #{{response.code}}"
   elsif response.timed_out?
     puts 'Request Timed Out!'
   elsif response.code == 0
@@ -94,3 +117,362 @@ end
 
 req.run
 """
+
+
+# Writes the response bodies into their own files of a directory instead of printing them, received in chunks of a
+# fixed size and hashed on the fly. Formatted with the directory and the hash, if any.
+_code_output = """
+require "digest"
+require "fileutils"
+
+OUTPUT_BODY = {path}
+OUTPUT_HASH = {algorithm}
+# Size of the chunks the bodies are received and written in
+CHUNK_SIZE = 65536
+FileUtils.mkdir_p(OUTPUT_BODY)
+
+def writer(request, name)
+  body = File.open(File.join(OUTPUT_BODY, name), 'wb')
+  digest = Digest(OUTPUT_HASH.upcase).new unless OUTPUT_HASH.empty?
+  request.on_body do |chunk|
+    body.write(chunk)
+    digest.update(chunk) if digest
+  end
+  request.on_complete do
+    body.close
+    puts "#{{body.path}} #{{digest && digest.hexdigest}}"
+  end
+end
+"""
+
+
+code_output = """
+}}""" + _code_output + """
+req = Typhoeus::Request.new(url, options.merge(buffersize: CHUNK_SIZE))
+writer(req, 'response-1')
+req.on_complete do |response|
+  if response.success?
+    puts "Response #{{response.code}}"
+  elsif response.timed_out?
+    puts 'Request Timed Out!'
+  elsif response.code == 0
+    # Could not get an http response, something's wrong.
+    puts response.return_message
+  else
+    # Received a non-successful http response.
+    puts 'HTTP request failed: ' + response.code.to_s
+  end
+end
+
+req.run
+"""
+
+
+
+
+code_loop_begin = """require "typhoeus"{timings}
+
+URL = {url}
+HEADERS = {{{headers}
+}}
+DATA = {data}
+"""
+
+
+code_loop_header = """
+    {name} => {value},"""
+
+
+code_loop_rows = """
+def rows
+  [{rows}
+  ]
+end
+"""
+
+
+code_loop_row = """
+    [{values}],"""
+
+
+code_loop_payloads = """
+PAYLOADS = {payloads}
+
+# Streams the payloads of the file, one per line
+def rows
+  File.foreach(PAYLOADS).lazy.map {{ |line| [line.chomp] }}
+end
+"""
+
+
+code_loop_main = """
+# Replaces the markers of the template by the values of the row
+def fill(template, row)
+  row.each_with_index.reduce(template) do |text, (value, index)|
+    text.gsub("§#{{index}}§") {{ value }}
+  end
+end
+
+# Percent-encodes the values, keeping the reserved characters and the bytes already encoded
+UNSAFE = %r{{[^-A-Za-z0-9._~!$&'()*+,/:;=?@\\[\\]%]}}n
+
+def fill_url(row)
+  fill(URL, row.map {{ |value| value.b.gsub(UNSAFE) {{ |char| format('%%%02X', char.ord) }} }})
+end
+
+# Typhoeus reuses its handles, keeping the connection alive between the requests
+options = {{
+    followlocation: true,
+    verbose: true,
+    method: :{lower_method},
+"""
+
+
+code_loop_post = """
+  request_options[:body] = fill(DATA, row)"""
+
+
+code_loop_search = """
+}}""" + _code_scan + """
+rows.each do |row|
+  request_options = options.merge(headers: Hash[HEADERS.map {{ |name, value| [fill(name, row), fill(value, row)] }}]){post}
+  url = fill_url(row)
+  request = Typhoeus::Request.new(url, request_options)
+  request.on_body(&scanner(url))
+  response = request.run
+  if response.return_code == :write_error
+    puts "#{{url}} Stopped at the first match"
+  elsif response.success?
+    puts "#{{url}} Response #{{response.code}}"
+  elsif response.timed_out?
+    puts 'Request Timed Out!'
+  elsif response.code == 0
+    # Could not get an http response, something's wrong.
+    puts response.return_message
+  else
+    # Received a non-successful http response.
+    puts 'HTTP request failed: ' + response.code.to_s
+  end
+end
+"""
+
+
+code_loop_nosearch = """
+}}
+
+rows.each do |row|
+  request_options = options.merge(headers: Hash[HEADERS.map {{ |name, value| [fill(name, row), fill(value, row)] }}]){post}
+  response = Typhoeus::Request.new(fill_url(row), request_options).run
+  if response.success?
+    puts "Response #{{response.code}}"
+    puts response.body
+  elsif response.timed_out?
+    puts 'Request Timed Out!'
+  elsif response.code == 0
+    # Could not get an http response, something's wrong.
+    puts response.return_message
+  else
+    # Received a non-successful http response.
+    puts 'HTTP request failed: ' + response.code.to_s
+  end
+end
+"""
+
+
+code_loop_output = """
+}}""" + _code_output + """
+
+rows.each_with_index do |row, index|
+  headers = Hash[HEADERS.map {{ |name, value| [fill(name, row), fill(value, row)] }}]
+  request_options = options.merge(buffersize: CHUNK_SIZE, headers: headers){post}
+  request = Typhoeus::Request.new(fill_url(row), request_options)
+  writer(request, "response-#{{index + 1}}")
+  response = request.run
+  if response.success?
+    puts "Response #{{response.code}}"
+  elsif response.timed_out?
+    puts 'Request Timed Out!'
+  elsif response.code == 0
+    # Could not get an http response, something's wrong.
+    puts response.return_message
+  else
+    # Received a non-successful http response.
+    puts 'HTTP request failed: ' + response.code.to_s
+  end
+end
+"""
+
+
+# Identical GET requests of the batch are only sent once when memoizing them, with the fast profile. Their response
+# is not received again, and thus not searched again either.
+code_batch_begin = """require "typhoeus"{timings}
+
+Typhoeus::Config.memoize = {memoize}
+CONCURRENCY = {concurrency}
+"""
+
+
+code_batch_requests = """REQUESTS = [{requests}
+]
+"""
+
+
+code_batch_request = """
+  [:{lower_method}, {url}, {{{headers}}}, {data}],"""
+
+
+code_batch_header = """{name} => {value}"""
+
+
+code_batch_main = """
+# The hydra runs the requests in parallel, reusing the connections of its handles
+hydra = Typhoeus::Hydra.new(max_concurrency: CONCURRENCY)
+options = {{
+    followlocation: true,
+"""
+
+
+code_batch_proxy = """    proxy: '{proxy}',
+"""
+
+
+code_batch_unix_socket = """    unix_socket_path: {path},
+"""
+
+
+code_batch_connect_to = """    connect_to: ['::{host}:{port}'],
+"""
+
+
+code_batch_search = """}}""" + _code_scan + """
+
+REQUESTS.each do |method, url, headers, data|
+  request_options = options.merge(method: method, headers: headers)
+  request_options[:body] = data if method == :post
+  request = Typhoeus::Request.new(url, request_options)
+  request.on_body(&scanner("#{{method.upcase}} #{{url}}"))
+  request.on_complete do |response|
+    if response.return_code == :write_error
+      puts "#{{method.upcase}} #{{url}} Stopped at the first match"
+    elsif response.success?
+      puts "#{{method.upcase}} #{{url}} #{{response.code}}"
+    elsif response.timed_out?
+      puts "#{{method.upcase}} #{{url}} Request Timed Out!"
+    elsif response.code == 0
+      # Could not get an http response, something's wrong.
+      puts "#{{method.upcase}} #{{url}} #{{response.return_message}}"
+    else
+      # Received a non-successful http response.
+      puts "#{{method.upcase}} #{{url}} HTTP request failed: #{{response.code}}"
+    end
+  end
+  hydra.queue(request)
+end
+
+hydra.run
+"""
+
+
+code_batch_nosearch = """}}
+
+REQUESTS.each do |method, url, headers, data|
+  request_options = options.merge(method: method, headers: headers)
+  request_options[:body] = data if method == :post
+  request = Typhoeus::Request.new(url, request_options)
+  request.on_complete do |response|
+    if response.success?
+      puts "#{{method.upcase}} #{{url}} #{{response.code}}"
+      puts response.body
+    elsif response.timed_out?
+      puts "#{{method.upcase}} #{{url}} Request Timed Out!"
+    elsif response.code == 0
+      # Could not get an http response, something's wrong.
+      puts "#{{method.upcase}} #{{url}} #{{response.return_message}}"
+    else
+      # Received a non-successful http response.
+      puts "#{{method.upcase}} #{{url}} HTTP request failed: #{{response.code}}"
+    end
+  end
+  hydra.queue(request)
+end
+
+hydra.run
+"""
+
+
+code_batch_output = """}}""" + _code_output + """
+# Every response is written to its own file
+Typhoeus::Config.memoize = false
+
+REQUESTS.each_with_index do |(method, url, headers, data), index|
+  request_options = options.merge(method: method, headers: headers, buffersize: CHUNK_SIZE)
+  request_options[:body] = data if method == :post
+  request = Typhoeus::Request.new(url, request_options)
+  writer(request, "response-#{{index + 1}}")
+  request.on_complete do |response|
+    if response.success?
+      puts "#{{method.upcase}} #{{url}} #{{response.code}}"
+    elsif response.timed_out?
+      puts "#{{method.upcase}} #{{url}} Request Timed Out!"
+    elsif response.code == 0
+      # Could not get an http response, something's wrong.
+      puts "#{{method.upcase}} #{{url}} #{{response.return_message}}"
+    else
+      # Received a non-successful http response.
+      puts "#{{method.upcase}} #{{url}} HTTP request failed: #{{response.code}}"
+    end
+  end
+  hydra.queue(request)
+end
+
+hydra.run
+"""
+
+
+# The fast profile replaces the verbosity of the scripts by throughput oriented options.
+_code_verbose = """    verbose: true,
+"""
+
+
+# libcurl attempts HTTP/2 over TLS by default since its 7.62.0 version.
+_code_fast = """    # Requests compressed responses, decompressed by libcurl
+    accept_encoding: '',
+    tcp_keepalive: true,
+    connecttimeout: 10,
+    timeout: 30,
+"""
+
+
+# Reports the phases of every transfer, in seconds since its start, and the bytes transferred, as a single JSON line.
+# The callbacks of Typhoeus itself run for every request, whatever the script.
+code_timings = """
+require "json"
+
+Typhoeus.on_complete do |response|
+  puts JSON.generate(
+    url: response.effective_url,
+    status: response.code,
+    dns: response.namelookup_time,
+    connect: response.connect_time,
+    tls: response.appconnect_time,
+    ttfb: response.starttransfer_time,
+    total: response.total_time,
+    downloaded: response.options[:size_download],
+    uploaded: response.options[:size_upload]
+  )
+end"""
+
+
+code_loop_timings = code_timings
+
+
+code_batch_timings = code_timings
+
+
+code_fast_begin = code_begin.replace(_code_verbose, _code_fast)
+
+
+code_fast_loop_main = code_loop_main.replace(_code_verbose, _code_fast)
+
+
+code_fast_batch_main = code_batch_main + _code_fast
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# Value of PROXY when no proxy is set.
+code_proxy_none = 'nil'
+
+code_begin = """-- Usage: wrk --connections {concurrency} --duration 30s --script <this script> <target url or proxy url>
+-- When a proxy is set, the requests are sent in absolute form, wrk having to connect to the proxy.
+PROXY = {proxy}
+"""
+
+
+code_batch_begin = code_begin
+
+
+code_batch_requests = """requests = {{{requests}
+}}
+"""
+
+
+code_batch_request = """
+  {{method = {method}, url = {url}, path = {path}, headers = {{{headers}}}, body = {data}}},"""
+
+
+code_batch_header = """[{name}] = {value}"""
+
+
+# Cycles through the requests, formatted once per thread.
+_code_cycle = """
+local formatted = {{}}
+local index = 0
+
+function init(args)
+  for i, request in ipairs(requests) do
+    local target = request.path
+    if PROXY then
+      target = request.url
+    end
+    local body = nil
+    if request.body ~= '' then
+      body = request.body
+    end
+    formatted[i] = wrk.format(request.method, target, request.headers, body)
+  end
+end
+
+function request()
+  index = index % #formatted + 1
+  return formatted[index]
+end
+"""
+
+
+_code_search = """
+-- Counts the responses containing the search string, over every thread
+SEARCH = "{search_string}"
+matches = 0
+local threads = {{}}
+
+function setup(thread)
+  table.insert(threads, thread)
+end
+
+function response(status, headers, body)
+  if body and string.find(body, SEARCH, 1, true) then
+    matches = matches + 1
+  end
+end
+
+function done(summary, latency, requests)
+  local total = 0
+  for _, thread in ipairs(threads) do
+    total = total + thread:get("matches")
+  end
+  io.write(string.format("Responses matching %s: %d\\n", SEARCH, total))
+end
+"""
+
+
+code_search = _code_cycle + _code_search
+
+
+code_nosearch = _code_cycle.format()
+
+
+code_batch_search = code_search
+
+
+code_batch_nosearch = _code_cycle
+
+
+# wrk already keeps its connections alive and only reads the bodies of the responses when searching them, the fast
+# profile raises its timeout of 2 seconds.
+code_fast_begin = code_begin.replace('--duration 30s', '--duration 30s --timeout 30s')
+
+
+code_fast_batch_begin = code_fast_begin
@@ -0,0 +1,191 @@
+"""
+
+:synopsis: Replay timed requests (e.g. of a HAR capture) with their original inter-arrival times.
+
+The requests are scheduled on a timer wheel driven by a single coroutine of the event loop: the wheel is advanced tick
+by tick, every request due in a tick being sent at once, and the driver only sleeps when the next request is due in
+more than a millisecond, yielding to the event loop otherwise. The sends are thus not subject to the millisecond
+granularity of the timeouts of the event loop, and the cost of scheduling a request does not depend on the number of
+requests waiting.
+
+.. note::
+
+    This module requires Python 3.7 or newer, and is only imported by the ``hrt replay`` command.
+
+"""
+
+import asyncio
+import math
+import time
+
+from .histogram import LatencyHistogram
+from .replay import Replayer
+
+
+class TimerWheel(object):
+
+    """Hashed timer wheel, holding items until their deadline.
+
+    The deadlines, in seconds, are rounded up to ticks, and every tick is a slot of a ring. Items due after a whole
+    turn of the ring stay in their slot until the turn they are due.
+    """
+
+    def __init__(self, tick=0.0001, slots=4096):
+        """
+        :param float tick: Duration of a tick, in seconds.
+        :param int slots: Number of slots of the ring.
+
+        :raises ValueError: When the tick or the number of slots is not positive.
+        """
+        if tick <= 0 or slots < 1:
+            raise ValueError("Tick and slots must be positive, not %s and %s." % (tick, slots))
+        self.tick = tick
+        self.slots = [[] for _ in range(slots)]
+        # Next tick to expire
+        self.current = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    # Fraction of a tick ignored when converting moments into ticks, not to miss a tick on rounding errors
+    EPSILON = 1e-6
+
+    def _ticks(self, deadline):
+        return max(int(math.ceil(deadline / self.tick - self.EPSILON)), self.current)
+
+    def schedule(self, deadline, item):
+        """Hold an item until its deadline.
+
+        :param float deadline: Deadline of the item, in seconds. Items already due expire at the next tick.
+        :param item: Item to hold.
+        """
+        ticks = self._ticks(deadline)
+        self.slots[ticks % len(self.slots)].append((ticks, item))
+        self.count += 1
+
+    def expire(self, now):
+        """Take the items due by a moment.
+
+        :param float now: Moment, in seconds.
+
+        :return: Items whose deadline expired, in the order of their ticks, then in the order they were scheduled.
+        :rtype: list
+        """
+        expired = []
+        last = int(math.floor(now / self.tick + self.EPSILON))
+        if self.count:
+            # A turn of the ring at most, the next turn being expired by the next call
+            last = min(last, self.current + len(self.slots) - 1)
+        while self.current <= last and self.count:
+            slot = self.slots[self.current % len(self.slots)]
+            if slot:
+                due = [item for ticks, item in slot if ticks <= self.current]
+                if due:
+                    slot[:] = [(ticks, item) for ticks, item in slot if ticks > self.current]
+                    self.count -= len(due)
+                    expired.extend(due)
+            self.current += 1
+        # The ticks without any item are skipped at once
+        if not self.count:
+            self.current = max(self.current, last + 1)
+        return expired
+
+    def next_deadline(self):
+        """Return the deadline of the next item, if any, at the precision of a tick."""
+        if not self.count:
+            return None
+        for offset in range(len(self.slots)):
+            ticks = self.current + offset
+            for due, _ in self.slots[ticks % len(self.slots)]:
+                if due == ticks:
+                    return ticks * self.tick
+        # Every item is due after a whole turn of the ring
+        return min(due for slot in self.slots for due, _ in slot) * self.tick
+
+
+class TraceReplayer(object):
+
+    """Send timed requests at their original moments, scaled by a speed-up factor.
+
+    Every request is reported like by :class:`hrt.replay.Replayer`, along with its ``offset``, the moment it was due
+    in seconds since the start of the replay, and its ``lag``, the seconds it was sent late.
+    """
+
+    # The driver sleeps when the next request is due in more than this many seconds, and yields to the event loop
+    # otherwise.
+    SPIN = 0.001
+
+    def __init__(self, speed=1.0, tick=0.0001, **options):
+        """
+        :param float speed: Speed-up factor of the timing, 2 sending the requests twice as fast as they were captured.
+        :param float tick: Resolution of the timer wheel, in seconds.
+        :param options: Options of the :class:`hrt.replay.Replayer` sending the requests, like `search` or `proxy`.
+
+        :raises ValueError: When the speed, the tick or an option of the replayer is invalid.
+        """
+        if speed <= 0:
+            raise ValueError("Speed must be positive, not %s." % speed)
+        if tick <= 0:
+            raise ValueError("Tick must be positive, not %s." % tick)
+        self.speed = float(speed)
+        self.tick = tick
+        self.replayer = Replayer(**options)
+        # Lags of the requests, in microseconds
+        self.lags = LatencyHistogram()
+
+    def replay(self, timed_requests, report):
+        """Send the requests, blocking until every one of them is reported.
+
+        :param iterable timed_requests: Tuples of the moment of each request, in seconds since the first one, its
+            headers and its details, in the order of their moments.
+        :param callable report: Called with the result of each request, as soon as it completes.
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self.replay_async(timed_requests, report))
+        finally:
+            loop.close()
+
+    async def replay_async(self, timed_requests, report):
+        """Coroutine sending the requests, see :meth:`replay`."""
+        wheel = TimerWheel(self.tick)
+        # The wheel only holds the requests due within a turn of its ring, the others being read meanwhile
+        horizon = self.tick * len(wheel.slots)
+        timed_requests = iter(timed_requests)
+        upcoming = next(timed_requests, None)
+        pending = set()
+        number = 0
+        start = time.monotonic()
+        try:
+            while upcoming is not None or wheel:
+                now = time.monotonic() - start
+                while upcoming is not None and upcoming[0] / self.speed < now + horizon:
+                    number += 1
+                    moment, headers, details = upcoming
+                    wheel.schedule(moment / self.speed, (number, moment / self.speed, headers, details))
+                    upcoming = next(timed_requests, None)
+                for number_due, offset, headers, details in wheel.expire(now):
+                    task = asyncio.ensure_future(self._send(report, number_due, offset, headers, details, start))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                deadline = wheel.next_deadline()
+                if deadline is None and upcoming is not None:
+                    deadline = upcoming[0] / self.speed - horizon
+                wait = 0 if deadline is None else deadline - (time.monotonic() - start)
+                # Sleeping for less than the granularity of the event loop would wake up late
+                await asyncio.sleep(wait - self.SPIN if wait > 2 * self.SPIN else 0)
+            if pending:
+                await asyncio.wait(pending)
+        finally:
+            for task in pending:
+                task.cancel()
+            self.replayer.pool.close()
+
+    async def _send(self, report, number, offset, headers, details, start):
+        lag = max(time.monotonic() - start - offset, 0)
+        self.lags.record(lag * 1e6)
+        result = await self.replayer.send(number, headers, details)
+        result['offset'] = round(offset, 6)
+        result['lag'] = round(lag, 6)
+        report(result)
@@ -83,3 +83,58 @@ def get_url(host, pre_protocol=None):
     # If GET path already specifies a protocol, give preference to that
     protocol = pre_protocol or protocol or 'http://'  # Default protocol set to http
     return protocol + url
+
+
+def get_proxy_details(proxy):
+    """Split a proxy into the details expected by the scripts.
+
+    :param str proxy: Proxy, with or without a scheme (e.g. 127.0.0.1:8010 or http://127.0.0.1:8010).
+
+    :raises ValueError: When proxy is invalid.
+
+    :return: Dictionary of the 'proxy_host' (including the scheme) and the 'proxy_port'.
+    :rtype: dict
+    """
+    # If proxy already doesn't starts with http and is like 127.0.0.1:8010
+    if not proxy.startswith(('http', 'https')):
+        proxy = get_url(proxy)  # Fix proxy to add appropriate scheme
+    else:
+        proxy = proxy.strip()
+    if not check_valid_url(proxy):
+        raise ValueError("Proxy provided is invalid.")
+    try:
+        proxy_host, proxy_port = proxy.rsplit(":", 1)
+    except ValueError:
+        raise ValueError("Proxy provided is invalid.")
+    return {'proxy_host': proxy_host, 'proxy_port': proxy_port}
+
+
+def get_connection_details(unix_socket=None, connect_to=None):
+    """Split the overrides of the connections into the details expected by the scripts.
+
+    The requests keep their URL and Host header, only their connection goes to the Unix socket or to the address,
+    without resolving the host of their URL.
+
+    :param str unix_socket: Path of the Unix socket the requests are sent through, if any.
+    :param str connect_to: Address the requests connect to instead of the host of their URL (e.g. 127.0.0.1:8080 or
+        [::1]:8080), if any.
+
+    :raises ValueError: When the address is invalid, or both overrides are given.
+
+    :return: Dictionary of the 'unix_socket', or of the 'connect_host' and the 'connect_port', if given.
+    :rtype: dict
+    """
+    if unix_socket and connect_to:
+        raise ValueError("Requests cannot connect to both a Unix socket and an address.")
+    if unix_socket:
+        return {'unix_socket': unix_socket}
+    if connect_to:
+        connect_to = connect_to.strip()
+        # The port is mandatory, the address being a host or an IP, IPv6 addresses being enclosed in brackets
+        if ':' not in connect_to.rsplit(']', 1)[-1] or not check_valid_url('http://' + connect_to):
+            raise ValueError("Connect-to address provided is invalid.")
+        connect_host, connect_port = connect_to.rsplit(':', 1)
+        if not connect_port:
+            raise ValueError("Connect-to address provided is invalid.")
+        return {'connect_host': connect_host, 'connect_port': connect_port}
+    return {}
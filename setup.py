@@ -15,5 +15,7 @@ setup(
     author_email='owasp_owtf_developers@lists.owasp.org',
     license='3-clause BSD',
     install_requires=[],
+    # The tests run the generated python scripts, which send their requests with pycurl
+    tests_require=['pycurl'],
     packages=['hrt', 'hrt.templates'],
     scripts=['bin/hrt'])
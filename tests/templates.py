@@ -1,5 +1,8 @@
 code_begin_python = """#!/usr/bin/python
 from __future__ import print_function
+import hashlib
+import json
+import os
 import re
 import pycurl
 try:
@@ -23,34 +26,36 @@ def main():
 
 
 code_search_python = """
+    pattern = re.compile(r"hello3131\\"you\\\\"are'awesome".encode('utf-8'))
+    stop_at_first_match = False
+    # Longest match expected to span two chunks
+    overlap = 4096
+
+    def scanner(label):
+        state = {'tail': b'', 'stopped': False}
+
+        def scan(chunk):
+            data = state['tail'] + chunk
+            for match in pattern.finditer(data):
+                # Matches ending in the tail were already found in the previous chunk
+                if match.end() > len(state['tail']):
+                    print(label, "Matched item: ", match.group(0).decode('iso-8859-1'))
+                    if stop_at_first_match:
+                        # Aborts the transfer
+                        state['stopped'] = True
+                        return 0
+            state['tail'] = data[-overlap:]
+        return scan, state
+
+    scan, state = scanner('https://google.com/robots.txt')
+    curl_handler.setopt(curl_handler.WRITEFUNCTION, scan)
     try:
         curl_handler.perform()
-    except pycurl.error, error:
-        print('An error occurred: ', error)
+    except pycurl.error as error:
+        if not state['stopped']:
+            print('An error occurred: ', error)
     curl_handler.close()
 
-    body = buffer.getvalue()
-    # Body is a string on Python 2 and a byte string on Python 3.
-    # If we know the encoding, we can always decode the body and
-    # end up with a Unicode string.
-    response = body.decode('iso-8859-1')
-
-    match = re.findall(r"hello3131\\"you\\\\"are'awesome", str(response))
-    try:
-        from termcolor import colored
-        lib_available = True
-    except ImportError:
-        lib_available = False
-    if match:
-        for item in match:
-            if lib_available:
-                replace_string = colored(match[item], 'green')
-                response = re.sub(match[item], replace_string, str(response))
-            else:
-                print("Matched item: ",item)
-
-    print(response)
-
 
 if __name__ == '__main__':
     main()
@@ -59,6 +64,9 @@ if __name__ == '__main__':
 
 code_python = """#!/usr/bin/python
 from __future__ import print_function
+import hashlib
+import json
+import os
 import re
 import pycurl
 try:
@@ -88,7 +96,7 @@ def main():
 
     try:
         curl_handler.perform()
-    except pycurl.error, error:
+    except pycurl.error as error:
         print('An error occurred: ', error)
     curl_handler.close()
 
@@ -107,6 +115,9 @@ if __name__ == '__main__':
 
 code_post_python = """#!/usr/bin/python
 from __future__ import print_function
+import hashlib
+import json
+import os
 import re
 import pycurl
 try:
@@ -137,7 +148,7 @@ def main():
 
     try:
         curl_handler.perform()
-    except pycurl.error, error:
+    except pycurl.error as error:
         print('An error occurred: ', error)
     curl_handler.close()
 
@@ -172,33 +183,37 @@ options = {
 
 code_search_ruby = """
 }
-req = Typhoeus::Request.new(url, options)
-req.on_complete do |response|
-  if response.success?
-    puts 'Response #{response.code}:'
-    begin
-        require 'colorize'
-        lib_available = true
-    rescue LoadError
-        lib_available = false
-    end
-
-    matched = response.body.match /hello3131\\"you\\\\"are'awesome/
-
-    original = response.body
-    if matched then
-        if lib_available then
-            for i in 0..matched.length
-                original.gsub! /#{matched[i]}/, "#{matched[i]}".green
-            end
-        else
-            for i in 0..matched.length
-                puts 'Matched item: #{matched[i]}'
-            end
-        end
+PATTERN = /hello3131\\"you\\\\"are'awesome/
+STOP_AT_FIRST_MATCH = false
+# Longest match expected to span two chunks
+OVERLAP = 4096
+
+def scanner(label)
+  tail = ''.b
+  proc do |chunk|
+    data = tail + chunk
+    found = false
+    data.to_enum(:scan, PATTERN).each do
+      match = Regexp.last_match
+      # Matches ending in the tail were already found in the previous chunk
+      next if match.end(0) <= tail.length
+      puts "#{label} Matched item: #{match[0]}"
+      found = true
+      break if STOP_AT_FIRST_MATCH
     end
-    puts original
+    tail = data[-OVERLAP..-1] || data
+    # Aborts the transfer
+    :abort if found && STOP_AT_FIRST_MATCH
+  end
+end
 
+req = Typhoeus::Request.new(url, options)
+req.on_body(&scanner(url))
+req.on_complete do |response|
+  if response.return_code == :write_error
+    puts 'Stopped at the first match'
+  elsif response.success?
+    puts "Response #{response.code}"
   elsif response.timed_out?
     puts 'Request Timed Out!'
   elsif response.code == 0
@@ -317,27 +332,61 @@ $headers[] = "Host: google.com";
 
 code_search_php = """
 curl_setopt($ch, CURLOPT_HTTPHEADER, $headers);
-$response = curl_exec($ch);
+$string = "hello3131\\"you\\\\"are'awesome";
+$stop_at_first_match = false;
+
+// Returns the write function of a transfer, printing the matches of its response with the label
+function scanner($label) {
+    global $string, $stop_at_first_match;
+    $tail = '';
+    return function ($ch, $chunk) use ($label, $string, $stop_at_first_match, &$tail) {
+        $data = $tail . $chunk;
+        $found = 0;
+        // Checks if the passed string is a regex or a simple string
+        if (preg_match("/^\\/.+\\/[a-z]*$/i", $string)) {
+            preg_match_all($string, $data, $matches, PREG_OFFSET_CAPTURE);
+            foreach ($matches[0] as $match) {
+                // Matches ending in the tail were already found in the previous chunk
+                if ($match[1] + strlen($match[0]) > strlen($tail)) {
+                    print $label . ' Found a match: ' . $match[0] . "\\n";
+                    $found++;
+                    if ($stop_at_first_match) {
+                        break;
+                    }
+                }
+            }
+        }
+        else {
+            $offset = max(0, strlen($tail) - strlen($string) + 1);
+            while (($offset = strpos($data, $string, $offset)) !== false) {
+                print $label . ' Found a match: ' . $string . "\\n";
+                $found++;
+                if ($stop_at_first_match) {
+                    break;
+                }
+                $offset += strlen($string);
+            }
+        }
+        // Longest match expected to span two chunks
+        $tail = substr($data, -4096);
+        if ($found && $stop_at_first_match) {
+            // Aborts the transfer
+            return 0;
+        }
+        return strlen($chunk);
+    };
+}
 
-if (curl_errno($ch)) {
+curl_setopt($ch, CURLOPT_WRITEFUNCTION, scanner('https://google.com/robots.txt'));
+curl_exec($ch);
+
+if (curl_errno($ch) == CURLE_WRITE_ERROR) {
+ print 'Stopped at the first match';
+} elseif (curl_errno($ch)) {
  print curl_error($ch);
 } else {
  curl_close($ch);
 }
-print $response;
-$string = "hello3131\\"you\\\\"are'awesome";
-// Blindly copied from http://stackoverflow.com/questions/10778318/test-if-a-string-is-regex
-// Checks if the passed string is a regex or a simple string
-if( preg_match("/^\/.+\/[a-z]*$/i",$string)) {
-    if (preg_match($string, $response, $match)) {
-        print 'Found a match!';
-    }
-}
-else {
-    if (strpos($response,$string) !== false) {
-        print 'Found a match!';
-    }
-}
 """
 
 
@@ -397,3 +446,1044 @@ if (curl_errno($ch)) {
 }
 print $response;
 """
+
+
+code_loop_rows_bash = """width=2
+values=(
+    'hrt' 'it'\\''s'
+    'a\\b' ''
+)
+
+rows() {
+    printf '%s\\0' "${values[@]}"
+}
+"""
+
+
+code_loop_rows_php = """
+function rows() {
+    return array(
+        array('hrt', 'it\\'s'),
+        array('a\\\\b', ''),
+    );
+}
+"""
+
+
+code_loop_rows_python = """ROWS = [
+    ['hrt', 'it\\'s'],
+    ['a\\\\b', ''],
+]
+
+
+def rows():
+    return ROWS
+"""
+
+
+code_loop_rows_ruby = """
+def rows
+  [
+    ['hrt', 'it\\'s'],
+    ['a\\\\b', ''],
+  ]
+end
+"""
+
+
+code_batch_requests_python = """REQUESTS = [
+    ('GET', 'https://google.com/robots.txt', ['Host: google.com'], ''),
+    ('POST', 'https://www.codepunker.com/tools/http-requests', ['Host: www.codepunker.com'], 'extra=whoAreYou'),
+]
+"""
+
+
+code_begin_aiohttp = """#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import hashlib
+import os
+import re
+
+import aiohttp
+
+CONCURRENCY = 1
+PROXY = 'http://xyz.com:2223'
+REQUESTS = [
+    ('GET', 'https://google.com/robots.txt', [('Host', 'google.com')], ''),
+]
+
+
+def requests():
+    return REQUESTS
+"""
+
+
+code_search_aiohttp = """
+
+async def fetch(session, semaphore, method, url, headers, data):
+    # The semaphore bounds the number of requests in flight
+    async with semaphore:
+        try:
+            async with session.request(method, url, headers=headers, data=data or None, proxy=PROXY) as response:
+                body = bytearray()
+                # Streams the body by chunks instead of reading it at once
+                async for chunk in response.content.iter_chunked(65536):
+                    body.extend(chunk)
+                return method, url, response.status, bytes(body), None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            return method, url, None, b'', error
+
+
+async def replay(requests, concurrency=CONCURRENCY):
+    # The connector pool of the shared session keeps the connections alive between the requests
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [fetch(session, semaphore, *request) for request in requests]
+        for task in asyncio.as_completed(tasks):
+            yield await task
+
+
+STOP_AT_FIRST_MATCH = False
+
+
+async def main():
+    async for method, url, status, body, error in replay(requests()):
+        if error is not None:
+            print(method, url, 'An error occurred: ', error)
+            continue
+        print(method, url, status)
+        response = body.decode('iso-8859-1')
+        for item in re.findall(r"hello3131\\"you\\\\"are'awesome", response):
+            print("Matched item: ", item)
+            if STOP_AT_FIRST_MATCH:
+                break
+        print(response)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
+"""
+
+
+code_aiohttp = """#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import hashlib
+import os
+import re
+
+import aiohttp
+
+CONCURRENCY = 1
+PROXY = 'http://xyz.com:2223'
+REQUESTS = [
+    ('GET', 'https://google.com/robots.txt', [('Host', 'google.com')], ''),
+]
+
+
+def requests():
+    return REQUESTS
+
+
+async def fetch(session, semaphore, method, url, headers, data):
+    # The semaphore bounds the number of requests in flight
+    async with semaphore:
+        try:
+            async with session.request(method, url, headers=headers, data=data or None, proxy=PROXY) as response:
+                body = bytearray()
+                # Streams the body by chunks instead of reading it at once
+                async for chunk in response.content.iter_chunked(65536):
+                    body.extend(chunk)
+                return method, url, response.status, bytes(body), None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            return method, url, None, b'', error
+
+
+async def replay(requests, concurrency=CONCURRENCY):
+    # The connector pool of the shared session keeps the connections alive between the requests
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [fetch(session, semaphore, *request) for request in requests]
+        for task in asyncio.as_completed(tasks):
+            yield await task
+
+
+async def main():
+    async for method, url, status, body, error in replay(requests()):
+        if error is not None:
+            print(method, url, 'An error occurred: ', error)
+            continue
+        print(method, url, status)
+        print(body.decode('iso-8859-1'))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
+"""
+
+
+code_post_aiohttp = """#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+import asyncio
+import hashlib
+import os
+import re
+
+import aiohttp
+
+CONCURRENCY = 1
+PROXY = None
+REQUESTS = [
+    ('POST', 'https://www.codepunker.com/tools/http-requests', [('Host', 'www.codepunker.com')], 'extra=whoAreYou'),
+]
+
+
+def requests():
+    return REQUESTS
+
+
+async def fetch(session, semaphore, method, url, headers, data):
+    # The semaphore bounds the number of requests in flight
+    async with semaphore:
+        try:
+            async with session.request(method, url, headers=headers, data=data or None, proxy=PROXY) as response:
+                body = bytearray()
+                # Streams the body by chunks instead of reading it at once
+                async for chunk in response.content.iter_chunked(65536):
+                    body.extend(chunk)
+                return method, url, response.status, bytes(body), None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            return method, url, None, b'', error
+
+
+async def replay(requests, concurrency=CONCURRENCY):
+    # The connector pool of the shared session keeps the connections alive between the requests
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [fetch(session, semaphore, *request) for request in requests]
+        for task in asyncio.as_completed(tasks):
+            yield await task
+
+
+async def main():
+    async for method, url, status, body, error in replay(requests()):
+        if error is not None:
+            print(method, url, 'An error occurred: ', error)
+            continue
+        print(method, url, status)
+        print(body.decode('iso-8859-1'))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
+"""
+
+
+code_loop_rows_aiohttp = """ROWS = [
+    ['hrt', 'it\\'s'],
+    ['a\\\\b', ''],
+]
+
+
+def rows():
+    return ROWS
+"""
+
+
+code_batch_requests_aiohttp = """REQUESTS = [
+    ('GET', 'https://google.com/robots.txt', [('Host', 'google.com')], ''),
+    ('POST', 'https://www.codepunker.com/tools/http-requests', [('Host', 'www.codepunker.com')], 'extra=whoAreYou'),
+]
+"""
+
+
+code_batch_requests_bash = """url = "https://google.com/robots.txt"
+request = GET
+header = "Host: google.com"
+output = "response-1"
+include
+write-out = "response-1 %{http_code} GET %{url_effective}\\n"
+next
+url = "https://www.codepunker.com/tools/http-requests"
+request = POST
+header = "Host: www.codepunker.com"
+data-raw = "extra=whoAreYou"
+output = "response-2"
+include
+write-out = "response-2 %{http_code} POST %{url_effective}\\n"
+CONFIG
+"""
+
+
+code_batch_requests_ruby = """REQUESTS = [
+  [:get, 'https://google.com/robots.txt', {'Host' => 'google.com'}, ''],
+  [:post, 'https://www.codepunker.com/tools/http-requests', {'Host' => 'www.codepunker.com'}, 'extra=whoAreYou'],
+]
+"""
+
+
+code_batch_requests_php = """$requests = array(
+    array('GET', 'https://google.com/robots.txt', array('Host: google.com'), ''),
+    array('POST', 'https://www.codepunker.com/tools/http-requests', array('Host: www.codepunker.com'), 'extra=whoAreYou'),
+);
+"""
+
+
+code_begin_wrk = """-- Usage: wrk --connections 1 --duration 30s --script <this script> <target url or proxy url>
+-- When a proxy is set, the requests are sent in absolute form, wrk having to connect to the proxy.
+PROXY = 'http://xyz.com:2223'
+requests = {
+  {method = 'GET', url = 'https://google.com/robots.txt', path = '/robots.txt', headers = {['Host'] = 'google.com'}, body = ''},
+}
+"""
+
+
+code_search_wrk = """
+local formatted = {}
+local index = 0
+
+function init(args)
+  for i, request in ipairs(requests) do
+    local target = request.path
+    if PROXY then
+      target = request.url
+    end
+    local body = nil
+    if request.body ~= '' then
+      body = request.body
+    end
+    formatted[i] = wrk.format(request.method, target, request.headers, body)
+  end
+end
+
+function request()
+  index = index % #formatted + 1
+  return formatted[index]
+end
+
+-- Counts the responses containing the search string, over every thread
+SEARCH = "hello3131\\"you\\\\"are'awesome"
+matches = 0
+local threads = {}
+
+function setup(thread)
+  table.insert(threads, thread)
+end
+
+function response(status, headers, body)
+  if body and string.find(body, SEARCH, 1, true) then
+    matches = matches + 1
+  end
+end
+
+function done(summary, latency, requests)
+  local total = 0
+  for _, thread in ipairs(threads) do
+    total = total + thread:get("matches")
+  end
+  io.write(string.format("Responses matching %s: %d\\n", SEARCH, total))
+end
+"""
+
+
+code_wrk = """-- Usage: wrk --connections 1 --duration 30s --script <this script> <target url or proxy url>
+-- When a proxy is set, the requests are sent in absolute form, wrk having to connect to the proxy.
+PROXY = 'http://xyz.com:2223'
+requests = {
+  {method = 'GET', url = 'https://google.com/robots.txt', path = '/robots.txt', headers = {['Host'] = 'google.com'}, body = ''},
+}
+
+local formatted = {}
+local index = 0
+
+function init(args)
+  for i, request in ipairs(requests) do
+    local target = request.path
+    if PROXY then
+      target = request.url
+    end
+    local body = nil
+    if request.body ~= '' then
+      body = request.body
+    end
+    formatted[i] = wrk.format(request.method, target, request.headers, body)
+  end
+end
+
+function request()
+  index = index % #formatted + 1
+  return formatted[index]
+end
+"""
+
+
+code_post_wrk = """-- Usage: wrk --connections 1 --duration 30s --script <this script> <target url or proxy url>
+-- When a proxy is set, the requests are sent in absolute form, wrk having to connect to the proxy.
+PROXY = nil
+requests = {
+  {method = 'POST', url = 'https://www.codepunker.com/tools/http-requests', path = '/tools/http-requests', headers = {['Host'] = 'www.codepunker.com'}, body = 'extra=whoAreYou'},
+}
+
+local formatted = {}
+local index = 0
+
+function init(args)
+  for i, request in ipairs(requests) do
+    local target = request.path
+    if PROXY then
+      target = request.url
+    end
+    local body = nil
+    if request.body ~= '' then
+      body = request.body
+    end
+    formatted[i] = wrk.format(request.method, target, request.headers, body)
+  end
+end
+
+function request()
+  index = index % #formatted + 1
+  return formatted[index]
+end
+"""
+
+
+code_batch_requests_wrk = """requests = {
+  {method = 'GET', url = 'https://google.com/robots.txt', path = '/robots.txt', headers = {['Host'] = 'google.com'}, body = ''},
+  {method = 'POST', url = 'https://www.codepunker.com/tools/http-requests', path = '/tools/http-requests', headers = {['Host'] = 'www.codepunker.com'}, body = 'extra=whoAreYou'},
+}
+"""
+
+
+code_begin_k6 = """// Usage: HTTP_PROXY=http://xyz.com:2223 HTTPS_PROXY=http://xyz.com:2223 k6 run <this script>
+import http from 'k6/http';
+import { check } from 'k6';
+
+export const options = {
+  scenarios: {
+    replay: {
+      executor: 'constant-vus',
+      vus: 1,
+      duration: '30s',
+    },
+  },
+};
+
+const REQUESTS = [
+  {method: 'GET', url: 'https://google.com/robots.txt', headers: {'Host': 'google.com'}, body: ''},
+];
+"""
+
+
+code_search_k6 = """
+const SEARCH = new RegExp("hello3131\\"you\\\\"are'awesome");
+
+export default function () {
+  // Every virtual user cycles through the requests, starting from its own offset
+  const request = REQUESTS[(__VU + __ITER) % REQUESTS.length];
+  const response = http.request(request.method, request.url, request.body || null, { headers: request.headers });
+  check(response, {
+    'response matches the search': (r) => SEARCH.test(r.body),
+  });
+}
+"""
+
+
+code_k6 = """// Usage: HTTP_PROXY=http://xyz.com:2223 HTTPS_PROXY=http://xyz.com:2223 k6 run <this script>
+import http from 'k6/http';
+import { check } from 'k6';
+
+export const options = {
+  scenarios: {
+    replay: {
+      executor: 'constant-vus',
+      vus: 1,
+      duration: '30s',
+    },
+  },
+};
+
+const REQUESTS = [
+  {method: 'GET', url: 'https://google.com/robots.txt', headers: {'Host': 'google.com'}, body: ''},
+];
+
+export default function () {
+  // Every virtual user cycles through the requests, starting from its own offset
+  const request = REQUESTS[(__VU + __ITER) % REQUESTS.length];
+  http.request(request.method, request.url, request.body || null, { headers: request.headers });
+}
+"""
+
+
+code_post_k6 = """// Usage: k6 run <this script>
+import http from 'k6/http';
+import { check } from 'k6';
+
+export const options = {
+  scenarios: {
+    replay: {
+      executor: 'constant-vus',
+      vus: 1,
+      duration: '30s',
+    },
+  },
+};
+
+const REQUESTS = [
+  {method: 'POST', url: 'https://www.codepunker.com/tools/http-requests', headers: {'Host': 'www.codepunker.com'}, body: 'extra=whoAreYou'},
+];
+
+export default function () {
+  // Every virtual user cycles through the requests, starting from its own offset
+  const request = REQUESTS[(__VU + __ITER) % REQUESTS.length];
+  http.request(request.method, request.url, request.body || null, { headers: request.headers });
+}
+"""
+
+
+code_batch_requests_k6 = """const REQUESTS = [
+  {method: 'GET', url: 'https://google.com/robots.txt', headers: {'Host': 'google.com'}, body: ''},
+  {method: 'POST', url: 'https://www.codepunker.com/tools/http-requests', headers: {'Host': 'www.codepunker.com'}, body: 'extra=whoAreYou'},
+];
+"""
+
+
+code_begin_locust = """#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Usage: locust --locustfile <this script> --users 1 --spawn-rate 1
+import re
+from collections import Counter
+
+from locust import HttpUser, constant
+
+PROXY = 'http://xyz.com:2223'
+REQUESTS = [
+    ('GET', 'https://google.com/robots.txt', [('Host', 'google.com')], ''),
+]
+"""
+
+
+code_search_locust = """
+PROXIES = {'http': PROXY, 'https': PROXY} if PROXY else None
+
+
+def replay(method, url, headers, data):
+    def send(user):
+        with user.client.request(
+                method, url, headers=dict(headers), data=data or None, proxies=PROXIES, catch_response=True) as response:
+            if not re.search(r"hello3131\\"you\\\\"are'awesome", response.text):
+                response.failure('The response does not match the search')
+    return send
+
+# Identical requests are a single task, weighted by their number of occurrences
+WEIGHTS = Counter((method, url, tuple(headers), data) for method, url, headers, data in REQUESTS)
+
+
+class ReplayUser(HttpUser):
+    tasks = dict((replay(*request), weight) for request, weight in WEIGHTS.items())
+    wait_time = constant(0)
+    # Locust requires a host, though the requests have absolute URLs
+    host = REQUESTS[0][1]
+"""
+
+
+code_locust = """#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Usage: locust --locustfile <this script> --users 1 --spawn-rate 1
+import re
+from collections import Counter
+
+from locust import HttpUser, constant
+
+PROXY = 'http://xyz.com:2223'
+REQUESTS = [
+    ('GET', 'https://google.com/robots.txt', [('Host', 'google.com')], ''),
+]
+
+PROXIES = {'http': PROXY, 'https': PROXY} if PROXY else None
+
+
+def replay(method, url, headers, data):
+    def send(user):
+        user.client.request(method, url, headers=dict(headers), data=data or None, proxies=PROXIES)
+    return send
+
+# Identical requests are a single task, weighted by their number of occurrences
+WEIGHTS = Counter((method, url, tuple(headers), data) for method, url, headers, data in REQUESTS)
+
+
+class ReplayUser(HttpUser):
+    tasks = dict((replay(*request), weight) for request, weight in WEIGHTS.items())
+    wait_time = constant(0)
+    # Locust requires a host, though the requests have absolute URLs
+    host = REQUESTS[0][1]
+"""
+
+
+code_post_locust = """#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Usage: locust --locustfile <this script> --users 1 --spawn-rate 1
+import re
+from collections import Counter
+
+from locust import HttpUser, constant
+
+PROXY = None
+REQUESTS = [
+    ('POST', 'https://www.codepunker.com/tools/http-requests', [('Host', 'www.codepunker.com')], 'extra=whoAreYou'),
+]
+
+PROXIES = {'http': PROXY, 'https': PROXY} if PROXY else None
+
+
+def replay(method, url, headers, data):
+    def send(user):
+        user.client.request(method, url, headers=dict(headers), data=data or None, proxies=PROXIES)
+    return send
+
+# Identical requests are a single task, weighted by their number of occurrences
+WEIGHTS = Counter((method, url, tuple(headers), data) for method, url, headers, data in REQUESTS)
+
+
+class ReplayUser(HttpUser):
+    tasks = dict((replay(*request), weight) for request, weight in WEIGHTS.items())
+    wait_time = constant(0)
+    # Locust requires a host, though the requests have absolute URLs
+    host = REQUESTS[0][1]
+"""
+
+
+code_batch_requests_locust = """REQUESTS = [
+    ('GET', 'https://google.com/robots.txt', [('Host', 'google.com')], ''),
+    ('POST', 'https://www.codepunker.com/tools/http-requests', [('Host', 'www.codepunker.com')], 'extra=whoAreYou'),
+]
+"""
+
+
+code_begin_go = """// Usage: go run <this program>
+package main
+
+import (
+	"fmt"
+	"io"
+	"math"
+	"net/http"
+	"net/url"
+	"sort"
+	"strings"
+	"sync"
+	"time"
+)
+
+const concurrency = 1
+
+// Proxy the requests are sent through, if not empty
+const proxy = "http://xyz.com:2223"
+
+type request struct {
+	method  string
+	url     string
+	headers [][2]string
+	data    string
+}
+
+var requests = []request{
+	{"GET", "https://google.com/robots.txt", [][2]string{{"Host", "google.com"}}, ""},
+}
+"""
+
+
+code_search_go = """
+type result struct {
+	request request
+	status  string
+	body    []byte
+	err     error
+	latency time.Duration
+}
+
+func send(client *http.Client, request request) result {
+	var data io.Reader
+	if request.data != "" {
+		data = strings.NewReader(request.data)
+	}
+	message, err := http.NewRequest(request.method, request.url, data)
+	if err != nil {
+		return result{request: request, err: err}
+	}
+	for _, header := range request.headers {
+		if strings.EqualFold(header[0], "Host") {
+			message.Host = header[1]
+			continue
+		}
+		message.Header.Add(header[0], header[1])
+	}
+	start := time.Now()
+	response, err := client.Do(message)
+	if err != nil {
+		return result{request: request, err: err, latency: time.Since(start)}
+	}
+	defer response.Body.Close()
+	// Reading the whole body lets the connection be reused
+	body, err := io.ReadAll(response.Body)
+	return result{request, response.Status, body, err, time.Since(start)}
+}
+
+func replay() <-chan result {
+	// A single transport keeps the connections alive and shares them between the workers
+	transport := &http.Transport{
+		Proxy:               http.ProxyFromEnvironment,
+		ForceAttemptHTTP2:   true,
+		MaxIdleConns:        concurrency,
+		MaxIdleConnsPerHost: concurrency,
+		IdleConnTimeout:     90 * time.Second,
+	}
+	if proxy != "" {
+		address := proxy
+		if !strings.Contains(address, "://") {
+			address = "http://" + address
+		}
+		if proxyURL, err := url.Parse(address); err == nil {
+			transport.Proxy = http.ProxyURL(proxyURL)
+		}
+	}
+	client := &http.Client{Transport: transport}
+	jobs := make(chan request)
+	results := make(chan result)
+	var workers sync.WaitGroup
+	for worker := 0; worker < concurrency; worker++ {
+		workers.Add(1)
+		go func() {
+			defer workers.Done()
+			for request := range jobs {
+				results <- send(client, request)
+			}
+		}()
+	}
+	go func() {
+		for _, request := range requests {
+			jobs <- request
+		}
+		close(jobs)
+		workers.Wait()
+		close(results)
+	}()
+	return results
+}
+
+func printPercentiles(latencies []time.Duration) {
+	if len(latencies) == 0 {
+		return
+	}
+	sort.Slice(latencies, func(i, j int) bool { return latencies[i] < latencies[j] })
+	for _, percentile := range []float64{50, 90, 99, 100} {
+		index := int(math.Ceil(percentile/100*float64(len(latencies)))) - 1
+		fmt.Printf("p%v latency: %v\\n", percentile, latencies[index])
+	}
+}
+
+var search = regexp.MustCompile(`hello3131\\"you\\\\"are'awesome`)
+var stopAtFirstMatch = false
+
+func main() {
+	latencies := make([]time.Duration, 0, len(requests))
+	for result := range replay() {
+		latencies = append(latencies, result.latency)
+		if result.err != nil {
+			fmt.Println(result.request.method, result.request.url, "An error occurred: ", result.err)
+			continue
+		}
+		fmt.Println(result.request.method, result.request.url, result.status)
+		for _, item := range search.FindAll(result.body, -1) {
+			fmt.Println("Matched item: ", string(item))
+			if stopAtFirstMatch {
+				break
+			}
+		}
+		fmt.Println(string(result.body))
+	}
+	printPercentiles(latencies)
+}
+"""
+
+
+code_go = """// Usage: go run <this program>
+package main
+
+import (
+	"fmt"
+	"io"
+	"math"
+	"net/http"
+	"net/url"
+	"sort"
+	"strings"
+	"sync"
+	"time"
+)
+
+const concurrency = 1
+
+// Proxy the requests are sent through, if not empty
+const proxy = "http://xyz.com:2223"
+
+type request struct {
+	method  string
+	url     string
+	headers [][2]string
+	data    string
+}
+
+var requests = []request{
+	{"GET", "https://google.com/robots.txt", [][2]string{{"Host", "google.com"}}, ""},
+}
+
+type result struct {
+	request request
+	status  string
+	body    []byte
+	err     error
+	latency time.Duration
+}
+
+func send(client *http.Client, request request) result {
+	var data io.Reader
+	if request.data != "" {
+		data = strings.NewReader(request.data)
+	}
+	message, err := http.NewRequest(request.method, request.url, data)
+	if err != nil {
+		return result{request: request, err: err}
+	}
+	for _, header := range request.headers {
+		if strings.EqualFold(header[0], "Host") {
+			message.Host = header[1]
+			continue
+		}
+		message.Header.Add(header[0], header[1])
+	}
+	start := time.Now()
+	response, err := client.Do(message)
+	if err != nil {
+		return result{request: request, err: err, latency: time.Since(start)}
+	}
+	defer response.Body.Close()
+	// Reading the whole body lets the connection be reused
+	body, err := io.ReadAll(response.Body)
+	return result{request, response.Status, body, err, time.Since(start)}
+}
+
+func replay() <-chan result {
+	// A single transport keeps the connections alive and shares them between the workers
+	transport := &http.Transport{
+		Proxy:               http.ProxyFromEnvironment,
+		ForceAttemptHTTP2:   true,
+		MaxIdleConns:        concurrency,
+		MaxIdleConnsPerHost: concurrency,
+		IdleConnTimeout:     90 * time.Second,
+	}
+	if proxy != "" {
+		address := proxy
+		if !strings.Contains(address, "://") {
+			address = "http://" + address
+		}
+		if proxyURL, err := url.Parse(address); err == nil {
+			transport.Proxy = http.ProxyURL(proxyURL)
+		}
+	}
+	client := &http.Client{Transport: transport}
+	jobs := make(chan request)
+	results := make(chan result)
+	var workers sync.WaitGroup
+	for worker := 0; worker < concurrency; worker++ {
+		workers.Add(1)
+		go func() {
+			defer workers.Done()
+			for request := range jobs {
+				results <- send(client, request)
+			}
+		}()
+	}
+	go func() {
+		for _, request := range requests {
+			jobs <- request
+		}
+		close(jobs)
+		workers.Wait()
+		close(results)
+	}()
+	return results
+}
+
+func printPercentiles(latencies []time.Duration) {
+	if len(latencies) == 0 {
+		return
+	}
+	sort.Slice(latencies, func(i, j int) bool { return latencies[i] < latencies[j] })
+	for _, percentile := range []float64{50, 90, 99, 100} {
+		index := int(math.Ceil(percentile/100*float64(len(latencies)))) - 1
+		fmt.Printf("p%v latency: %v\\n", percentile, latencies[index])
+	}
+}
+
+func main() {
+	latencies := make([]time.Duration, 0, len(requests))
+	for result := range replay() {
+		latencies = append(latencies, result.latency)
+		if result.err != nil {
+			fmt.Println(result.request.method, result.request.url, "An error occurred: ", result.err)
+			continue
+		}
+		fmt.Println(result.request.method, result.request.url, result.status)
+		fmt.Println(string(result.body))
+	}
+	printPercentiles(latencies)
+}
+"""
+
+
+code_post_go = """// Usage: go run <this program>
+package main
+
+import (
+	"fmt"
+	"io"
+	"math"
+	"net/http"
+	"net/url"
+	"sort"
+	"strings"
+	"sync"
+	"time"
+)
+
+const concurrency = 1
+
+// Proxy the requests are sent through, if not empty
+const proxy = ""
+
+type request struct {
+	method  string
+	url     string
+	headers [][2]string
+	data    string
+}
+
+var requests = []request{
+	{"POST", "https://www.codepunker.com/tools/http-requests", [][2]string{{"Host", "www.codepunker.com"}}, "extra=whoAreYou"},
+}
+
+type result struct {
+	request request
+	status  string
+	body    []byte
+	err     error
+	latency time.Duration
+}
+
+func send(client *http.Client, request request) result {
+	var data io.Reader
+	if request.data != "" {
+		data = strings.NewReader(request.data)
+	}
+	message, err := http.NewRequest(request.method, request.url, data)
+	if err != nil {
+		return result{request: request, err: err}
+	}
+	for _, header := range request.headers {
+		if strings.EqualFold(header[0], "Host") {
+			message.Host = header[1]
+			continue
+		}
+		message.Header.Add(header[0], header[1])
+	}
+	start := time.Now()
+	response, err := client.Do(message)
+	if err != nil {
+		return result{request: request, err: err, latency: time.Since(start)}
+	}
+	defer response.Body.Close()
+	// Reading the whole body lets the connection be reused
+	body, err := io.ReadAll(response.Body)
+	return result{request, response.Status, body, err, time.Since(start)}
+}
+
+func replay() <-chan result {
+	// A single transport keeps the connections alive and shares them between the workers
+	transport := &http.Transport{
+		Proxy:               http.ProxyFromEnvironment,
+		ForceAttemptHTTP2:   true,
+		MaxIdleConns:        concurrency,
+		MaxIdleConnsPerHost: concurrency,
+		IdleConnTimeout:     90 * time.Second,
+	}
+	if proxy != "" {
+		address := proxy
+		if !strings.Contains(address, "://") {
+			address = "http://" + address
+		}
+		if proxyURL, err := url.Parse(address); err == nil {
+			transport.Proxy = http.ProxyURL(proxyURL)
+		}
+	}
+	client := &http.Client{Transport: transport}
+	jobs := make(chan request)
+	results := make(chan result)
+	var workers sync.WaitGroup
+	for worker := 0; worker < concurrency; worker++ {
+		workers.Add(1)
+		go func() {
+			defer workers.Done()
+			for request := range jobs {
+				results <- send(client, request)
+			}
+		}()
+	}
+	go func() {
+		for _, request := range requests {
+			jobs <- request
+		}
+		close(jobs)
+		workers.Wait()
+		close(results)
+	}()
+	return results
+}
+
+func printPercentiles(latencies []time.Duration) {
+	if len(latencies) == 0 {
+		return
+	}
+	sort.Slice(latencies, func(i, j int) bool { return latencies[i] < latencies[j] })
+	for _, percentile := range []float64{50, 90, 99, 100} {
+		index := int(math.Ceil(percentile/100*float64(len(latencies)))) - 1
+		fmt.Printf("p%v latency: %v\\n", percentile, latencies[index])
+	}
+}
+
+func main() {
+	latencies := make([]time.Duration, 0, len(requests))
+	for result := range replay() {
+		latencies = append(latencies, result.latency)
+		if result.err != nil {
+			fmt.Println(result.request.method, result.request.url, "An error occurred: ", result.err)
+			continue
+		}
+		fmt.Println(result.request.method, result.request.url, result.status)
+		fmt.Println(string(result.body))
+	}
+	printPercentiles(latencies)
+}
+"""
+
+
+code_batch_requests_go = """
+var requests = []request{
+	{"GET", "https://google.com/robots.txt", [][2]string{{"Host", "google.com"}}, ""},
+	{"POST", "https://www.codepunker.com/tools/http-requests", [][2]string{{"Host", "www.codepunker.com"}}, "extra=whoAreYou"},
+}
+"""
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from hrt import cache
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.db')
+        self.cache = cache.ResponseCache(self.path, max_size=100)
+        self.url = 'http://foo.bar/api'
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+    ###
+    # cache.is_conditional
+    ###
+    def test_is_conditional(self):
+        self.assertTrue(cache.is_conditional(['Host: foo.bar', 'if-none-match: "v1"']))
+        self.assertFalse(cache.is_conditional(['Host: foo.bar', 'Accept: */*']))
+
+    ###
+    # cache.ResponseCache
+    ###
+    def test_store(self):
+        self.assertIsNone(self.cache.lookup('GET', self.url, []))
+        self.assertTrue(self.cache.store('GET', self.url, [], 200, {'etag': '"v1"'}, b'body'))
+        cached = self.cache.lookup('GET', self.url, ['Accept: */*'])
+        self.assertEqual((cached.status, cached.headers, cached.body), (200, {'etag': '"v1"'}, b'body'))
+        self.assertEqual(self.cache.validators(cached), ['If-None-Match: "v1"'])
+        self.assertIsNone(self.cache.lookup('HEAD', self.url, []))
+        # Kept on disk
+        self.cache.close()
+        self.cache = cache.ResponseCache(self.path, max_size=100)
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.size, 4)
+        self.assertEqual(self.cache.lookup('GET', self.url, []).body, b'body')
+
+    def test_cacheable(self):
+        for method, status, headers in (
+                ('POST', 200, {'etag': '"v1"'}),
+                ('GET', 404, {'etag': '"v1"'}),
+                ('GET', 200, {}),
+                ('GET', 200, {'etag': '"v1"', 'cache-control': 'private, no-store'}),
+                ('GET', 200, {'etag': '"v1"', 'vary': '*'})):
+            self.assertFalse(self.cache.store(method, self.url, [], status, headers, b'body'))
+        self.assertFalse(self.cache.store('GET', self.url, [], 200, {'etag': '"v1"'}, b'x' * 101))
+        self.assertEqual(len(self.cache), 0)
+        self.assertTrue(self.cache.cacheable('HEAD', 200, {'last-modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}))
+
+    def test_vary(self):
+        headers = {'etag': '"v1"', 'vary': 'Accept-Encoding, accept-language'}
+        self.cache.store('GET', self.url, ['Accept-Encoding: gzip'], 200, headers, b'gzipped')
+        self.cache.store('GET', self.url, ['Accept-Language: fr'], 200, headers, b'french')
+        self.assertEqual(self.cache.lookup('GET', self.url, ['accept-encoding: gzip']).body, b'gzipped')
+        self.assertEqual(self.cache.lookup('GET', self.url, ['Accept-Language: fr']).body, b'french')
+        self.assertIsNone(self.cache.lookup('GET', self.url, ['Accept-Language: fr', 'Accept-Encoding: gzip']))
+
+    def test_eviction(self):
+        for path in ('/a', '/b', '/c'):
+            self.cache.store('GET', self.url + path, [], 200, {'etag': '"v1"'}, b'x' * 40)
+        # The least recently used response is evicted
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.lookup('GET', self.url + '/a', []))
+        self.cache.hit(self.cache.lookup('GET', self.url + '/b', []), {})
+        self.cache.store('GET', self.url + '/d', [], 200, {'etag': '"v1"'}, b'x' * 40)
+        self.assertIsNotNone(self.cache.lookup('GET', self.url + '/b', []))
+        self.assertIsNone(self.cache.lookup('GET', self.url + '/c', []))
+        # Replacing a response does not count its previous body
+        self.cache.store('GET', self.url + '/d', [], 200, {'etag': '"v2"'}, b'x' * 50)
+        self.assertEqual(self.cache.size, 90)
+
+    def test_hit(self):
+        self.cache.store('GET', self.url, [], 200, {'etag': '"v1"', 'last-modified': 'Mon'}, b'body')
+        cached = self.cache.lookup('GET', self.url, [])
+        self.assertEqual(self.cache.validators(cached), ['If-None-Match: "v1"', 'If-Modified-Since: Mon'])
+        self.cache.hit(cached, {'etag': '"v2"', 'server': 'hrt'})
+        self.assertEqual(self.cache.lookup('GET', self.url, []).headers, {'etag': '"v2"', 'last-modified': 'Mon'})
+        self.assertIsNone(self.cache.lookup('GET', self.url + '/other', []))
+        self.assertEqual(self.cache.stats(), {'lookups': 3, 'hits': 1, 'hit_ratio': 1 / 3.0, 'saved_bytes': 4})
+        self.assertRaises(ValueError, cache.ResponseCache, self.path, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
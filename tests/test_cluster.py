@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+try:
+    import pycurl
+except ImportError:
+    pycurl = None
+
+from hrt import cluster
+
+
+class TestCluster(unittest.TestCase):
+
+    def setUp(self):
+        self.headers = ['Host: foo.bar', 'Accept: */*']
+        self.details = {'method': 'GET', 'Host': 'foo.bar', 'path': '/search?q=hrt&page=1', 'pre_scheme': 'https://',
+                        'data': '', 'protocol': 'HTTP', 'version': '1.1'}
+
+    ###
+    # cluster.split_parameters
+    ###
+    def test_split_parameters(self):
+        self.assertEqual(
+            cluster.split_parameters('q=hrt&page=1', 2),
+            (('q', 'page'), u'q=\xa72\xa7&page=\xa73\xa7', ('hrt', '1')))
+        self.assertEqual(cluster.split_parameters('{"q": "hrt"}'), (None, u'\xa70\xa7', ('{"q": "hrt"}',)))
+        self.assertEqual(cluster.split_parameters(''), ((), '', ()))
+
+    ###
+    # cluster.cluster_requests
+    ###
+    def test_cluster_requests(self):
+        post_details = dict(self.details, method='POST', path='/login', data='user=a&password=b')
+        endpoints = cluster.cluster_requests([
+            (self.headers, self.details),
+            (self.headers + ['Content-Length: 17'], post_details),
+            (self.headers, dict(self.details, path='/search?q=owtf&page=2')),
+            (self.headers + ['Content-Length: 19'], dict(post_details, data='user=ab&password=cd')),
+            (self.headers, dict(self.details, path='/search?q=owtf')),
+        ])
+        self.assertEqual(len(endpoints), 3)
+        self.assertEqual(endpoints[0].details['path'], u'/search?q=\xa70\xa7&page=\xa71\xa7')
+        self.assertEqual(endpoints[0].rows, [('hrt', '1'), ('owtf', '2')])
+        self.assertEqual(endpoints[1].headers, self.headers)
+        self.assertEqual(endpoints[1].details['path'], '/login')
+        self.assertEqual(endpoints[1].details['data'], u'user=\xa70\xa7&password=\xa71\xa7')
+        self.assertEqual(endpoints[1].rows, [('a', 'b'), ('ab', 'cd')])
+        self.assertEqual(len(endpoints[2]), 1)
+
+    ###
+    # cluster.Endpoint
+    ###
+    def test_endpoint_generate_script(self):
+        endpoint = cluster.cluster_requests([(self.headers, self.details)])[0]
+        script = endpoint.generate_script('python', proxy='http://xyz.com:2223')
+        self.assertIn("['hrt', '1']", script)
+        self.assertIn('xyz.com:2223', script)
+        self.assertRaises(ValueError, endpoint.generate_script, 'cobol')
+
+    @unittest.skipIf(pycurl is None, 'The python scripts require pycurl')
+    def test_endpoint_python_script(self):
+        post_details = dict(self.details, method='POST', path='/login', data='user=a&password=b')
+        endpoints = cluster.cluster_requests([
+            (self.headers, self.details),
+            (self.headers, dict(self.details, path='/search?q=owtf&page=2')),
+            (self.headers, post_details),
+            (self.headers, dict(post_details, data='user=ab&password=cd'))])
+        sent = []
+        for endpoint in endpoints:
+            namespace = {'__name__': 'script'}
+            exec(compile(endpoint.generate_script('python'), '<script>', 'exec'), namespace)
+            sent.extend(
+                (namespace['fill_url'](row), namespace['fill'](namespace['DATA'], row)) for row in namespace['rows']())
+        self.assertEqual(sent, [
+            ('https://foo.bar/search?q=hrt&page=1', ''),
+            ('https://foo.bar/search?q=owtf&page=2', ''),
+            ('https://foo.bar/login', 'user=a&password=b'),
+            ('https://foo.bar/login', 'user=ab&password=cd')])
+
+    def test_endpoint_batch_script(self):
+        endpoint = cluster.cluster_requests([
+            (self.headers, self.details),
+            (self.headers, dict(self.details, path='/search?q=owtf&page=2'))])[0]
+        self.assertEqual(
+            [details['path'] for _, details in endpoint.iter_requests()],
+            ['/search?q=hrt&page=1', '/search?q=owtf&page=2'])
+        # Go has no loop scripts, the requests of the endpoint are sent as a batch
+        script = endpoint.generate_script('go', search='owtf')
+        self.assertIn('"https://foo.bar/search?q=hrt&page=1"', script)
+        self.assertIn('"https://foo.bar/search?q=owtf&page=2"', script)
+        self.assertIn('regexp.MustCompile(`owtf`)', script)
+        self.assertIn('concurrency = 1', script)
+        markers = {'k6': 'vus: 1,', 'locust': '--users 1', 'wrk': '--connections 1'}
+        for language, marker in markers.items():
+            script = endpoint.generate_script(language, search='owtf')
+            self.assertIn('/search?q=hrt&page=1', script)
+            self.assertIn('/search?q=owtf&page=2', script)
+            self.assertIn('owtf', script)
+            self.assertIn(marker, script)
+        compile(endpoint.generate_script('locust'), 'locust', 'exec')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from hrt import corpus
+
+
+class TestCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.lines = [
+            "GET /robots.txt HTTP/1.1\n",
+            "Host: foo.bar\n",
+            "%%%%\n",
+            "\n",
+            "POST /login HTTP/1.1\r\n",
+            "Host: foo.bar\r\n",
+            "\r\n",
+            "user=hrt\r\n",
+            "%%%%\n"]
+
+    ###
+    # corpus.iter_raw_requests
+    ###
+    def test_iter_raw_requests(self):
+        self.assertEqual(
+            list(corpus.iter_raw_requests(self.lines)),
+            [
+                "GET /robots.txt HTTP/1.1\nHost: foo.bar",
+                "POST /login HTTP/1.1\r\nHost: foo.bar\r\n\r\nuser=hrt"])
+        self.assertEqual(list(corpus.iter_raw_requests(["%%%%\n", "\n"])), [])
+
+    ###
+    # corpus.parse_corpus
+    ###
+    def test_parse_corpus(self):
+        parsed = list(corpus.parse_corpus(corpus.iter_raw_requests(self.lines)))
+        self.assertEqual(len(parsed), 2)
+        self.assertEqual(parsed[0][0], ['Host: foo.bar'])
+        self.assertEqual(parsed[1][1]['method'], 'POST')
+        self.assertEqual(parsed[1][1]['data'], 'user=hrt')
+
+    ###
+    # corpus.translate_corpus
+    ###
+    def test_translate_corpus(self):
+        all_code = list(corpus.translate_corpus(
+            corpus.parse_corpus(corpus.iter_raw_requests(self.lines)),
+            languages=['bash', 'ruby']))
+        self.assertEqual(len(all_code), 2)
+        for code in all_code:
+            self.assertEqual(sorted(code), ['bash', 'ruby'])
+        self.assertIn('--request GET http://foo.bar/robots.txt', all_code[0]['bash'])
+        self.assertIn('--data "user=hrt"', all_code[1]['bash'])
+
+    ###
+    # corpus.save_code
+    ###
+    def test_save_code(self):
+        directory = tempfile.mkdtemp()
+        try:
+            locations = corpus.save_code({'bash': 'curl', 'python': 'import pycurl'}, directory, 'request-1')
+            self.assertEqual(locations, {
+                'bash': os.path.join(directory, 'request-1.sh'),
+                'python': os.path.join(directory, 'request-1.py')})
+            with open(locations['python']) as fp:
+                self.assertEqual(fp.read(), 'import pycurl')
+            locations = corpus.save_code({'python': 'import pycurl', 'locust': 'import locust'}, directory, 'batch')
+            self.assertEqual(locations, {
+                'python': os.path.join(directory, 'batch-python.py'),
+                'locust': os.path.join(directory, 'batch-locust.py')})
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from hrt import dedup
+
+
+class TestDedup(unittest.TestCase):
+
+    def setUp(self):
+        self.details = {'method': 'GET', 'Host': 'foo.bar', 'path': '/robots.txt', 'pre_scheme': '', 'data': ''}
+
+    ###
+    # dedup.canonicalize
+    ###
+    def test_canonicalize(self):
+        self.assertEqual(
+            dedup.canonicalize(['Host: foo.bar', 'Accept: */*', 'Date: Mon'], self.details),
+            dedup.canonicalize(
+                ['Connection: close', 'accept:*/*', 'HOST: FOO.bar'],
+                dict(self.details, Host='FOO.bar')))
+        self.assertNotEqual(
+            dedup.canonicalize(['Host: foo.bar', 'Cookie: a=b'], self.details, ignored_headers=[]),
+            dedup.canonicalize(['Host: foo.bar', 'Cookie: a=c'], self.details, ignored_headers=[]))
+        self.assertNotEqual(
+            dedup.canonicalize(['Host: foo.bar'], self.details),
+            dedup.canonicalize(['Host: foo.bar'], dict(self.details, data='a=b')))
+
+    ###
+    # dedup.BloomFilter
+    ###
+    def test_bloom_filter(self):
+        bloom = dedup.BloomFilter(1000, 0.01)
+        self.assertFalse(bloom.add(b'GET /'))
+        self.assertTrue(bloom.add(b'GET /'))
+        self.assertIn(b'GET /', bloom)
+        false_positives = sum(bloom.add(str(i).encode('ascii')) for i in range(1000))
+        self.assertLess(false_positives, 50)
+        self.assertRaises(ValueError, dedup.BloomFilter, 0)
+        self.assertRaises(ValueError, dedup.BloomFilter, 10, 1)
+
+    ###
+    # dedup.Deduplicator.filter
+    ###
+    def test_filter(self):
+        for mode in dedup.Deduplicator.MODES:
+            deduplicator = dedup.Deduplicator(mode=mode)
+            parsed_requests = [
+                (['Host: foo.bar', 'Cookie: a=b'], self.details),
+                (['Cookie: a=c', 'Host: foo.bar'], self.details),
+                (['Host: foo.bar'], dict(self.details, path='/'))]
+            self.assertEqual(list(deduplicator.filter(parsed_requests)), [parsed_requests[0], parsed_requests[2]])
+            self.assertEqual(deduplicator.duplicates, 1)
+        self.assertRaises(ValueError, dedup.Deduplicator, mode='lru')
+
+
+if __name__ == '__main__':
+    unittest.main()
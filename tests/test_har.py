@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+try:
+    from StringIO import StringIO  # Python 2.x
+except ImportError:
+    from io import StringIO  # Python 3.x
+
+from hrt import har
+
+
+class TestHar(unittest.TestCase):
+
+    def setUp(self):
+        self.entries = [
+            {'startedDateTime': '2024-01-31T12:00:00.250+01:00',
+             'request': {'method': 'POST', 'url': 'https://foo.bar/login?next=%2F', 'httpVersion': 'HTTP/1.1',
+                         'headers': [{'name': 'Host', 'value': 'foo.bar'},
+                                     {'name': 'Content-Type', 'value': 'application/x-www-form-urlencoded'}],
+                         'postData': {'mimeType': 'application/x-www-form-urlencoded', 'text': 'user=a\npassword=b'}}},
+            {'startedDateTime': '2024-01-31T11:00:00Z',
+             'request': {'method': 'GET', 'url': 'http://foo.bar:8080/', 'httpVersion': 'h2',
+                         'headers': [{'name': ':authority', 'value': 'foo.bar:8080'},
+                                     {'name': 'accept', 'value': '*/*'}]}},
+        ]
+
+    ###
+    # har.parse_har_date
+    ###
+    def test_parse_har_date(self):
+        self.assertEqual(har.parse_har_date('1970-01-01T00:00:01.5Z'), 1.5)
+        self.assertEqual(har.parse_har_date('1970-01-01T01:00:00+01:00'), 0)
+        self.assertEqual(har.parse_har_date('1970-01-01T00:00:00-0130'), 5400)
+        self.assertEqual(har.parse_har_date('1970-01-01T00:01:00'), 60)
+        self.assertRaises(ValueError, har.parse_har_date, '31/01/2024')
+
+    ###
+    # har.har_entry_to_raw
+    ###
+    def test_har_entry_to_raw(self):
+        self.assertEqual(
+            har.har_entry_to_raw(self.entries[1]['request']),
+            ('GET http://foo.bar:8080/ HTTP/1.1\nHost: foo.bar:8080\naccept: */*', ''))
+
+    ###
+    # har.parse_har
+    ###
+    def test_parse_har(self):
+        timed_requests = har.parse_har(StringIO(json.dumps({'log': {'entries': self.entries}})))
+        self.assertEqual([moment for moment, _, _ in timed_requests], [0, 0.25])
+        _, headers, details = timed_requests[0]
+        self.assertEqual(headers, ['Host: foo.bar:8080', 'accept: */*'])
+        self.assertEqual((details['method'], details['Host'], details['path']), ('GET', 'foo.bar:8080', '/'))
+        _, headers, details = timed_requests[1]
+        self.assertEqual(details['path'], '/login?next=%2F')
+        self.assertEqual(details['pre_scheme'], 'https://')
+        self.assertEqual(details['data'], 'user=a\npassword=b')
+        self.assertRaises(ValueError, har.parse_har, StringIO('{"entries": []}'))
+
+
+if __name__ == '__main__':
+    unittest.main()
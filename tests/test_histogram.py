@@ -0,0 +1,48 @@
+import random
+import unittest
+
+from hrt import histogram
+
+
+class TestHistogram(unittest.TestCase):
+
+    ###
+    # histogram.LatencyHistogram
+    ###
+    def test_record(self):
+        latencies = histogram.LatencyHistogram()
+        for value in range(1, 1001):
+            latencies.record(value)
+        self.assertEqual(latencies.total, 1000)
+        self.assertEqual(latencies.percentile(50), 500)
+        self.assertEqual(latencies.percentile(99.9), 999)
+        self.assertEqual(latencies.percentile(100), 1000)
+        self.assertEqual((latencies.min, latencies.max, latencies.mean()), (1, 1000, 500.5))
+        self.assertIsNone(histogram.LatencyHistogram().percentile(50))
+        self.assertRaises(ValueError, histogram.LatencyHistogram, 6)
+
+    def test_precision(self):
+        generator = random.Random(0)
+        values = sorted(generator.randint(1, 10 ** 9) for _ in range(10000))
+        latencies = histogram.LatencyHistogram(significant_digits=3)
+        for value in values:
+            latencies.record(value)
+        for percentile in (50, 90, 99, 99.9):
+            expected = values[int(percentile / 100.0 * len(values)) - 1]
+            self.assertAlmostEqual(latencies.percentile(percentile) / float(expected), 1, delta=0.001)
+        # The memory grows with the logarithm of the largest value
+        self.assertLess(len(latencies.counts), 30000)
+
+    def test_merge(self):
+        first, second, merged = (histogram.LatencyHistogram() for _ in range(3))
+        for value in range(0, 100000, 7):
+            (first if value % 2 else second).record(value)
+            merged.record(value)
+        first.merge(second)
+        self.assertEqual(first.counts, merged.counts)
+        self.assertEqual((first.total, first.min, first.max, first.sum), (merged.total, 0, merged.max, merged.sum))
+        self.assertRaises(ValueError, first.merge, histogram.LatencyHistogram(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
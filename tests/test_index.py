@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from hrt import index
+
+
+class TestIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.index = index.CorpusIndex(os.path.join(self.directory, 'corpus.db'))
+        self.requests = [
+            (['Host: foo.bar'], {'method': 'POST', 'Host': 'foo.bar', 'path': '/api/login', 'data': 'user=hrt'}),
+            (['Host: foo.bar'], {'method': 'GET', 'Host': 'foo.bar', 'path': '/api/users', 'data': ''}),
+            (['Host: foo.bar'], {'method': 'POST', 'Host': 'foo.bar', 'path': '/apis', 'data': ''}),
+            (['Host: bar.foo'], {'method': 'POST', 'Host': 'bar.foo', 'path': '/api/login', 'data': 'user=hrt'})]
+        self.ids = [self.index.add(headers, details) for headers, details in self.requests]
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.directory)
+
+    ###
+    # index.header_fingerprint
+    ###
+    def test_header_fingerprint(self):
+        self.assertEqual(
+            index.header_fingerprint(['Host: foo.bar', 'Accept: */*']),
+            index.header_fingerprint(['accept: text/html', 'HOST: bar.foo']))
+        self.assertNotEqual(
+            index.header_fingerprint(['Host: foo.bar']),
+            index.header_fingerprint(['Host: foo.bar', 'Accept: */*']))
+
+    ###
+    # index.CorpusIndex.query
+    ###
+    def test_query(self):
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(
+            [request_id for request_id, _, _ in self.index.query(method='post', host='FOO.bar', path_prefix='/api/')],
+            [self.ids[0]])
+        self.assertEqual(
+            [details['path'] for _, _, details in self.index.query(host='foo.bar', path_prefix='/api')],
+            ['/api/login', '/api/users', '/apis'])
+        self.assertEqual(
+            [headers for _, headers, _ in self.index.query(body_hash=index.body_hash(self.requests[0][1]))],
+            [['Host: foo.bar'], ['Host: bar.foo']])
+        self.assertEqual(len(list(self.index.query())), 4)
+
+    ###
+    # index.CorpusIndex.add_artifact
+    ###
+    def test_artifacts(self):
+        self.index.add_artifact(self.ids[0], 'bash', '/tmp/request-1.sh')
+        self.index.add_artifact(self.ids[0], 'bash', '/tmp/request-5.sh')
+        self.index.add_artifact(self.ids[0], 'ruby', '/tmp/request-1.rb')
+        self.assertEqual(self.index.artifacts(self.ids[0]), {'bash': '/tmp/request-5.sh', 'ruby': '/tmp/request-1.rb'})
+        self.assertEqual(self.index.artifacts(self.ids[1]), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
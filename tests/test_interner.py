@@ -0,0 +1,66 @@
+import sys
+import unittest
+
+from hrt.interface import HttpRequestTranslator
+from hrt.interner import StringInterner
+
+
+class TestStringInterner(unittest.TestCase):
+
+    ###
+    # interner.StringInterner.intern
+    ###
+    def test_intern(self):
+        interner = StringInterner()
+        first = ''.join(['User-Agent: ', 'hrt'])
+        second = ''.join(['User-Agent: ', 'hrt'])
+        self.assertIsNot(first, second)
+        self.assertIs(interner.intern(first), first)
+        self.assertIs(interner.intern(second), first)
+        self.assertEqual(interner.stats(), {'unique': 1, 'hits': 1, 'saved_bytes': sys.getsizeof(second)})
+
+    def test_intern_bounded(self):
+        interner = StringInterner(max_size=1)
+        interner.intern('GET')
+        post = ''.join(['PO', 'ST'])
+        self.assertIs(interner.intern(post), post)
+        self.assertNotIn('POST', interner)
+        self.assertEqual(len(interner), 1)
+
+    def test_intern_header(self):
+        interner = StringInterner()
+        interner.intern_header('Cookie: session=1')
+        interner.intern_header('Cookie: session=2')
+        # Only the name and the values are pooled, not the lines of the unique values
+        self.assertIn('Cookie', interner)
+        self.assertIn(' session=1', interner)
+        self.assertNotIn('Cookie: session=1', interner)
+        interner.intern_header(''.join(['Accept: ', '*/*']))
+        second = interner.intern_header(''.join(['Accept: ', '*/*']))
+        self.assertIs(interner.intern_header(''.join(['Accept: ', '*/*'])), second)
+
+    def test_intern_unconfigured_field(self):
+        interner = StringInterner(fields=['hosts'])
+        self.assertEqual(interner.intern('/robots.txt', 'paths'), '/robots.txt')
+        self.assertNotIn('/robots.txt', interner)
+        self.assertRaises(ValueError, StringInterner, fields=['bodies'])
+
+    ###
+    # interface.HttpRequestTranslator._parse_request
+    ###
+    def test_parse_request_shared_interner(self):
+        interner = StringInterner()
+        raw_request = "GET /robots.txt HTTP/1.1\n"\
+                      "Host: foo.bar\n"\
+                      "Accept: */*"
+        first, second, third = [HttpRequestTranslator(request=raw_request, interner=interner) for _ in range(3)]
+        # The header lines are pooled once their value was seen before
+        for second_header, third_header in zip(second.headers, third.headers):
+            self.assertIs(second_header, third_header)
+        self.assertIs(first.details['Host'], second.details['Host'])
+        self.assertIs(first.details['path'], second.details['path'])
+        self.assertGreater(interner.saved_bytes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
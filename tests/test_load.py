@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+
+try:
+    from hrt import load
+    from tests.test_replay import StandInServer
+except (ImportError, SyntaxError):  # Python 2
+    load = None
+
+
+@unittest.skipIf(load is None, 'The load generator requires Python 3')
+class TestLoad(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StandInServer()
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.01})
+        self.thread.start()
+        self.host = '127.0.0.1:%d' % self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def request(self, path):
+        details = {'method': 'GET', 'Host': self.host, 'path': path, 'pre_scheme': 'http://', 'data': '',
+                   'protocol': 'HTTP', 'version': '1.1'}
+        return ['Host: ' + self.host], details
+
+    ###
+    # load.LoadGenerator
+    ###
+    def test_run(self):
+        report = load.LoadGenerator(rate=200, duration=0.25).run([self.request('/a'), self.request('/b')])
+        summary = report.summary()
+        self.assertEqual(summary['requests'], 50)
+        self.assertEqual(summary['statuses'], {'200': 50})
+        self.assertEqual(summary['errors'], 0)
+        self.assertEqual(self.server.paths.count('/a'), 25)
+        self.assertLessEqual(summary['latency']['p50'], summary['latency']['p99.9'])
+        self.assertGreater(summary['throughput'], 0)
+
+    def test_run_processes(self):
+        generator = load.LoadGenerator(rate=200, duration=0.25, processes=2, arrivals='poisson', seed=1)
+        report = generator.run([self.request('/a')])
+        self.assertEqual(report.latency.total, len(self.server.paths))
+        self.assertEqual(report.statuses, {200: report.latency.total})
+
+    def test_coordinated_omission(self):
+        # A single connection to a server answering in 50 ms cannot keep up with a request every 10 ms, the latencies
+        # of the requests waiting for the connection include their wait
+        report = load.LoadGenerator(rate=100, duration=0.1, connections=1).run([self.request('/slow')])
+        self.assertEqual(report.latency.total, 10)
+        self.assertGreater(report.latency.percentile(99), 400000)
+        self.assertLess(report.latency.percentile(0), 100000)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, load.LoadGenerator, rate=0)
+        self.assertRaises(ValueError, load.LoadGenerator, rate=1, arrivals='bursty')
+        self.assertRaises(ValueError, load.LoadGenerator, rate=1, processes=0)
+        self.assertRaises(ValueError, load.LoadGenerator, rate=1, proxy='foo.bar:443')
+        self.assertRaises(ValueError, load.LoadGenerator(rate=1).run, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
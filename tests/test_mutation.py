@@ -0,0 +1,82 @@
+import unittest
+
+from hrt import mutation
+from hrt.plugin_manager import generate_script
+
+
+class TestMutation(unittest.TestCase):
+
+    def setUp(self):
+        self.headers = ['Host: foo.bar', 'Accept: */*', 'Content-Length: 7']
+        self.details = {'method': 'POST', 'Host': 'foo.bar', 'path': '/search?q=hrt&page=1#top', 'pre_scheme': '',
+                        'data': 'a=1&b=2', 'protocol': 'HTTP', 'version': '1.1'}
+
+    ###
+    # mutation.mutate
+    ###
+    def test_mutate_headers(self):
+        headers, details, changed = mutation.mutate(self.headers, self.details, [
+            mutation.AddHeader('X-Fuzz', 'hrt'),
+            mutation.RemoveHeader('accept'),
+            mutation.SetHeader('Host', 'bar.baz')])
+        self.assertEqual(headers, ['Host: bar.baz', 'Content-Length: 7', 'X-Fuzz: hrt'])
+        self.assertEqual(details['Host'], 'bar.baz')
+        self.assertEqual(changed, set(['headers', 'host', 'url']))
+        self.assertEqual(self.headers, ['Host: foo.bar', 'Accept: */*', 'Content-Length: 7'])
+        headers, _, _ = mutation.mutate(self.headers, self.details, [mutation.SetHeader('Cookie', 'a=b')])
+        self.assertEqual(headers[-1], 'Cookie: a=b')
+
+    def test_mutate_parameters(self):
+        headers, details, changed = mutation.mutate(self.headers, self.details, [
+            mutation.SetParameter('q', 'owtf'),
+            mutation.SetParameter('b', '2048')])
+        self.assertEqual(details['path'], '/search?q=owtf&page=1#top')
+        self.assertEqual(details['data'], 'a=1&b=2048')
+        self.assertEqual(headers[-1], 'Content-Length: 10')
+        self.assertEqual(changed, set(['headers', 'data', 'url']))
+        self.assertEqual(self.details['data'], 'a=1&b=2')
+        self.assertRaises(
+            ValueError, mutation.mutate, self.headers, self.details, [mutation.SetParameter('missing', '')])
+
+    def test_mutate_method_and_body(self):
+        headers, details, changed = mutation.mutate(self.headers, self.details, [
+            mutation.SetMethod('GET'),
+            mutation.SetBody('')])
+        self.assertEqual(details['method'], 'GET')
+        self.assertEqual(details['data'], '')
+        self.assertEqual(headers[-1], 'Content-Length: 0')
+        self.assertEqual(changed, set(['headers', 'data', 'method', 'url']))
+
+    ###
+    # mutation.MutationEngine
+    ###
+    def test_mutation_engine_render(self):
+        variants = [
+            [],
+            [mutation.AddHeader('X-Fuzz', '"hrt"')],
+            [mutation.RemoveHeader('Accept')],
+            [mutation.SetHeader('Host', 'bar.baz:8080')],
+            [mutation.SetParameter('q', 'owtf')],
+            [mutation.SetParameter('a', "it's")],
+            [mutation.SetMethod('GET')],
+            [mutation.SetMethod('GET'), mutation.SetBody('hrt')],
+        ]
+        for language in ('bash', 'php', 'python', 'ruby'):
+            for search in (None, 'hrt'):
+                engine = mutation.MutationEngine(language, self.headers, self.details, search)
+                for mutations, code in zip(variants, engine.variants(variants)):
+                    headers, details, _ = mutation.mutate(self.headers, self.details, mutations)
+                    self.assertEqual(
+                        code,
+                        generate_script(language, headers, details, search),
+                        'Invalid rendering of a %s variant' % language)
+
+    def test_mutation_engine_invalid(self):
+        engine = mutation.MutationEngine('bash', self.headers, self.details)
+        self.assertRaises(ValueError, engine.render, [mutation.SetMethod('PUT')])
+        self.assertRaises(ValueError, engine.render, [mutation.SetHeader('Host', 'in valid')])
+        self.assertRaises(ValueError, mutation.MutationEngine, 'lua', self.headers, self.details)
+
+
+if __name__ == '__main__':
+    unittest.main()
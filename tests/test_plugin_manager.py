@@ -2,6 +2,7 @@ import unittest
 from textwrap import dedent
 
 from hrt import plugin_manager, script
+from hrt.base import native
 
 
 class TestPluginManager(unittest.TestCase):
@@ -26,3 +27,15 @@ class TestPluginManager(unittest.TestCase):
             curl -v --request GET http://file.txt  --header "host:github.com"  --include
         """).strip()
         self.assertEqual(script, result)
+
+    ###
+    # plugin_manager.generate_payload_script
+    ###
+    def test_generate_payload_script(self):
+        script = plugin_manager.generate_payload_script(
+            "python",
+            headers=["Host: github.com", u"X-Token: \xa7token\xa7"],
+            details=dict(path="/file.txt", method="GET", Host="github.com"),
+            payloads="payloads.txt")
+        self.assertIn(native(u"'X-Token: \xa70\xa7'"), script)
+        self.assertIn("PAYLOADS = 'payloads.txt'", script)
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+import gzip
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from hrt import cache, replay, search
+except (ImportError, SyntaxError):  # Python 2
+    replay = None
+
+
+if replay is not None:
+    class StandInHandler(BaseHTTPRequestHandler):
+
+        """Answer every request with its own description, as a chunked, gzipped or plain response, slowly or not, or
+        with a 304 response when revalidating the ETag of the /etag paths."""
+
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            self.server.paths.append(self.path)
+            if self.path.startswith('/slow'):
+                time.sleep(0.05)
+            body = ('%s %s %s ' % (self.command, self.path, self.headers.get('Host'))).encode('utf-8')
+            length = int(self.headers.get('Content-Length') or 0)
+            body += self.rfile.read(length) + b' ' + b'x' * 10000 + b'needle'
+            if self.path.startswith('/etag'):
+                if self.headers.get('If-None-Match') == '"v1"':
+                    self.send_response(304)
+                    self.send_header('ETag', '"v1"')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('ETag', '"v1"')
+            else:
+                self.send_response(200)
+            if self.path.startswith('/chunked'):
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                for start in range(0, len(body), 1000):
+                    chunk = body[start:start + 1000]
+                    self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                self.wfile.write(b'0\r\n\r\n')
+                return
+            if self.path.startswith('/gzip'):
+                body = gzip.compress(body)
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_POST = do_GET
+
+        def log_message(self, *args):
+            pass
+
+    class StandInServer(ThreadingMixIn, HTTPServer):
+
+        daemon_threads = True
+
+        def __init__(self):
+            HTTPServer.__init__(self, ('127.0.0.1', 0), StandInHandler)
+            self.paths = []
+            self.connections = 0
+
+        def process_request(self, request, client_address):
+            self.connections += 1
+            ThreadingMixIn.process_request(self, request, client_address)
+
+
+@unittest.skipIf(replay is None, 'The replay engine requires Python 3')
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StandInServer()
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.01})
+        self.thread.start()
+        self.host = '127.0.0.1:%d' % self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def request(self, path, method='GET', data='', host=None):
+        host = host or self.host
+        details = {'method': method, 'Host': host, 'path': path, 'pre_scheme': 'http://', 'data': data,
+                   'protocol': 'HTTP', 'version': '1.1'}
+        return ['Host: ' + host, 'Accept: */*'], details
+
+    def replay(self, requests, **kwargs):
+        results = []
+        replay.Replayer(**kwargs).replay(requests, results.append)
+        return sorted(results, key=lambda result: result['id'])
+
+    ###
+    # replay.Replayer
+    ###
+    def test_replay(self):
+        results = self.replay(
+            [self.request('/a'), self.request('/b', method='POST', data='q=hrt'), self.request('/chunked')],
+            concurrency=1)
+        self.assertEqual([result['id'] for result in results], [1, 2, 3])
+        self.assertEqual([result['status'] for result in results], [200, 200, 200])
+        self.assertEqual(results[0]['url'], 'http://%s/a' % self.host)
+        self.assertEqual(results[1]['bytes'], len('POST /b %s q=hrt ' % self.host) + 10006)
+        self.assertNotIn('matches', results[0])
+        # Kept alive between the requests
+        self.assertEqual(self.server.connections, 1)
+
+    def test_replay_concurrency(self):
+        results = self.replay([self.request('/%d' % number) for number in range(20)], concurrency=4)
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(result['status'] == 200 for result in results))
+        self.assertLessEqual(self.server.connections, 4)
+        self.assertRaises(ValueError, replay.Replayer, concurrency=0)
+
+    def test_replay_search(self):
+        results = self.replay(
+            [self.request('/a'), self.request('/chunked'), self.request('/gzip')], search='need+le|/[a-z]+')
+        self.assertEqual(results[0]['matches'], ['/a', 'needle'])
+        self.assertEqual(results[1]['matches'], ['/chunked', 'needle'])
+        self.assertEqual(results[2]['matches'], ['/gzip', 'needle'])
+        # The hits are only reported for the pattern files
+        self.assertNotIn('hits', results[0])
+        self.assertRaises(ValueError, replay.Replayer, search='(unbalanced')
+
+        results = self.replay([self.request('/chunked'), self.request('/a')], search='x', first_match=True)
+        self.assertEqual(results[0]['matches'], ['x'])
+        self.assertTrue(results[0]['stopped'])
+        self.assertEqual(results[1]['matches'], ['x'])
+
+    def test_replay_search_patterns(self):
+        patterns = search.SearchPatterns(['needle', 'regex:/[a-z]+', 'hay', 'xxxxx'])
+        results = self.replay([self.request('/a'), self.request('/chunked'), self.request('/gzip')], search=patterns)
+        for result, path in zip(results, ['/a', '/chunked', '/gzip']):
+            self.assertEqual(result['matches'], [path] + ['xxxxx'] * 9996 + ['needle'])
+            self.assertEqual(result['hits'], {'regex:/[a-z]+': 1, 'xxxxx': 9996, 'needle': 1})
+
+        results = self.replay(
+            [self.request('/chunked')], search=search.SearchPatterns(['xxxxx', 'regex:x+']), first_match=True)
+        self.assertEqual(results[0]['matches'], ['xxxxx'])
+        self.assertEqual(results[0]['hits'], {'xxxxx': 1})
+        self.assertTrue(results[0]['stopped'])
+
+    def test_replay_cache(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'cache.db')
+        try:
+            requests = [self.request('/etag'), self.request('/a'), self.request('/etag', method='POST')]
+            with cache.ResponseCache(path) as responses:
+                first = self.replay(requests, search='needle', cache=responses, concurrency=1)
+                self.assertEqual(responses.stats()['hits'], 0)
+            self.assertTrue(all('cached' not in result for result in first))
+            # Only the response of the GET request carrying an ETag is revalidated
+            with cache.ResponseCache(path) as responses:
+                second = self.replay(requests, search='needle', cache=responses, concurrency=1)
+                self.assertEqual(responses.stats(), {
+                    'lookups': 2, 'hits': 1, 'hit_ratio': 0.5, 'saved_bytes': first[0]['bytes']})
+            self.assertEqual([result.get('cached', False) for result in second], [True, False, False])
+            for key in ('status', 'bytes', 'matches'):
+                self.assertEqual([result[key] for result in second], [result[key] for result in first])
+            # A request already conditional bypasses the cache
+            with cache.ResponseCache(path) as responses:
+                headers, details = self.request('/etag')
+                results = self.replay([(headers + ['If-None-Match: "v1"'], details)], cache=responses)
+                self.assertEqual(results[0]['status'], 304)
+                self.assertEqual(responses.stats()['lookups'], 0)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_replay_coalesce(self):
+        headers, details = self.request('/slow')
+        requests = [(headers + ['Date: %d' % number], details) for number in range(5)]
+        requests.append((headers + ['Accept-Language: fr'], details))
+        requests.append(self.request('/slow', method='POST'))
+        replayer = replay.Replayer(search='needle', concurrency=10, coalesce=True)
+        results = []
+        replayer.replay(requests, results.append)
+        results.sort(key=lambda result: result['id'])
+        self.assertEqual(replayer.coalesced, 4)
+        self.assertEqual(self.server.paths, ['/slow'] * 3)
+        self.assertEqual([result['id'] for result in results], list(range(1, 8)))
+        self.assertEqual([result.get('coalesced', False) for result in results], [False] + [True] * 4 + [False] * 2)
+        for result in results[1:5]:
+            self.assertEqual((result['status'], result['matches']), (200, ['needle']))
+        # Every request is sent when not coalescing, or when the headers differ
+        results = self.replay(requests[:2], concurrency=2)
+        self.assertEqual(self.server.paths, ['/slow'] * 5)
+        replayer = replay.Replayer(concurrency=2, coalesce=True, coalesce_ignored_headers=[])
+        replayer.replay(requests[:2], results.append)
+        self.assertEqual((replayer.coalesced, len(self.server.paths)), (0, 7))
+
+    def test_replay_proxy(self):
+        results = self.replay(
+            [self.request('/a', host='foo.bar'), self.request('/b', host='baz.qux')], proxy=self.host)
+        self.assertEqual([result['status'] for result in results], [200, 200])
+        self.assertEqual(self.server.paths, ['http://foo.bar/a', 'http://baz.qux/b'])
+        self.assertRaises(ValueError, replay.Replayer, proxy='foo.bar:443')
+
+    def test_replay_connect_to(self):
+        results = self.replay([self.request('/a', host='foo.bar')], connect_to=self.host, search='foo.bar')
+        self.assertEqual(results[0]['url'], 'http://foo.bar/a')
+        self.assertEqual(results[0]['matches'], ['foo.bar'])
+
+    def test_replay_error(self):
+        results = self.replay([self.request('/a', host='127.0.0.1:1'), self.request('/a', host='-')])
+        self.assertNotIn('status', results[0])
+        self.assertIn('error', results[0])
+        self.assertEqual(results[1]['error'], "Invalid URL 'http://-/a'.")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,62 @@
 # -*- coding: utf-8 -*-
+from __future__ import print_function
+
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
 import unittest
 
-from hrt.base import AbstractScript
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:  # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+try:
+    from shutil import which
+except ImportError:  # Python 2
+    from distutils.spawn import find_executable as which
+
+try:
+    import pycurl
+except ImportError:
+    pycurl = None
+
+from hrt.base import AbstractScript, native
 from hrt import script
+from hrt.search import SearchPatterns
 from .templates import (code_begin_python, code_search_python, code_python, code_post_python, code_search_ruby,
                         code_begin_ruby, code_ruby, code_post_ruby, code_begin_bash, code_search_bash, code_bash,
-                        code_post_bash, code_search_php, code_php, code_begin_php, code_post_php)
+                        code_post_bash, code_search_php, code_php, code_begin_php, code_post_php, code_loop_rows_bash,
+                        code_loop_rows_php, code_loop_rows_python, code_loop_rows_ruby, code_batch_requests_python,
+                        code_begin_aiohttp, code_search_aiohttp, code_aiohttp, code_post_aiohttp, code_loop_rows_aiohttp,
+                        code_batch_requests_aiohttp, code_batch_requests_bash, code_batch_requests_ruby,
+                        code_batch_requests_php, code_begin_wrk, code_search_wrk, code_wrk, code_post_wrk,
+                        code_batch_requests_wrk, code_begin_k6, code_search_k6, code_k6, code_post_k6,
+                        code_batch_requests_k6, code_begin_locust, code_search_locust, code_locust, code_post_locust,
+                        code_batch_requests_locust, code_begin_go, code_search_go, code_go, code_post_go,
+                        code_batch_requests_go)
+
+
+class BatchHandler(BaseHTTPRequestHandler):
+
+    """Answer every request with its method and path, followed by a needle to search for."""
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        body = ('%s %s needle' % (self.command, self.path)).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
 
 
 class TestScripts(unittest.TestCase):
@@ -50,7 +101,12 @@ class TestScripts(unittest.TestCase):
             'bash': " -x http://xyz.com:2223",
             'php': "\ncurl_setopt($ch, CURLOPT_PROXY, 'http://xyz.com:2223');\n",
             'python': "\n    curl_handler.setopt(curl_handler.PROXY, 'http://xyz.com:2223')\n",
-            'ruby': "\n    proxy: 'http://xyz.com:2223',\n"}
+            'ruby': "\n    proxy: 'http://xyz.com:2223',\n",
+            'aiohttp': '',
+            'wrk': '',
+            'k6': '',
+            'locust': '',
+            'go': ''}
         for script_name in self.script_list:
             result = script_name._generate_proxy()
             self.assertEqual(
@@ -80,7 +136,12 @@ class TestScripts(unittest.TestCase):
             'bash': ' --data "hello7World\'Ω≈ç√∫˜µ≤≥÷田中さんにあげて下さい,./;[]\-=<>?:\\"{}|_+!@#$%^&*()`" ',
             'php': '\n$content = "hello7World\'Ω≈ç√∫˜µ≤≥÷田中さんにあげて下さい,./;[]\-=<>?:\\"{}|_+!@#$%^&*()`";\ncurl_setopt($ch, CURLOPT_POST, 1);\ncurl_setopt($ch, CURLOPT_POSTFIELDS, $content);\n',
             'python': '\n    # Sets request method to POST\n    curl_handler.setopt(curl_handler.POSTFIELDS, "hello7World\'Ω≈ç√∫˜µ≤≥÷田中さんにあげて下さい,./;[]\-=<>?:\\"{}|_+!@#$%^&*()`")  #expects body to urlencoded\n',
-            'ruby': '\n    body: "hello7World\'Ω≈ç√∫˜µ≤≥÷田中さんにあげて下さい,./;[]\-=<>?:\\"{}|_+!@#$%^&*()`"\n'}
+            'ruby': '\n    body: "hello7World\'Ω≈ç√∫˜µ≤≥÷田中さんにあげて下さい,./;[]\-=<>?:\\"{}|_+!@#$%^&*()`"\n',
+            'aiohttp': '',
+            'wrk': '',
+            'k6': '',
+            'locust': '',
+            'go': ''}
         self.details['data'] = 'hello7World\'Ω≈ç√∫˜µ≤≥÷田中さんにあげて下さい,./;[]\-=<>?:"{}|_+!@#$%^&*()`'
         for script_name in self.script_list:
             result = script_name._generate_post()
@@ -112,5 +173,374 @@ class TestScripts(unittest.TestCase):
                 'https://google.com/robots.txt%3Fxx',
                 'Invalid generation of begin code for {}'.format(script_name.__class__.__name__))
 
+    def test_generate_loop_rows(self):
+        for script_name in self.script_list:
+            if not script_name.code_loop_begin:
+                continue
+            result = script_name._generate_loop_rows([['hrt', "it's"], ['a\\b', '']])
+            self.assertEqual(
+                result,
+                globals()["code_loop_rows_" + script_name.__language__],
+                'Invalid generation of loop rows code for {}'.format(script_name.__class__.__name__))
+
+    def test_generate_loop_script(self):
+        self.details['path'] = u'/search?q=\xa70\xa7'
+        for script_name in self.script_list:
+            script_name.url = ''
+            if not script_name.code_loop_begin:
+                self.assertRaises(ValueError, script_name.generate_loop_script, [['hrt']])
+                continue
+            result = script_name.generate_loop_script([['hrt'], ['owtf']], search='hrt')
+            self.assertIn(
+                native(u"'https://google.com/search?q=\xa70\xa7'"),
+                result,
+                'Invalid generation of loop script for {}'.format(script_name.__class__.__name__))
+            self.assertIn("'owtf'", result)
+            self.assertIn('xyz.com:2223', result)
+            self.details['method'] = 'PUT'
+            with self.assertRaises(ValueError):
+                script_name.generate_loop_script([['hrt']])
+            self.details['method'] = 'GET'
+
+    def test_generate_payload_script(self):
+        for script_name in self.script_list:
+            script_name.url = ''
+            self.details['path'] = u'/search?q=\xa7query\xa7'
+            if not script_name.code_loop_payloads:
+                self.assertRaises(ValueError, script_name.generate_payload_script, '/tmp/payloads.txt')
+                continue
+            result = script_name.generate_payload_script('/tmp/payloads.txt')
+            self.assertIn(
+                native(u"'https://google.com/search?q=\xa70\xa7'"),
+                result,
+                'Invalid generation of payload script for {}'.format(script_name.__class__.__name__))
+            self.assertIn("'/tmp/payloads.txt'", result)
+            self.assertNotIn(native(u'\xa7query\xa7'), result)
+            script_name.url = ''
+            self.details['path'] = '/search'
+            with self.assertRaises(ValueError):
+                script_name.generate_payload_script('/tmp/payloads.txt', details=self.details)
+
+    @unittest.skipIf(pycurl is None, 'The python scripts require pycurl')
+    def test_python_payload_url(self):
+        self.details['path'] = u'/search?q=\xa7query\xa7'
+        directory = tempfile.mkdtemp()
+        try:
+            payloads = os.path.join(directory, 'payloads.txt')
+            with open(payloads, 'wb') as payload_file:
+                payload_file.write(u'a b\n\xe9\n#x\n%41&y=1\n'.encode('utf-8'))
+            result = script.PythonScript(headers=self.headers, details=self.details).generate_payload_script(payloads)
+            namespace = {'__name__': 'script'}
+            exec(compile(result, '<script>', 'exec'), namespace)
+            self.assertEqual(
+                [namespace['fill_url'](row) for row in namespace['rows']()],
+                ['https://google.com/search?q=a%20b', 'https://google.com/search?q=%C3%A9',
+                 'https://google.com/search?q=%23x', 'https://google.com/search?q=%41&y=1'])
+        finally:
+            shutil.rmtree(directory)
+        # The bash scripts percent-encode the values filling the URL too
+        result = script.BashScript(headers=self.headers, details=self.details).generate_payload_script(payloads)
+        self.assertIn('fill "$url" encode', result)
+
+    def test_payload_url_encoding(self):
+        self.details['path'] = u'/search?q=\xa7query\xa7'
+        # Runs the helpers filling the URL, cut from the scripts before the part sending the requests
+        drivers = {
+            script.RubyScript: (
+                'ruby', 'URL = ', '# Typhoeus reuses', 'rows.each { |row| puts fill_url(row) }\n'),
+            script.PHPScript: (
+                'php', '$url = ', '// A single handle keeps',
+                'foreach (rows() as $row) { print fill_url($row) . "\\n"; }\n')}
+        directory = tempfile.mkdtemp()
+        try:
+            payloads = os.path.join(directory, 'payloads.txt')
+            with open(payloads, 'wb') as payload_file:
+                payload_file.write(u'a b\n\xe9\n#x\n%41&y=1\n'.encode('utf-8'))
+            for script_class, (interpreter, begin, end, driver) in drivers.items():
+                result = script_class(
+                    headers=self.headers, details=dict(self.details)).generate_payload_script(payloads)
+                self.assertIn('fill_url', result)
+                if which(interpreter) is None:
+                    continue
+                code = result[result.index(begin):result.index(end)] + driver
+                if interpreter == 'php':
+                    code = '<?php\n' + code
+                path = os.path.join(directory, 'script')
+                with open(path, 'wb') as script_file:
+                    script_file.write(code if isinstance(code, bytes) else code.encode('utf-8'))
+                output = subprocess.check_output([interpreter, path]).decode('utf-8')
+                self.assertEqual(output.splitlines(), [
+                    'https://google.com/search?q=a%20b', 'https://google.com/search?q=%C3%A9',
+                    'https://google.com/search?q=%23x', 'https://google.com/search?q=%41&y=1'])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_generate_batch_script(self):
+        requests = [(self.headers, dict(self.details)), (self.second_headers, self.second_details)]
+        for script_name in self.script_list:
+            code_batch_requests = globals().get("code_batch_requests_" + script_name.__language__)
+            if code_batch_requests is None:
+                self.assertRaises(ValueError, script_name.generate_batch_script, requests)
+                continue
+            result = script_name.generate_batch_script(requests, proxy='http://xyz.com:2223', concurrency=4)
+            self.assertIn(
+                code_batch_requests,
+                result,
+                'Invalid generation of batch script for {}'.format(script_name.__class__.__name__))
+            self.assertIn('xyz.com:2223', result)
+            self.assertIn('4', result)
+            self.assertRaises(ValueError, script_name.generate_batch_script, requests, concurrency=0)
+            self.assertRaises(
+                ValueError, script_name.generate_batch_script, [(self.headers, dict(self.details, method='PUT'))])
+
+    @unittest.skipIf(pycurl is None, 'The python batch scripts require pycurl')
+    def test_python_batch_script_run(self):
+        server = HTTPServer(('127.0.0.1', 0), BatchHandler)
+        server.paths = []
+        thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01})
+        thread.start()
+        try:
+            host = '127.0.0.1:%d' % server.server_address[1]
+            details = {'method': 'GET', 'Host': host, 'path': '/a', 'pre_scheme': 'http://', 'version': '1.1'}
+            requests = [(['Host: ' + host], dict(details, path='/%d' % number)) for number in range(5)]
+            requests.append((['Host: ' + host], dict(details, method='POST', path='/post', data='q=hrt')))
+            result = script.PythonScript().generate_batch_script(requests, concurrency=2, search='needle')
+            printed = []
+            namespace = {'__name__': 'script', 'print': lambda *args: printed.append(args)}
+            exec(compile(result, '<script>', 'exec'), namespace)
+            namespace['main']()
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+        self.assertEqual(sorted(server.paths), ['/0', '/1', '/2', '/3', '/4', '/post'])
+        statuses = [args for args in printed if len(args) == 3 and args[2] == 200]
+        self.assertEqual(len(statuses), 6)
+        self.assertEqual(len([args for args in printed if 'needle' in args]), 6)
+
+    def test_ruby_batch_memoize(self):
+        requests = [(self.headers, dict(self.details)), (self.second_headers, self.second_details)]
+        self.assertIn('memoize = false', script.RubyScript().generate_batch_script(requests))
+        self.assertIn('memoize = true', script.RubyScript(profile='fast').generate_batch_script(requests))
+        # The memoized responses would not be searched
+        self.assertIn(
+            'memoize = false', script.RubyScript(profile='fast').generate_batch_script(requests, search='hrt'))
+
+    def test_generate_fast_script(self):
+        markers = {
+            'bash': 'compressed',
+            'php': 'CURLOPT_ENCODING',
+            'python': 'ACCEPT_ENCODING',
+            'ruby': "accept_encoding: ''",
+            'aiohttp': 'ClientTimeout(total=30, connect=10)',
+            'go': 'Timeout: 30 * time.Second',
+            'k6': "timeout: '30s'",
+            'locust': 'timeout=(10, 30)',
+            'wrk': '--timeout 30s'}
+        requests = [(self.headers, dict(self.details)), (self.second_headers, self.second_details)]
+        for script_class in AbstractScript.__subclasses__():
+            marker = markers[script_class.__language__]
+            scripts = [
+                script_class(headers=self.headers, details=dict(self.details), profile='fast').generate_script(),
+                script_class(profile='fast').generate_batch_script(requests, search='hrt')]
+            if script_class.code_loop_begin:
+                scripts.append(script_class(
+                    headers=self.headers, details=dict(self.details), profile='fast').generate_loop_script([['hrt']]))
+            for result in scripts:
+                self.assertIn(marker, result, 'Invalid fast script for {}'.format(script_class.__name__))
+                self.assertNotIn('verbose', result.lower())
+            self.assertNotIn(marker, script_class(headers=self.headers, details=dict(self.details)).generate_script())
+            self.assertRaises(ValueError, script_class, profile='slow')
+
+    def test_python_fast_script_compiles(self):
+        requests = [(self.headers, dict(self.details)), (self.second_headers, self.second_details)]
+        for profile in script.PythonScript.PROFILES:
+            for search in (None, 'hrt'):
+                scripts = [
+                    script.PythonScript(
+                        headers=self.headers, details=dict(self.details), search=search, profile=profile
+                    ).generate_script(),
+                    script.PythonScript(
+                        headers=self.headers, details=dict(self.details), search=search, profile=profile
+                    ).generate_loop_script([['hrt']]),
+                    script.PythonScript(profile=profile).generate_batch_script(requests, search=search)]
+                for result in scripts:
+                    compile(result, '<script>', 'exec')
+
+    def test_generate_search_first_match(self):
+        markers = {
+            script.BashScript: '--max-count 1',
+            script.PHPScript: '$stop_at_first_match = true;',
+            script.PythonScript: 'stop_at_first_match = True',
+            script.RubyScript: 'STOP_AT_FIRST_MATCH = true',
+            script.AiohttpScript: 'STOP_AT_FIRST_MATCH = True',
+            script.GoScript: 'stopAtFirstMatch = true'}
+        requests = [(self.headers, dict(self.details)), (self.second_headers, self.second_details)]
+        for script_class, marker in markers.items():
+            scripts = [
+                script_class(
+                    headers=self.headers, details=dict(self.details), search='hrt', first_match=True).generate_script(),
+                script_class(first_match=True).generate_batch_script(requests, search='hrt')]
+            if script_class.code_loop_begin:
+                scripts.append(script_class(
+                    headers=self.headers, details=dict(self.details), search='hrt', first_match=True
+                ).generate_loop_script([['hrt']]))
+            for result in scripts:
+                self.assertIn(marker, result, 'Invalid first match search for {}'.format(script_class.__name__))
+            self.assertNotIn(marker, script_class(
+                headers=self.headers, details=dict(self.details), search='hrt').generate_script())
+        # grep searches every response of a loop on its own, instead of stopping the single curl process
+        result = script.BashScript(
+            headers=self.headers, details=dict(self.details), search='hrt', first_match=True
+        ).generate_loop_script([['hrt']])
+        self.assertNotIn('| grep', result)
+        self.assertIn('grep -E --color --max-count 1 -- "hrt" response-*', result)
+
+    def test_python_scan_first_match(self):
+        for search in ('x', SearchPatterns(['xx', 'regex:x+'])):
+            for first_match in (False, True):
+                python = script.PythonScript(first_match=first_match)
+                code = 'def build():' + python._search_fields(search)['scan'] + '    return scanner\n'
+                namespace = {'re': re}
+                exec(compile(code, '<scan>', 'exec'), namespace)
+                scan, state = namespace['build']()('label')
+                printed = []
+                namespace['print'] = lambda *args: printed.append(args)
+                stopped = scan(b'x' * 16384)
+                if first_match:
+                    self.assertEqual(len(printed), 1)
+                    self.assertEqual((stopped, state['stopped']), (0, True))
+                else:
+                    self.assertGreater(len(printed), 1000)
+                    self.assertIsNone(stopped)
+
+    def test_generate_search_patterns(self):
+        patterns = SearchPatterns(['hrt', 'regex:h[a-z]+'])
+        requests = [(self.headers, dict(self.details)), (self.second_headers, self.second_details)]
+        for script_class in AbstractScript.__subclasses__():
+            if script_class is not script.PythonScript:
+                self.assertRaises(ValueError, script_class(
+                    headers=self.headers, details=dict(self.details), search=patterns).generate_script)
+                continue
+            scripts = [
+                script_class(headers=self.headers, details=dict(self.details), search=patterns).generate_script(),
+                script_class(headers=self.headers, details=dict(self.details), search=patterns).generate_loop_script(
+                    [['hrt']]),
+                script_class().generate_batch_script(requests, search=patterns)]
+            for result in scripts:
+                self.assertIn("patterns = ['hrt', 'regex:h[a-z]+']", result)
+                self.assertIn("goto = [{104: 1}, {114: 2}, {116: 3}, {}]", result)
+                self.assertIn("[(None, re.compile(b'(?P<_1>h[a-z]+)'))] + [", result)
+                self.assertNotIn('pattern = re.compile', result)
+                compile(result, script_class.__name__, 'exec')
+
+    def test_generate_output(self):
+        markers = {
+            'bash': 'sum',
+            'php': 'hash_init',
+            'python': 'writer(',
+            'ruby': 'def writer',
+            'aiohttp': 'OUTPUT_BODY',
+            'go': 'func save('}
+        requests = [(self.headers, dict(self.details)), (self.second_headers, self.second_details)]
+        for script_class in AbstractScript.__subclasses__():
+            marker = markers.get(script_class.__language__)
+            options = {'output_body': '/tmp/bodies', 'output_hash': 'sha256'}
+            if marker is None:
+                self.assertRaises(ValueError, script_class(
+                    headers=self.headers, details=dict(self.details), **options).generate_script)
+                continue
+            scripts = [
+                script_class(headers=self.headers, details=dict(self.details), **options).generate_script(),
+                script_class(**options).generate_batch_script(requests)]
+            if script_class.code_loop_begin:
+                scripts.append(script_class(
+                    headers=self.headers, details=dict(self.details), **options).generate_loop_script([['hrt']]))
+            for result in scripts:
+                self.assertIn(marker, result, 'Invalid output script for {}'.format(script_class.__name__))
+                self.assertIn('/tmp/bodies', result)
+                self.assertIn('sha256', result)
+                if script_class is script.PythonScript:
+                    compile(result, '<script>', 'exec')
+            self.assertNotIn(marker, script_class(headers=self.headers, details=dict(self.details)).generate_script())
+            self.assertRaises(ValueError, script_class(
+                headers=self.headers, details=dict(self.details), search='hrt', **options).generate_script)
+            self.assertRaises(ValueError, script_class, output_body='/tmp/bodies', output_hash='crc32')
+
+    def test_generate_timings(self):
+        markers = {
+            'bash': '%{time_appconnect}',
+            'php': "$timings['appconnect_time']",
+            'python': 'pycurl.APPCONNECT_TIME',
+            'ruby': 'response.appconnect_time'}
+        requests = [(self.headers, dict(self.details)), (self.second_headers, self.second_details)]
+        for script_class in AbstractScript.__subclasses__():
+            marker = markers.get(script_class.__language__)
+            if marker is None:
+                self.assertRaises(ValueError, script_class, timings=True)
+                continue
+            scripts = [
+                script_class(headers=self.headers, details=dict(self.details), timings=True).generate_script(),
+                script_class(
+                    headers=self.headers, details=dict(self.details), search='hrt', timings=True).generate_script(),
+                script_class(
+                    headers=self.headers, details=dict(self.details), output_body='/tmp/bodies', timings=True
+                ).generate_script(),
+                script_class(timings=True).generate_batch_script(requests),
+                script_class(timings=True).generate_batch_script(requests, search='hrt'),
+                script_class(headers=self.headers, details=dict(self.details), timings=True).generate_loop_script(
+                    [['hrt']])]
+            for result in scripts:
+                self.assertIn(marker, result, 'Invalid timings script for {}'.format(script_class.__name__))
+                self.assertNotIn('{timings}', result)
+                if script_class is script.PythonScript:
+                    compile(result, '<script>', 'exec')
+            self.assertNotIn(marker, script_class(headers=self.headers, details=dict(self.details)).generate_script())
+
+    def test_generate_connection(self):
+        markers = {
+            'bash': ('unix-socket', 'connect-to'),
+            'php': ('CURLOPT_UNIX_SOCKET_PATH', 'CURLOPT_CONNECT_TO'),
+            'python': ('UNIX_SOCKET_PATH', 'CONNECT_TO'),
+            'ruby': ('unix_socket_path', 'connect_to')}
+        overrides = ({'unix_socket': '/tmp/hrt.sock'}, {'connect_host': '127.0.0.1', 'connect_port': '8080'})
+        requests = [(self.headers, dict(self.details)), (self.second_headers, self.second_details)]
+        for script_class in AbstractScript.__subclasses__():
+            language_markers = markers.get(script_class.__language__)
+            for index, override in enumerate(overrides):
+                details = dict(self.details, **override)
+                if language_markers is None:
+                    self.assertRaises(
+                        ValueError, script_class(headers=self.headers, details=details).generate_script)
+                    continue
+                marker = language_markers[index]
+                scripts = [
+                    script_class(headers=self.headers, details=details).generate_script(),
+                    script_class(headers=self.headers, details=details).generate_loop_script([['hrt']]),
+                    script_class().generate_batch_script(
+                        requests, unix_socket=override.get('unix_socket'),
+                        connect_to=override.get('connect_host') and '127.0.0.1:8080')]
+                for result in scripts:
+                    self.assertIn(marker, result, 'Invalid connection script for {}'.format(script_class.__name__))
+                    self.assertIn(override.get('unix_socket', '127.0.0.1:8080'), result)
+                    self.assertIn(self.details['Host'], result)
+                    if script_class is script.PythonScript:
+                        compile(result, '<script>', 'exec')
+            if language_markers is not None:
+                result = script_class(headers=self.headers, details=dict(self.details)).generate_script()
+                for marker in language_markers:
+                    self.assertNotIn(marker, result)
+
+    def test_bash_config_quote(self):
+        self.assertEqual(
+            script.BashScript()._config_quote('a"b\\c\r\n\td'),
+            '"a\\"b\\\\c\\r\\n\\td"')
+
+    def test_go_search_import(self):
+        self.assertNotIn('"regexp"', script.GoScript(headers=self.headers, details=self.details).generate_script())
+        result = script.GoScript(headers=self.headers, details=self.details, search='hrt').generate_script()
+        self.assertIn('\t"net/url"\n\t"regexp"\n', result)
+        self.assertIn('regexp.MustCompile(`hrt`)', result)
+
 if __name__ == '__main__':
     unittest.main()
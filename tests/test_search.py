@@ -0,0 +1,87 @@
+import io
+import random
+import unittest
+
+from hrt import search
+
+
+class TestSearch(unittest.TestCase):
+
+    ###
+    # search.AhoCorasick
+    ###
+    def test_aho_corasick(self):
+        automaton = search.AhoCorasick([b'he', b'she', b'his', b'hers'])
+        self.assertEqual(automaton.scan(b'ushers')[1], [(1, 4), (0, 4), (3, 6)])
+        # The state carries the keywords spanning two chunks
+        state, found = automaton.scan(b'ush')
+        self.assertEqual(found, [])
+        self.assertEqual(automaton.scan(b'ers', state)[1], [(1, 1), (0, 1), (3, 3)])
+        self.assertEqual(automaton.scan(b'xyz'), (0, []))
+        self.assertRaises(ValueError, search.AhoCorasick, [b'he', b''])
+
+    def test_aho_corasick_occurrences(self):
+        generator = random.Random(0)
+        keywords = list(set(
+            ''.join(generator.choice('ab') for _ in range(generator.randint(1, 4))).encode('utf-8')
+            for _ in range(20)))
+        automaton = search.AhoCorasick(keywords)
+        data = ''.join(generator.choice('abc') for _ in range(2000)).encode('utf-8')
+        expected = sorted(
+            (index, end) for index, keyword in enumerate(keywords)
+            for end in range(len(keyword), len(data) + 1) if data[end - len(keyword):end] == keyword)
+        self.assertEqual(sorted(automaton.scan(data)[1]), expected)
+
+    ###
+    # search.SearchPatterns
+    ###
+    def test_patterns(self):
+        patterns = search.SearchPatterns(['needle', 'regex:(?i)id=[0-9]+', 'needle', 'regex:ne+d'])
+        self.assertEqual(patterns.patterns, ['needle', 'regex:(?i)id=[0-9]+', 'regex:ne+d'])
+        self.assertEqual(len(patterns), 3)
+        scanner = patterns.scanner()
+        self.assertEqual(scanner.feed(b'a needle, ID=12'), [
+            ('regex:ne+d', b'need'), ('needle', b'needle'), ('regex:(?i)id=[0-9]+', b'ID=12')])
+        # Matches spanning two chunks
+        self.assertEqual(scanner.feed(b' nee'), [])
+        self.assertEqual(scanner.feed(b'dle'), [('regex:ne+d', b'need'), ('needle', b'needle')])
+        self.assertEqual(scanner.hits, {'needle': 2, 'regex:ne+d': 2, 'regex:(?i)id=[0-9]+': 1})
+        self.assertEqual(search.SearchPatterns(['regex:a']).scanner().feed(b'aa'), [('regex:a', b'a')] * 2)
+        first = search.SearchPatterns(['aa', 'regex:b+']).scanner(first_match=True)
+        self.assertEqual(first.feed(b'bbaaaa'), [('regex:b+', b'bb')])
+        self.assertEqual(first.hits, {'regex:b+': 1})
+        self.assertRaises(ValueError, search.SearchPatterns, [])
+        self.assertRaises(ValueError, search.SearchPatterns, ['regex:(unbalanced'])
+        self.assertRaises(ValueError, search.SearchPatterns, ['regex:(?P<name>a)', 'regex:(?P<name>b)'])
+        self.assertRaises(ValueError, search.SearchPatterns, ['regex:(?P<_1>a)'])
+
+    def test_patterns_uncombinable(self):
+        patterns = search.SearchPatterns(['regex:(a)\\1', 'regex:(b)c', 'regex:\\\\1', 'regex:(?i)d'])
+        # The regexes referring to their groups by number or holding flags are compiled on their own
+        self.assertEqual(patterns.regexes, [(0, b'(a)\\1'), (3, b'(?i)d')])
+        self.assertEqual(patterns.scanner().feed(b'aa bc \\1 D ab'), [
+            ('regex:(a)\\1', b'aa'), ('regex:(b)c', b'bc'), ('regex:\\\\1', b'\\1'), ('regex:(?i)d', b'D')])
+
+    def test_tables(self):
+        tables = search.SearchPatterns(['regex:x+', 'ab', 'b']).tables()
+        self.assertEqual(tables['patterns'], ['regex:x+', 'ab', 'b'])
+        self.assertEqual(tables['goto'], [{97: 1, 98: 3}, {98: 2}, {}, {}])
+        self.assertEqual(tables['fail'], [0, 0, 3, 0])
+        # The indexes of the patterns, not of the literals
+        self.assertEqual(tables['output'], [(), (), (1, 2), (2,)])
+        self.assertEqual(tables['starts'], b'[\\x61\\x62]')
+        self.assertEqual(tables['regex'], b'(?P<_0>x+)')
+        self.assertEqual(tables['regexes'], [])
+        self.assertEqual(search.SearchPatterns(['ab']).tables()['regex'], search.NEVER)
+
+    ###
+    # search.load_patterns
+    ###
+    def test_load_patterns(self):
+        patterns = search.load_patterns(io.StringIO(u'# Secrets\nAKIA\r\n\n  \nregex:[0-9]{16}\n #not a comment\n'))
+        self.assertEqual(patterns.patterns, ['AKIA', 'regex:[0-9]{16}', ' #not a comment'])
+        self.assertRaises(ValueError, search.load_patterns, io.StringIO(u'# Nothing\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+from hrt import store
+
+
+class TestStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'corpus.store')
+        self.parsed = [
+            (
+                ['Host: foo.bar', 'Accept: */*'],
+                {
+                    'protocol': 'HTTP',
+                    'pre_scheme': '',
+                    'Host': 'foo.bar',
+                    'version': '1.1',
+                    'path': '/robots.txt',
+                    'method': 'GET',
+                    'data': ''
+                }
+            ),
+            (
+                [],
+                {
+                    'protocol': 'HTTP',
+                    'pre_scheme': 'https://',
+                    'Host': 'foo.bar',
+                    'version': '1.1',
+                    'path': '/login',
+                    'method': 'POST',
+                    'data': u'user=田中'
+                }
+            )]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    ###
+    # store.write_store
+    ###
+    def test_write_store(self):
+        self.assertEqual(store.write_store(self.path, self.parsed), 2)
+        with store.CorpusStore(self.path) as corpus_store:
+            self.assertEqual(len(corpus_store), 2)
+            self.assertEqual(list(corpus_store), self.parsed)
+
+    def test_write_store_empty(self):
+        store.write_store(self.path, [])
+        with store.CorpusStore(self.path) as corpus_store:
+            self.assertEqual(list(corpus_store), [])
+
+    def test_write_store_bounded(self):
+        with store.CorpusStoreWriter(self.path, max_strings=2) as writer:
+            for headers, details in self.parsed * 2:
+                writer.add(headers, details)
+            # Only the first strings of the deduplicated fields and of the headers are remembered
+            self.assertEqual(sorted(writer._ids), ['GET', 'foo.bar'])
+        with store.CorpusStore(self.path) as corpus_store:
+            self.assertEqual(list(corpus_store), self.parsed * 2)
+
+    ###
+    # store.CorpusStore
+    ###
+    def test_random_access(self):
+        store.write_store(self.path, self.parsed)
+        with store.CorpusStore(self.path) as corpus_store:
+            self.assertEqual(corpus_store[-1], self.parsed[1])
+            self.assertEqual(corpus_store.get_field(1, 'method'), 'POST')
+            self.assertRaises(IndexError, corpus_store.__getitem__, 2)
+            self.assertRaises(KeyError, corpus_store.get_field, 0, 'proxy_host')
+
+    def test_invalid_store(self):
+        with open(self.path, 'wb') as fp:
+            fp.write(b'GET / HTTP/1.1\nHost: foo.bar\n')
+        self.assertRaises(ValueError, store.CorpusStore, self.path)
+        open(self.path, 'wb').close()
+        self.assertRaises(ValueError, store.CorpusStore, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+
+try:
+    from hrt import trace
+    from tests.test_replay import StandInServer
+except (ImportError, SyntaxError):  # Python 2
+    trace = None
+
+
+@unittest.skipIf(trace is None, 'The trace replay requires Python 3')
+class TestTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StandInServer()
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.01})
+        self.thread.start()
+        self.host = '127.0.0.1:%d' % self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def request(self, path):
+        details = {'method': 'GET', 'Host': self.host, 'path': path, 'pre_scheme': 'http://', 'data': '',
+                   'protocol': 'HTTP', 'version': '1.1'}
+        return ['Host: ' + self.host], details
+
+    ###
+    # trace.TimerWheel
+    ###
+    def test_timer_wheel(self):
+        wheel = trace.TimerWheel(tick=0.001, slots=8)
+        for deadline, item in ((0.0105, 'late'), (0.002, 'b'), (0.0015, 'a'), (0, 'now')):
+            wheel.schedule(deadline, item)
+        self.assertEqual(len(wheel), 4)
+        self.assertEqual(wheel.next_deadline(), 0)
+        self.assertEqual(wheel.expire(0), ['now'])
+        self.assertEqual(wheel.expire(0.0019), [])
+        self.assertAlmostEqual(wheel.next_deadline(), 0.002)
+        # Both are due at the same tick
+        self.assertEqual(wheel.expire(0.002), ['b', 'a'])
+        # Due after a whole turn of the ring
+        self.assertAlmostEqual(wheel.next_deadline(), 0.011)
+        self.assertEqual(wheel.expire(0.0109), [])
+        self.assertEqual(wheel.expire(0.011), ['late'])
+        self.assertIsNone(wheel.next_deadline())
+        wheel.schedule(0.005, 'past')
+        self.assertEqual(wheel.expire(0.5), ['past'])
+        self.assertRaises(ValueError, trace.TimerWheel, tick=0)
+
+    ###
+    # trace.TraceReplayer
+    ###
+    def test_replay(self):
+        results = []
+        replayer = trace.TraceReplayer(speed=2)
+        replayer.replay(
+            [(0, ) + self.request('/a'), (0.1, ) + self.request('/b'), (0.1, ) + self.request('/c'),
+             (0.3, ) + self.request('/d')],
+            results.append)
+        results.sort(key=lambda result: result['id'])
+        self.assertEqual([result['offset'] for result in results], [0, 0.05, 0.05, 0.15])
+        self.assertEqual([result['status'] for result in results], [200] * 4)
+        self.assertEqual(self.server.paths[-1], '/d')
+        self.assertTrue(all(0 <= result['lag'] < 0.05 for result in results))
+        self.assertEqual(replayer.lags.total, 4)
+        self.assertRaises(ValueError, trace.TraceReplayer, speed=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -41,3 +41,21 @@ class TestURL(unittest.TestCase):
         self.assertEqual(url.get_url("github.com:22"), "ssh://github.com:22")
 
         self.assertEqual(url.get_url("[::1]:443"), "https://[::1]:443")
+
+    ###
+    # url.get_connection_details
+    ###
+    def test_get_connection_details(self):
+        self.assertEqual(url.get_connection_details(), {})
+        self.assertEqual(url.get_connection_details(unix_socket='/tmp/app.sock'), {'unix_socket': '/tmp/app.sock'})
+        self.assertEqual(
+            url.get_connection_details(connect_to='127.0.0.1:8080'),
+            {'connect_host': '127.0.0.1', 'connect_port': '8080'})
+        self.assertEqual(
+            url.get_connection_details(connect_to='[::1]:8080'), {'connect_host': '[::1]', 'connect_port': '8080'})
+
+        self.assertRaises(ValueError, url.get_connection_details, connect_to='127.0.0.1')
+        self.assertRaises(ValueError, url.get_connection_details, connect_to='[::1]')
+        self.assertRaises(ValueError, url.get_connection_details, connect_to='::1:8080')
+        self.assertRaises(
+            ValueError, url.get_connection_details, unix_socket='/tmp/app.sock', connect_to='127.0.0.1:80')